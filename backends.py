@@ -0,0 +1,229 @@
+# ==============================================================================
+# AGENT BACKENDS
+# ==============================================================================
+
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Any
+
+from mcp_rpc import LatencyHistogram
+from tracing import tracer
+
+
+class AgentBackendError(Exception):
+    pass
+
+# How an agent turns a prompt into text. Backends are shared by all agents and live on the MCP loop.
+class AgentBackend:
+    name = "base"
+    offline = False
+    # Longest reply one generate() call may return, in tokens (None: no limit)
+    max_tokens = None
+    
+    async def generate(self, agent, prompt: str) -> str:
+        raise NotImplementedError
+    
+    # Default: no incremental output, the whole reply is split into paragraphs once it arrives
+    async def stream(self, agent, prompt: str):
+        sections = (await self.generate(agent, prompt)).split("\n\n")
+        for i, section in enumerate(sections):
+            yield section if i == 0 else "\n\n" + section
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+    
+    async def close(self):
+        pass
+
+# The canned generators with a simulated round trip (agent.latency); needs no network
+class OfflineBackend(AgentBackend):
+    name = "offline"
+    offline = True
+    
+    async def generate(self, agent, prompt: str) -> str:
+        with tracer.span("model.offline", agent=agent.name, latency=agent.latency):
+            await asyncio.sleep(agent.latency)
+        return await agent.build_report(prompt)
+    
+    # Same text as generate(), but each paragraph is yielded as soon as it is ready
+    async def stream(self, agent, prompt: str):
+        sections = (await agent.build_report(prompt)).split("\n\n")
+        delay = agent.latency / len(sections)
+        for i, section in enumerate(sections):
+            await asyncio.sleep(delay)
+            yield section if i == 0 else "\n\n" + section
+
+# Spaces requests evenly at `rate` per second with up to `burst` back to back.
+# Each caller reserves its slot up front (GCRA), so waiters are served in arrival order.
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate
+        self.burst = max(1, burst)
+        self._next_free = 0.0
+    
+    async def acquire(self):
+        now = time.monotonic()
+        slot = max(self._next_free, now)
+        self._next_free = slot + self.interval
+        wait = slot - (self.burst - 1) * self.interval - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+# OpenAI-compatible /chat/completions endpoint (OpenAI, vLLM, llama.cpp server, Ollama, ...)
+# through one pooled keep-alive client. on_usage(prompt_tokens, completion_tokens, seconds)
+# is called for every answered request, e.g. to charge it to the MCP tool that made the call.
+class HTTPModelBackend(AgentBackend):
+    name = "http"
+    RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+    
+    def __init__(self, base_url: str, model: str, api_key: str = None, max_concurrency: int = 256,
+                 rate_limit: float = None, burst: int = 16, max_retries: int = 3, timeout: float = 60.0,
+                 backoff: float = 0.25, max_tokens: int = 1024, pool_size: int = 4, on_usage=None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.pool_size = max(1, min(pool_size, max_concurrency))
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_tokens = max_tokens
+        self.rate_limiter = RateLimiter(rate_limit, burst) if rate_limit else None
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = LatencyHistogram()
+        self.on_usage = on_usage
+        self._clients = []
+        self._slots = None
+    
+    @classmethod
+    def from_env(cls, **kwargs):
+        base_url = os.environ.get("PRODUCTMIND_MODEL_URL")
+        if not base_url:
+            return None
+        rate_limit = os.environ.get("PRODUCTMIND_MODEL_RPS")
+        return cls(
+            base_url,
+            os.environ.get("PRODUCTMIND_MODEL", "gpt-4o-mini"),
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            rate_limit=float(rate_limit) if rate_limit else None,
+            **kwargs
+        )
+    
+    # httpx rescans its whole pool for every request it assigns, which costs more CPU than the
+    # request itself once a single client holds hundreds of connections. Several small clients
+    # are checked out per request instead; the checkout queue also caps total concurrency.
+    def _get_slots(self) -> asyncio.Queue:
+        if self._slots is None:
+            import httpx
+            
+            headers = {"Accept": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._clients = [
+                httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+                )
+                for _ in range(-(-self.max_concurrency // self.pool_size))
+            ]
+            self._slots = asyncio.Queue()
+            for n in range(self.max_concurrency):
+                self._slots.put_nowait(self._clients[n % len(self._clients)])
+        return self._slots
+    
+    async def close(self):
+        clients, self._clients, self._slots = self._clients, [], None
+        for client in clients:
+            await client.aclose()
+    
+    async def generate(self, agent, prompt: str) -> str:
+        import httpx
+        
+        slots = self._get_slots()
+        payload = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {"role": "system", "content": agent.system_prompt()},
+                {"role": "user", "content": prompt}
+            ]
+        }
+        last_error = None
+        
+        with tracer.span("model.queue_wait", model=self.model):
+            client = await slots.get()
+        try:
+            retry_after = 0
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.retries += 1
+                    delay = self.backoff * 2 ** (attempt - 1)
+                    # A server's Retry-After replaces the backoff when it asks for longer
+                    await asyncio.sleep(max(retry_after, delay + random.uniform(0, delay)))
+                    retry_after = 0
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                
+                self.requests += 1
+                started = time.perf_counter()
+                with tracer.span("model.request", model=self.model, attempt=attempt) as span:
+                    try:
+                        response = await client.post("/chat/completions", json=payload)
+                    except httpx.HTTPError as e:
+                        last_error = f"{type(e).__name__}: {e}"
+                        span.fail(last_error)
+                        continue
+                    span.set("http.status_code", response.status_code)
+                
+                if response.status_code == 200:
+                    # A body without a reply (truncated, an error object, a proxy page) is retried
+                    # like a failed request
+                    try:
+                        data = response.json()
+                        content = data["choices"][0]["message"]["content"]
+                    except (ValueError, LookupError, TypeError) as e:
+                        last_error = f"malformed response: {type(e).__name__}: {e}"
+                        continue
+                    self._account(data.get("usage") or {}, time.perf_counter() - started)
+                    return content
+                last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in self.RETRY_STATUSES:
+                    break
+                header = response.headers.get("Retry-After", "")
+                if header.isdigit():
+                    retry_after = min(int(header), 30)
+        finally:
+            slots.put_nowait(client)
+        
+        self.errors += 1
+        raise AgentBackendError(f"{agent.name}: model request failed ({last_error or 'unknown error'})")
+    
+    def _account(self, usage: dict, duration: float):
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.latency.record(duration)
+        if self.on_usage is not None:
+            self.on_usage(prompt_tokens, completion_tokens, duration)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "model": self.model,
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "p50_ms": round(self.latency.percentile(50) * 1000, 1),
+            "p99_ms": round(self.latency.percentile(99) * 1000, 1)
+        }
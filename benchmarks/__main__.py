@@ -0,0 +1,82 @@
+# ==============================================================================
+# BENCHMARK CLI
+# ==============================================================================
+# python -m benchmarks                          # all scenarios, compare to baseline
+# python -m benchmarks --scenarios roadmap jira --users 100 --requests 2000
+# python -m benchmarks --agent-latency 0 --save-baseline
+# python -m benchmarks --cold-start
+
+import argparse
+import os
+import sys
+
+from benchmarks.harness import compare, format_table, load_results, measure_cold_start, run_isolated, write_results
+from benchmarks.scenarios import SCENARIOS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="ProductMind AI Dashboard load tests")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--users", type=int, default=50, help="concurrent closed-loop users")
+    parser.add_argument("--requests", type=int, default=500, help="total requests per scenario")
+    parser.add_argument("--agent-latency", type=float, default=1.0,
+                        help="simulated agent latency in seconds (0 isolates dashboard overhead)")
+    parser.add_argument("--distinct", type=int, default=0,
+                        help="distinct topics to cycle through (default: every request is distinct)")
+    parser.add_argument("--output", default=os.path.join(HERE, "results", "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--trace-alloc", action="store_true", help="also report the tracemalloc peak (slower)")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="only measure interpreter + import (+ UI build) time over --cold-start-samples runs")
+    parser.add_argument("--cold-start-samples", type=int, default=5)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.cold_start:
+        result = measure_cold_start(args.cold_start_samples)
+        print(f"🧊 Cold start over {result['samples']} runs (p50 / max):")
+        print(f"   import dashboard:         {result['import_p50_ms']} / {result['import_max_ms']} ms")
+        print(f"   import + build Gradio UI: {result['import_and_ui_p50_ms']} / {result['import_and_ui_max_ms']} ms")
+        return 0
+    
+    results = []
+    for name in args.scenarios:
+        print(f"🏃 {name}: {args.users} users, {args.requests} requests, agent latency {args.agent_latency}s")
+        results.append(run_isolated(
+            name,
+            users=args.users,
+            requests=args.requests,
+            agent_latency=args.agent_latency,
+            distinct=args.distinct,
+            trace_alloc=args.trace_alloc
+        ))
+    
+    print()
+    print(format_table(results))
+    write_results(args.output, results)
+    print(f"\n💾 Results written to {args.output}")
+    
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline found, run with --save-baseline to record one")
+        return 0
+    
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    for line in regressions:
+        print(line)
+    if any(line.startswith("❌") for line in regressions):
+        return 1
+    print("✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# ==============================================================================
+# BENCHMARK HARNESS
+# ==============================================================================
+
+import asyncio
+import concurrent.futures
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.scenarios import SCENARIOS
+
+# Where throughput must not drop and latency must not grow by more than the tolerance
+HIGHER_IS_BETTER = ("throughput_rps",)
+LOWER_IS_BETTER = ("p50_ms", "p99_ms")
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def classify(text: str) -> str:
+    if text.startswith("⏳"):
+        return "rejected"
+    if text.startswith("❌"):
+        return "errors"
+    return "ok"
+
+async def drive(scenario, users: int, total: int) -> Dict[str, Any]:
+    await scenario.setup()
+    counter = itertools.count()
+    latencies = []
+    outcomes = {"ok": 0, "rejected": 0, "errors": 0}
+
+    # Closed-loop users: each sends its next request as soon as the previous one returns
+    async def user():
+        while True:
+            n = next(counter)
+            if n >= total:
+                return
+            started = time.perf_counter()
+            text = await scenario.request(n)
+            latencies.append(time.perf_counter() - started)
+            outcomes[classify(text)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return dict(
+        elapsed_s=round(elapsed, 4),
+        throughput_rps=round(total / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p90_ms=round(percentile(latencies, 90) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        max_ms=round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        **outcomes
+    )
+
+# Runs in a fresh process so peak RSS and allocations belong to this scenario alone
+def run_scenario(name: str, users: int, requests: int, agent_latency: float, distinct: int, trace_alloc: bool) -> Dict[str, Any]:
+    # Always measure the in-memory store and the offline Jira mock
+    for var in ("PRODUCTMIND_DB", "JIRA_BASE_URL"):
+        os.environ.pop(var, None)
+    # Agents are built lazily on first use and pick their latency up from the environment
+    os.environ["PRODUCTMIND_AGENT_LATENCY"] = str(agent_latency)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+        dashboard.mcp_loop.run_sync(asyncio.sleep(0))
+
+        scenario = SCENARIOS[name](dashboard, requests, distinct or requests)
+        if trace_alloc:
+            tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        result = asyncio.run(drive(scenario, users, requests))
+        blocks_after = sys.getallocatedblocks()
+        if trace_alloc:
+            result["traced_peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            tracemalloc.stop()
+        # Let fire-and-forget stream cleanups finish before the loop goes away
+        dashboard.mcp_loop.run_sync(asyncio.sleep(0.05))
+        dashboard.mcp_loop.stop()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss /= 1024
+
+    return dict(
+        scenario=name,
+        users=users,
+        requests=requests,
+        agent_latency=agent_latency,
+        distinct_topics=distinct or requests,
+        peak_rss_mb=round(peak_rss / 1024, 1),
+        alloc_blocks_delta=blocks_after - blocks_before,
+        **result
+    )
+
+def run_isolated(name: str, **kwargs) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_scenario, name, **kwargs).result()
+
+# Fresh interpreter per sample: module import alone, then import plus building the Gradio UI
+COLD_START_SNIPPETS = {
+    "import": "import dashboard",
+    "import_and_ui": "import dashboard; dashboard.create_dashboard()"
+}
+
+def measure_cold_start(samples: int = 5) -> Dict[str, Any]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    result = {"scenario": "cold_start", "samples": samples}
+    for name, snippet in COLD_START_SNIPPETS.items():
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", snippet], env=env, cwd=root, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        result[f"{name}_p50_ms"] = round(percentile(timings, 50) * 1000, 1)
+        result[f"{name}_max_ms"] = round(timings[-1] * 1000, 1)
+    return result
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+def write_results(path: str, results: List[Dict[str, Any]]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return {result["scenario"]: result for result in json.load(f)["results"]}
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if not base:
+            continue
+        if (base["users"], base["requests"], base["agent_latency"]) != (result["users"], result["requests"], result["agent_latency"]):
+            regressions.append(f"⚠️ {result['scenario']}: baseline was recorded with different users/requests/latency, skipped")
+            continue
+        for field in HIGHER_IS_BETTER:
+            if base[field] and result[field] < base[field] * (1 - tolerance):
+                regressions.append(f"❌ {result['scenario']}: {field} {result[field]} < baseline {base[field]}")
+        for field in LOWER_IS_BETTER:
+            if base[field] and result[field] > base[field] * (1 + tolerance):
+                regressions.append(f"❌ {result['scenario']}: {field} {result[field]} > baseline {base[field]}")
+    return regressions
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    columns = ("scenario", "users", "requests", "throughput_rps", "p50_ms", "p99_ms", "ok", "rejected", "errors",
+               "peak_rss_mb", "alloc_blocks_delta")
+    rows = [columns] + [tuple(str(result.get(column, "")) for column in columns) for result in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join("  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows)
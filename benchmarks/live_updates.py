@@ -0,0 +1,85 @@
+# ==============================================================================
+# LIVE TASK LIST BENCHMARK
+# ==============================================================================
+# python -m benchmarks.live_updates                      # 500 viewers, 0/1/10/100/1000 changes per tick
+# python -m benchmarks.live_updates --viewers 2000 --tasks 1000000 --changes 0 5 50
+#
+# Every open dashboard polls the store on a timer. Between ticks a writer adds and edits
+# `--changes` tasks; then every viewer (each on a random page, page size and sort order)
+# runs the tick handler. Bytes are what the handlers hand back to Gradio, compared with
+# re-sending each viewer's page on every tick.
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from typing import Any, Dict
+
+def sent_bytes(outputs) -> int:
+    return sum(len(value.encode()) for value in outputs if isinstance(value, str))
+
+def run(dashboard, viewers: int, changes: int, ticks: int, rng: random.Random) -> Dict[str, Any]:
+    store = dashboard.get_task_store()
+    views = []
+    for _ in range(viewers):
+        page_size = rng.choice((10, 25, 50, 100))
+        page = rng.randint(1, min(20, len(store.tasks) // page_size))
+        sort_key = rng.choice(store.SORT_KEYS)
+        version, _, ids = store.get_tasks_page(page, page_size, sort_key)
+        views.append((version, page, page_size, sort_key, ids))
+
+    live_bytes = full_bytes = pages_sent = 0
+    elapsed = 0.0
+    for tick in range(ticks):
+        ids = list(store.tasks_by_id)
+        for n in range(changes):
+            if n % 4 == 0:
+                store.add_task(f"Live task {tick}-{n}", "medium")
+            else:
+                store.update_task(rng.choice(ids), status=rng.choice(("todo", "progress", "done")))
+
+        started = time.perf_counter()
+        for i, view in enumerate(views):
+            live, page, new_view = dashboard.poll_tasks_interface(*view[1:4], view)
+            # gr.skip() for the state means the session keeps its view
+            if isinstance(new_view, tuple):
+                views[i] = new_view
+            live_bytes += sent_bytes((live, page))
+            pages_sent += isinstance(page, str)
+        elapsed += time.perf_counter() - started
+        # The alternative: every viewer re-renders and re-sends its page each tick
+        full_bytes += sum(len(store.get_tasks_display(*view[1:4]).encode()) for view in views)
+
+    polls = viewers * ticks
+    return dict(changes=changes, us_per_poll=elapsed / polls * 1e6, live_bytes=live_bytes / polls,
+                full_bytes=full_bytes / polls, pages_resent=pages_sent / polls * 100)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.live_updates", description="Live task list polling cost")
+    parser.add_argument("--viewers", type=int, default=500, help="open dashboards")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--changes", type=int, nargs="+", default=[0, 1, 10, 100, 1000], help="task changes between ticks")
+    parser.add_argument("--ticks", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.pop("PRODUCTMIND_DB", None)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+    # The tick handler imports gradio lazily; keep that out of the first row's timings
+    import gradio
+    dashboard.get_task_store().add_tasks([{"title": f"Live benchmark task {n}"} for n in range(args.tasks)])
+
+    rng = random.Random(7)
+    print(f"🧪 {args.viewers} viewers, {args.tasks} tasks, {args.ticks} ticks per row")
+    print(f"{'changes':>7}  {'us/poll':>8}  {'bytes/poll':>10}  {'full_page_bytes':>15}  {'pages_resent_%':>14}")
+    for changes in args.changes:
+        result = run(dashboard, args.viewers, changes, args.ticks, rng)
+        print(f"{result['changes']:>7}  {result['us_per_poll']:>8.1f}  {result['live_bytes']:>10.0f}  "
+              f"{result['full_bytes']:>15.0f}  {result['pages_resent']:>14.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
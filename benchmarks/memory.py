@@ -0,0 +1,165 @@
+# ==============================================================================
+# TASK STORE MEMORY BENCHMARK
+# ==============================================================================
+# python -m benchmarks.memory                    # 1M tasks, 10% linked to Jira
+# python -m benchmarks.memory --tasks 200000 --linked 0.5
+#
+# Reports traced bytes per task for the whole in-memory store (records, id maps,
+# indexes and Jira tickets), excluding titles, which every representation shares.
+# Then compares the records alone with the dict-per-task layout the store used before
+# slotted records: the same fields, created_at as a "YYYY-MM-DD HH:MM" string, and field
+# values as fresh strings per row, as they arrive from a file or the database.
+# Last, times opening the same store from a SQLite file, which rebuilds every index.
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict
+
+PRIORITIES = ("low", "medium", "high")
+STATUSES = ("todo", "progress", "done")
+
+def measure(storage, tasks: int, linked: float) -> Dict[str, Any]:
+    titles = [f"Benchmark task {n}" for n in range(tasks)]
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+
+    store = storage.TaskStore()
+    for n, title in enumerate(titles):
+        store.add_task(title, PRIORITIES[n % 3], STATUSES[n % 3])
+    gc.collect()
+    after_tasks = tracemalloc.get_traced_memory()[0]
+
+    tickets = int(tasks * linked)
+    for task_id in range(1, tickets + 1):
+        store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", "Unassigned", "PM-Epic-Q1-Features", "5")
+    gc.collect()
+    after_tickets = tracemalloc.get_traced_memory()[0]
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    return dict(
+        tasks=tasks,
+        tickets=tickets,
+        bytes_per_task=round((after_tasks - baseline) / tasks),
+        bytes_per_ticket=round((after_tickets - after_tasks) / tickets) if tickets else 0,
+        total_mb=round((after_tickets - baseline) / 2 ** 20, 1),
+        seconds=round(elapsed, 1)
+    )
+
+# Seconds to open a SQLite-backed store of that size: read every row, rebuild the indexes
+def measure_load(storage, tasks: int, linked: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.db")
+        store = storage.TaskStore(storage.SQLiteTaskBackend(path))
+        for start in range(0, tasks, 5000):
+            store.add_tasks([dict(title=f"Benchmark task {n}", priority=PRIORITIES[n % 3], status=STATUSES[n % 3])
+                             for n in range(start, min(start + 5000, tasks))])
+        tickets = int(tasks * linked)
+        for task_id in range(1, tickets + 1):
+            store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", "Unassigned", "PM-Epic-Q1-Features", "5")
+        store.close()
+        del store
+        gc.collect()
+
+        started = time.perf_counter()
+        store = storage.TaskStore(storage.SQLiteTaskBackend(path))
+        elapsed = time.perf_counter() - started
+        loaded = len(store.tasks)
+        store.close()
+    return dict(tasks=loaded, tickets=tickets, seconds=round(elapsed, 2))
+
+def fresh(value: str) -> str:
+    return "".join(list(value)) if value else value
+
+def dict_records(tasks: int, tickets: int, titles: list) -> tuple:
+    task_records = [
+        {"id": n + 1, "title": titles[n], "priority": fresh(PRIORITIES[n % 3]), "status": fresh(STATUSES[n % 3]),
+         "created_at": time.strftime("%Y-%m-%d %H:%M"), "jira_id": None, "jira_url": None,
+         "epic": None, "assignee": None, "estimate": None}
+        for n in range(tasks)
+    ]
+    ticket_records = []
+    for task in task_records[:tickets]:
+        jira_id = f"PROJ-{task['id'] + 99}"
+        url = f"https://your-domain.atlassian.net/browse/{jira_id}"
+        task.update(jira_id=jira_id, jira_url=url, epic=fresh("PM-Epic-Q1-Features"), assignee=fresh("Unassigned"))
+        ticket_records.append({
+            "id": jira_id, "task_id": task["id"], "title": task["title"], "priority": task["priority"],
+            "project": fresh("PRODUCTMIND (PM)"), "assignee": task["assignee"], "epic": task["epic"],
+            "story_points": fresh("5"), "status": fresh("Created in Jira"),
+            "created_at": time.strftime("%Y-%m-%d %H:%M"), "url": url
+        })
+    return task_records, ticket_records
+
+def slotted_records(storage, tasks: int, tickets: int, titles: list) -> tuple:
+    task_records = [storage.Task(n + 1, titles[n], fresh(PRIORITIES[n % 3]), fresh(STATUSES[n % 3]), time.time())
+                    for n in range(tasks)]
+    ticket_records = []
+    for task in task_records[:tickets]:
+        jira_id = f"PROJ-{task.id + 99}"
+        url = f"https://your-domain.atlassian.net/browse/{jira_id}"
+        task.update(dict(jira_id=jira_id, jira_url=url, epic=fresh("PM-Epic-Q1-Features"), assignee=fresh("Unassigned")))
+        ticket_records.append(storage.JiraTicket(jira_id, task, fresh("PRODUCTMIND (PM)"), task.assignee, task.epic,
+                                                 fresh("5"), fresh("Created in Jira"), time.time(), url))
+    return task_records, ticket_records
+
+# Bytes per task and per ticket for the records alone, built by build(tasks, tickets, titles)
+def measure_records(build, tasks: int, linked: float) -> tuple:
+    titles = [f"Benchmark task {n}" for n in range(tasks)]
+    tickets = int(tasks * linked)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    records = build(tasks, tickets, titles)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    # Tickets are measured by building them a second time without the tasks' share
+    del records
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    records = build(tasks, 0, titles)
+    gc.collect()
+    tasks_only = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del records
+    return round(tasks_only / tasks), round((used - tasks_only) / tickets) if tickets else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory", description="TaskStore bytes per task")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--linked", type=float, default=0.1, help="fraction of tasks linked to a Jira ticket")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import storage
+
+    result = measure(storage, args.tasks, args.linked)
+    print(f"🧮 {result['tasks']:,} tasks, {result['tickets']:,} Jira tickets ({result['seconds']}s with tracing)")
+    print(f"   per task:          {result['bytes_per_task']} bytes (records, id maps, indexes)")
+    print(f"   per Jira ticket:   {result['bytes_per_ticket']} bytes (ticket, link, reindex)")
+    print(f"   store total:       {result['total_mb']} MB")
+
+    slotted = measure_records(lambda *args: slotted_records(storage, *args), args.tasks, args.linked)
+    dicts = measure_records(dict_records, args.tasks, args.linked)
+    print("📦 Records alone, slotted vs one dict per task (the layout before slotted records)")
+    print(f"{'':>13}  {'slotted':>8}  {'dict':>8}  {'saved':>6}")
+    for label, new, old in (("per task", slotted[0], dicts[0]), ("per ticket", slotted[1], dicts[1])):
+        saved = f"{(1 - new / old) * 100:.0f}%" if old else "-"
+        print(f"{label:>13}  {new:>8}  {old:>8}  {saved:>6}")
+
+    loaded = measure_load(storage, args.tasks, args.linked)
+    print(f"💾 load from SQLite: {loaded['seconds']}s for {loaded['tasks']:,} tasks, {loaded['tickets']:,} linked "
+          f"(rows, indexes and search index)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
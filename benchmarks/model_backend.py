@@ -0,0 +1,141 @@
+# ==============================================================================
+# MODEL BACKEND LOAD TEST
+# ==============================================================================
+# python -m benchmarks.model_backend                          # 50, 200, 500 concurrent agent calls
+# python -m benchmarks.model_backend --concurrency 300 --latency 0.2 --failure-rate 0.05
+#
+# Starts a local stand-in for an OpenAI-compatible /chat/completions endpoint and
+# drives HTTPModelBackend through the real agents at increasing concurrency.
+# Reports latency percentiles, retries and how many TCP connections were opened.
+
+import argparse
+import asyncio
+import contextlib
+import http.server
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+NUMBERED_LINE = re.compile(r"^(\d+)\. ", re.MULTILINE)
+
+class ModelStubHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = body["messages"][-1]["content"]
+        time.sleep(self.server.latency * random.uniform(0.8, 1.2))
+
+        if random.random() < self.server.failure_rate:
+            self._reply(503, {"error": "overloaded"}, {"Retry-After": "0"})
+            return
+
+        numbers = NUMBERED_LINE.findall(prompt)
+        if numbers:
+            content = "\n".join(f"{n}. {random.choice(('High', 'Medium', 'Low'))} {random.choice((2, 3, 5, 8, 13))}" for n in numbers)
+        else:
+            content = f"Stand-in answer for: {prompt[:80]}\n\nSecond paragraph.\n\nThird paragraph."
+        self._reply(200, {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        })
+
+    def _reply(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class ModelStubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 resets connections when hundreds of clients dial at once
+    request_queue_size = 1024
+
+def start_model_stub(latency: float = 0.1, failure_rate: float = 0.0, port: int = 0):
+    server = ModelStubServer(("127.0.0.1", port), ModelStubHandler)
+    server.latency = latency
+    server.failure_rate = failure_rate
+    server.connections = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def drive(agents: list, concurrency: int, total: int) -> Dict[str, Any]:
+    latencies = []
+    failures = 0
+    remaining = iter(range(total))
+
+    async def user():
+        nonlocal failures
+        for n in remaining:
+            agent = agents[n % len(agents)]
+            started = time.perf_counter()
+            try:
+                await agent.process(f"Benchmark topic {n}")
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    pick = lambda pct: latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))] * 1000
+    return dict(concurrency=concurrency, calls=total, failures=failures, throughput_rps=round(total / elapsed, 1),
+                p50_ms=round(pick(50), 1), p99_ms=round(pick(99), 1), max_ms=round(latencies[-1] * 1000, 1))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.model_backend", description="HTTP model backend load test")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--calls", type=int, default=0, help="calls per level (default: 5x the concurrency)")
+    parser.add_argument("--latency", type=float, default=0.1, help="stand-in server response time in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+    server = start_model_stub(args.latency, args.failure_rate)
+    backend = dashboard.HTTPModelBackend(f"http://127.0.0.1:{server.server_port}/v1", "stand-in",
+                                         max_concurrency=max(args.concurrency))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        agents = [dashboard.RoadmapAgent(), dashboard.ResearchAgent(), dashboard.TaskAgent()]
+    for agent in agents:
+        agent.backend = backend
+
+    print(f"🧪 Stand-in model: {args.latency * 1000:.0f} ms per request, {args.failure_rate:.0%} answered 503")
+    print(f"{'concurrency':>11}  {'calls':>6}  {'rps':>7}  {'p50_ms':>7}  {'p99_ms':>7}  {'max_ms':>7}  {'failed':>6}  {'retries':>7}  {'connections':>11}")
+    for concurrency in args.concurrency:
+        retries, connections = backend.retries, server.connections
+        result = dashboard.mcp_loop.run_sync(drive(agents, concurrency, args.calls or concurrency * 5))
+        print(f"{result['concurrency']:>11}  {result['calls']:>6}  {result['throughput_rps']:>7}  {result['p50_ms']:>7}  "
+              f"{result['p99_ms']:>7}  {result['max_ms']:>7}  {result['failures']:>6}  {backend.retries - retries:>7}  "
+              f"{server.connections - connections:>11}")
+
+    stats = backend.get_stats()
+    print(f"🔢 Tokens: {stats['prompt_tokens']} prompt + {stats['completion_tokens']} completion over {stats['requests']} requests")
+    dashboard.mcp_loop.run_sync(backend.close())
+    server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# ==============================================================================
+# REPORT OFFLOAD BENCHMARK
+# ==============================================================================
+# python -m benchmarks.offload                          # inline, thread and process, 0.05s CPU per report
+# python -m benchmarks.offload --cpu 0.2 --heavy 16 --duration 10 --modes inline process
+#
+# Keeps `--heavy` roadmap/research generations running, each burning `--cpu` seconds of
+# pure-Python CPU (see cpu_bound_agent), while a probe does what an interactive handler does (a round trip through
+# the MCP loop plus a task search) every few milliseconds. Each PRODUCTMIND_AGENT_EXECUTION
+# mode runs in a fresh process; the probe's latency shows whether report rendering stalls
+# everybody else.
+
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+# Stands in for a heavy report renderer: the agent's render() first burns `cpu` seconds of
+# pure-Python CPU on whatever thread or process renders the report
+def cpu_bound_agent(factory, cpu: float):
+    agent = factory()
+    render = agent.render
+
+    def render_after_burning(prompt: str) -> str:
+        deadline = time.thread_time() + cpu
+        while time.thread_time() < deadline:
+            pass
+        return render(prompt)
+
+    agent.render = render_after_burning
+    return agent
+
+def use_cpu_bound_agents(dashboard, cpu: float):
+    for key, factory in list(dashboard.AGENT_FACTORIES.items()):
+        dashboard.AGENT_FACTORIES[key] = functools.partial(cpu_bound_agent, factory, cpu)
+    # Pool processes import dashboard afresh, so they swap in the same factories before building agents
+    executors = dashboard.mcp.executors
+    executors.initargs = (cpu, executors.initializer) + executors.initargs
+    executors.initializer = init_pool_worker
+
+def init_pool_worker(cpu: float, initializer, *initargs):
+    import dashboard
+
+    use_cpu_bound_agents(dashboard, cpu)
+    initializer(*initargs)
+
+def percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+def probe(dashboard, stop: threading.Event, interval: float) -> List[float]:
+    timings = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        dashboard.mcp_loop.run_sync(asyncio.sleep(0))
+        dashboard.get_task_store().search("roadmap", 10)
+        timings.append((time.perf_counter() - started) * 1000)
+        time.sleep(interval)
+    return timings
+
+# Probe latency with nothing else running
+def probe_for(dashboard, stop: threading.Event, interval: float, seconds: float) -> List[float]:
+    threading.Timer(seconds, stop.set).start()
+    timings = sorted(probe(dashboard, stop, interval))
+    stop.clear()
+    return timings
+
+async def generate(dashboard, heavy: int, duration: float) -> int:
+    done = 0
+    deadline = time.perf_counter() + duration
+
+    async def user(n: int):
+        nonlocal done
+        call = 0
+        while time.perf_counter() < deadline:
+            # Distinct topics so roadmaps are never served from the cache
+            tool = ("generate_roadmap", "generate_research")[call % 2]
+            await dashboard.mcp.call_tool(tool, topic=f"Offload product {n}-{call}")
+            call += 1
+            done += 1
+
+    await asyncio.gather(*(user(n) for n in range(heavy)))
+    return done
+
+# Runs in a fresh process: the execution mode is read when dashboard is imported
+def run_mode(mode: str, heavy: int, cpu: float, duration: float, interval: float) -> Dict[str, Any]:
+    for var in ("PRODUCTMIND_DB", "JIRA_BASE_URL", "PRODUCTMIND_MODEL_URL"):
+        os.environ.pop(var, None)
+    os.environ.update(PRODUCTMIND_AGENT_EXECUTION=mode, PRODUCTMIND_AGENT_LATENCY="0")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+        use_cpu_bound_agents(dashboard, cpu)
+        dashboard.mcp.start_executors()
+        dashboard.get_task_store().add_tasks([{"title": f"Roadmap review {n}", "priority": "medium"} for n in range(1000)])
+
+        stop = threading.Event()
+        idle = probe_for(dashboard, stop, interval, 1.0)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            probing = executor.submit(probe, dashboard, stop, interval)
+            started = time.perf_counter()
+            reports = dashboard.mcp_loop.run_sync(generate(dashboard, heavy, duration))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            timings = sorted(probing.result())
+        dashboard.mcp.executors.shutdown()
+        dashboard.mcp_loop.stop()
+
+    return dict(mode=mode, idle_p50_ms=percentile(idle, 50), p50_ms=percentile(timings, 50),
+                p99_ms=percentile(timings, 99), max_ms=timings[-1], probes=len(timings), reports_per_s=reports / elapsed)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.offload", description="Interactive latency under report load")
+    parser.add_argument("--modes", nargs="+", choices=("inline", "thread", "process"), default=["inline", "thread", "process"])
+    parser.add_argument("--heavy", type=int, default=8, help="concurrent report generations")
+    parser.add_argument("--cpu", type=float, default=0.05, help="CPU seconds per report")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load per mode")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between probes")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    context = multiprocessing.get_context("spawn")
+    print(f"🧪 {args.heavy} concurrent reports at {args.cpu * 1000:.0f} ms CPU each, {os.cpu_count()} CPUs")
+    print(f"{'mode':>8}  {'idle_p50_ms':>11}  {'p50_ms':>7}  {'p99_ms':>7}  {'max_ms':>7}  {'probes':>6}  {'reports/s':>9}")
+    for mode in args.modes:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_mode, mode, args.heavy, args.cpu, args.duration, args.interval).result()
+        print(f"{result['mode']:>8}  {result['idle_p50_ms']:>11.2f}  {result['p50_ms']:>7.2f}  {result['p99_ms']:>7.2f}  "
+              f"{result['max_ms']:>7.1f}  {result['probes']:>6}  {result['reports_per_s']:>9.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
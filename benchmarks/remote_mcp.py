@@ -0,0 +1,138 @@
+# ==============================================================================
+# REMOTE MCP BENCHMARK
+# ==============================================================================
+# python -m benchmarks.remote_mcp                        # in-process, then 1, 2 and 4 local servers
+# python -m benchmarks.remote_mcp --servers 1 4 8 --concurrency 128 --cpu 0.02
+# python -m benchmarks.remote_mcp --servers tcp://127.0.0.1:8765   # servers started elsewhere
+#
+# Drives generate_research (unseeded, so never cached) with closed-loop concurrent callers,
+# first through the in-process SimpleMCP and then through RemoteMCP over one multiplexed
+# connection per server. Each report costs `--latency` seconds of waiting plus `--cpu`
+# seconds of CPU, so throughput shows both request multiplexing and scaling over processes.
+# Local servers are started by this script (--serve) so their agents burn the same CPU.
+
+import argparse
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.offload import use_cpu_bound_agents
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def drive(call, concurrency: int, total: int) -> Dict[str, Any]:
+    latencies = []
+    failures = 0
+    remaining = iter(range(total))
+
+    async def user():
+        nonlocal failures
+        for n in remaining:
+            started = time.perf_counter()
+            try:
+                await call("generate_research", topic=f"Remote topic {n}")
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    pick = lambda pct: latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))] * 1000
+    return dict(calls=total, failures=failures, throughput_rps=round(total / elapsed, 1),
+                p50_ms=round(pick(50), 1), p99_ms=round(pick(99), 1))
+
+# An agent server whose reports burn `cpu` seconds each; runs until killed
+def serve(endpoint: str, cpu: float):
+    import dashboard
+
+    use_cpu_bound_agents(dashboard, cpu)
+    dashboard.serve_mcp(endpoint)
+
+@contextlib.contextmanager
+def local_servers(count: int, cpu: float):
+    ports = []
+    for _ in range(count):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            ports.append(sock.getsockname()[1])
+    processes = [subprocess.Popen([sys.executable, "-m", "benchmarks.remote_mcp", "--serve", f"tcp://127.0.0.1:{port}",
+                                   "--cpu", str(cpu)], cwd=ROOT, stdout=subprocess.DEVNULL) for port in ports]
+    try:
+        for port in ports:
+            wait_for_port(port)
+        yield [f"tcp://127.0.0.1:{port}" for port in ports]
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.05)
+
+def run_remote(dashboard, endpoints: List[str], concurrency: int, calls: int) -> Dict[str, Any]:
+    remote = dashboard.RemoteMCP(endpoints)
+    with contextlib.redirect_stdout(sys.stderr):
+        dashboard.mcp_loop.run_sync(remote.connect())
+    try:
+        return dashboard.mcp_loop.run_sync(drive(remote.call_tool, concurrency, calls))
+    finally:
+        dashboard.mcp_loop.run_sync(remote.close())
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.remote_mcp", description="MCP JSON-RPC server throughput")
+    parser.add_argument("--servers", nargs="+", default=["1", "2", "4"],
+                        help="numbers of local servers to start, or endpoints such as tcp://host:port")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated model wait per report")
+    parser.add_argument("--cpu", type=float, default=0.005, help="CPU seconds per report")
+    parser.add_argument("--serve", metavar="ENDPOINT", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.serve:
+        return serve(args.serve, args.cpu)
+    for var in ("PRODUCTMIND_DB", "PRODUCTMIND_MODEL_URL", "PRODUCTMIND_SEED_BY_TOPIC", "PRODUCTMIND_MCP_SERVERS"):
+        os.environ.pop(var, None)
+    # Read at import here and in every server process started below
+    os.environ.update(PRODUCTMIND_AGENT_LATENCY=str(args.latency))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+        use_cpu_bound_agents(dashboard, args.cpu)
+        dashboard.get_agent("research")
+
+    print(f"🧪 {args.concurrency} concurrent callers, {args.calls} reports of {args.latency * 1000:.0f} ms wait "
+          f"+ {args.cpu * 1000:.0f} ms CPU, {os.cpu_count()} CPUs")
+    print(f"{'servers':>28}  {'rps':>7}  {'p50_ms':>7}  {'p99_ms':>7}  {'failed':>6}")
+    result = dashboard.mcp_loop.run_sync(drive(dashboard.mcp.call_tool, args.concurrency, args.calls))
+    print(f"{'in-process':>28}  {result['throughput_rps']:>7}  {result['p50_ms']:>7}  {result['p99_ms']:>7}  {result['failures']:>6}")
+
+    for servers in args.servers:
+        if servers.isdigit():
+            with local_servers(int(servers), args.cpu) as endpoints:
+                result = run_remote(dashboard, endpoints, args.concurrency, args.calls)
+            label = f"{servers} x local"
+        else:
+            result = run_remote(dashboard, [servers], args.concurrency, args.calls)
+            label = servers
+        print(f"{label:>28}  {result['throughput_rps']:>7}  {result['p50_ms']:>7}  {result['p99_ms']:>7}  {result['failures']:>6}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# ==============================================================================
+# BENCHMARK SCENARIOS
+# ==============================================================================
+# Each scenario drives one request path of dashboard.py exactly as the Gradio UI
+# would, so the numbers include handler, MCP dispatch, agents and the task store.
+
+async def drain(gen):
+    last = ""
+    async for last in gen:
+        pass
+    return last
+
+class Scenario:
+    name = ""
+
+    def __init__(self, dashboard, total: int, distinct: int):
+        self.dashboard = dashboard
+        self.total = total
+        self.distinct = max(1, distinct)
+
+    def topic(self, n: int) -> str:
+        return f"Benchmark Product {n % self.distinct}"
+
+    async def setup(self):
+        pass
+
+    async def request(self, n: int) -> str:
+        raise NotImplementedError
+
+class RoadmapScenario(Scenario):
+    name = "roadmap"
+
+    async def request(self, n: int) -> str:
+        return await drain(self.dashboard.generate_roadmap_interface(self.topic(n)))
+
+class ResearchScenario(Scenario):
+    name = "research"
+
+    async def request(self, n: int) -> str:
+        return await drain(self.dashboard.generate_research_interface(self.topic(n)))
+
+class AddTaskScenario(Scenario):
+    name = "add_task"
+
+    async def request(self, n: int) -> str:
+        message, _ = await self.dashboard.add_task_interface(self.topic(n), ("low", "medium", "high")[n % 3], "todo")
+        return message
+
+class JiraScenario(Scenario):
+    name = "jira"
+
+    async def setup(self):
+        store = self.dashboard.get_task_store()
+        self.task_ids = [store.add_task(f"Jira benchmark task {n}", "medium")["id"] for n in range(self.total)]
+
+    async def request(self, n: int) -> str:
+        return await self.dashboard.create_jira_ticket_interface(
+            str(self.task_ids[n]), "PRODUCTMIND (PM)", "Unassigned", "PM-Epic-Q1-Features", "5"
+        )
+
+class McpCallScenario(Scenario):
+    name = "mcp_call"
+
+    async def request(self, n: int) -> str:
+        dashboard = self.dashboard
+        return await dashboard.mcp_loop.run(dashboard.mcp.call_tool("analyze_task", task=self.topic(n)))
+
+SCENARIOS = {cls.name: cls for cls in (RoadmapScenario, ResearchScenario, AddTaskScenario, JiraScenario, McpCallScenario)}
@@ -0,0 +1,109 @@
+# ==============================================================================
+# TASK SEARCH BENCHMARK
+# ==============================================================================
+# python -m benchmarks.search                    # 1M tasks, 5,000-word Zipf vocabulary
+# python -m benchmarks.search --tasks 200000 --queries 2000
+#
+# Fills a TaskStore with generated titles, then times TaskStore.search for exact,
+# prefix, typo, multi-word and filtered queries drawn from the same vocabulary.
+
+import argparse
+import contextlib
+import gc
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+EPICS = ("PM-Epic-Q1-Features", "PM-Epic-User-Experience", "PM-Epic-Performance", None)
+ASSIGNEES = ("John Smith", "Sarah Johnson", "Mike Chen", None)
+
+# In frequency order, most common first; frequency is unrelated to spelling, as in real titles
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+def make_titles(rng: random.Random, vocabulary: List[str], count: int) -> List[str]:
+    # Zipf-like: a few words appear in many titles, most are rare
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    words = rng.choices(vocabulary, weights=weights, k=count * 5)
+    return [" ".join(words[n * 5:n * 5 + rng.randint(3, 5)]).capitalize() + f" #{n}" for n in range(count)]
+
+def typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+def make_queries(rng: random.Random, vocabulary: List[str]) -> Dict[str, Any]:
+    rare = vocabulary[len(vocabulary) // 2:]
+    common = vocabulary[:50]
+    return {
+        "exact": lambda: (rng.choice(rare), {}),
+        "prefix": lambda: (rng.choice(rare)[:3], {}),
+        "typo": lambda: (typo(rng, rng.choice(rare)), {}),
+        "two_words": lambda: (f"{rng.choice(common)} {rng.choice(rare)[:4]}", {}),
+        "filtered": lambda: (rng.choice(rare), {"status": "todo", "has_jira": False}),
+        "common_word": lambda: (rng.choice(common), {}),
+        "common_filtered": lambda: (rng.choice(common), {"status": "todo"})
+    }
+
+def percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.search", description="TaskStore search latency")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="distinct title words")
+    parser.add_argument("--queries", type=int, default=1000, help="queries per kind")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.pop("PRODUCTMIND_DB", None)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    titles = make_titles(rng, vocabulary, args.tasks)
+    rows = [
+        {"title": title, "priority": ("low", "medium", "high")[n % 3], "status": ("todo", "progress", "done")[n % 3],
+         "epic": EPICS[n % 4], "assignee": ASSIGNEES[n % 4]}
+        for n, title in enumerate(titles)
+    ]
+
+    store = dashboard.TaskStore()
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for batch in dashboard.batched(rows, 10000):
+        store.add_tasks(batch)
+    load_seconds = time.perf_counter() - started
+    gc.collect()
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    stats = store.search_index.get_stats()
+    print(f"🗂️ {args.tasks:,} tasks indexed in {load_seconds:.1f}s ({args.tasks / load_seconds:,.0f}/s), "
+          f"{stats['tokens']:,} tokens, {index_bytes / args.tasks:.0f} bytes/task for store + index")
+
+    print(f"{'query':>15}  {'p50_us':>8}  {'p99_us':>8}  {'max_us':>8}  {'avg_matches':>11}")
+    for kind, make in make_queries(rng, vocabulary).items():
+        timings, matches = [], 0
+        for _ in range(args.queries):
+            query, filters = make()
+            started = time.perf_counter()
+            _, total, _ = store.search(query, 25, **filters)
+            timings.append((time.perf_counter() - started) * 1e6)
+            matches += total
+        timings.sort()
+        print(f"{kind:>15}  {percentile(timings, 50):>8.0f}  {percentile(timings, 99):>8.0f}  {timings[-1]:>8.0f}  "
+              f"{matches / args.queries:>11,.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
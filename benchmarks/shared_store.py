@@ -0,0 +1,166 @@
+# ==============================================================================
+# SHARED TASK STORE TEST
+# ==============================================================================
+# python -m benchmarks.shared_store                      # 1, 2 and 4 worker processes
+# python -m benchmarks.shared_store --workers 8 --adds 20000
+#
+# Worker processes open one SQLite file in shared mode (PRODUCTMIND_DB_SHARED=1) and, in
+# lock-step phases, add tasks one by one and in batches, update and rename tasks created by
+# any worker, and race each other to link the same tasks to Jira. After each phase every
+# worker refreshes; at the end all workers and the file itself must hold the same tasks,
+# with unique ids, unique Jira keys and no task linked twice.
+
+import argparse
+import concurrent.futures
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+def digest(rows) -> str:
+    return hashlib.sha1(repr(sorted(rows)).encode()).hexdigest()[:12]
+
+def worker(n: int, path: str, barrier, adds: int, updates: int, links: int) -> Dict[str, Any]:
+    os.environ.update(PRODUCTMIND_DB=path, PRODUCTMIND_DB_SHARED="1")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+    store = dashboard.get_task_store()
+    leases = [0]
+    lease_ids = store.backend.lease_ids
+
+    def counted_lease(*args):
+        leases[0] += 1
+        return lease_ids(*args)
+
+    store.backend.lease_ids = counted_lease
+    rng = random.Random(n)
+    timings = {}
+
+    def phase(name: str, work):
+        barrier.wait()
+        started = time.perf_counter()
+        work()
+        store.backend.flush()
+        timings[name] = time.perf_counter() - started
+        barrier.wait()
+        store.refresh()
+
+    def add():
+        for i in range(adds // 2):
+            store.add_task(f"Shared task {n}-{i}", ("low", "medium", "high")[i % 3])
+        for start in range(adds // 2, adds, 100):
+            store.add_tasks([{"title": f"Shared task {n}-{i}"} for i in range(start, min(start + 100, adds))])
+
+    def update():
+        ids = list(store.tasks_by_id)
+        for i in range(updates):
+            changes = dict(status=rng.choice(("todo", "progress", "done")))
+            if i % 10 == 0:
+                changes["title"] = f"Renamed by {n} {rng.choice(('alpha', 'beta', 'gamma'))}"
+            store.update_task(rng.choice(ids), **changes)
+
+    # The same targets in every worker: exactly one process may win each
+    def link():
+        for task_id in sorted(store.tasks_by_id)[:links]:
+            try:
+                store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", f"worker-{n}", "Shared", "3")
+            except ValueError:
+                pass
+
+    phase("add", add)
+    phase("update", update)
+    phase("link", link)
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        store.refresh()
+    idle_refresh_us = (time.perf_counter() - started) / 10000 * 1e6
+
+    ids = [task.id for task in store.tasks]
+    result = dict(
+        tasks=len(ids),
+        ordered=ids == sorted(ids),
+        leases=leases[0],
+        timings=timings,
+        idle_refresh_us=idle_refresh_us,
+        task_digest=digest(task.row() for task in store.tasks),
+        ticket_digest=digest(ticket.row() for ticket in store.jira_tickets),
+        search_hits=store.search("renamed", 10)[1]
+    )
+    store.close()
+    return result
+
+def check(results: List[Dict[str, Any]], path: str, columns: tuple, workers: int, adds: int, links: int) -> List[str]:
+    problems = []
+    conn = sqlite3.connect(path)
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM tasks").fetchall()
+    tickets = conn.execute("SELECT id, task_id FROM jira_tickets").fetchall()
+    conn.close()
+
+    if len(rows) != workers * adds:
+        problems.append(f"expected {workers * adds} tasks in the file, found {len(rows)}")
+    if len({row[0] for row in rows}) != len(rows):
+        problems.append("duplicated task ids")
+    linked = [task_id for _, task_id in tickets]
+    if len(linked) != len(set(linked)):
+        problems.append(f"{len(linked) - len(set(linked))} tasks were linked more than once")
+    if len(set(linked)) != links:
+        problems.append(f"{links - len(set(linked))} link targets have no ticket")
+    if len({row[5] for row in rows if row[5]}) != len(tickets):
+        problems.append("tasks and tickets disagree on Jira keys")
+    if len({result["task_digest"] for result in results}) != 1 or results[0]["task_digest"] != digest(rows):
+        problems.append("workers disagree with the file on task contents")
+    if len({result["ticket_digest"] for result in results}) != 1:
+        problems.append("workers disagree on Jira tickets")
+    if not all(result["ordered"] for result in results):
+        problems.append("a worker's task list is not in id order")
+    if len({result["search_hits"] for result in results}) != 1:
+        problems.append("workers' search indexes disagree")
+    return problems
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.shared_store", description="Multi-process shared TaskStore test")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker process counts to run")
+    parser.add_argument("--adds", type=int, default=10000, help="tasks added per worker")
+    parser.add_argument("--updates", type=int, default=5000, help="updates per worker")
+    parser.add_argument("--links", type=int, default=500, help="tasks every worker races to link to Jira")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, root)
+    os.environ["PYTHONPATH"] = root
+    os.environ.pop("PRODUCTMIND_DB", None)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+
+    failed = False
+    print(f"{'workers':>7}  {'tasks':>7}  {'adds/s':>8}  {'updates/s':>9}  {'links/s':>8}  {'leases':>6}  {'idle_refresh_us':>15}  result")
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "shared.db")
+            barrier = manager.Barrier(workers)
+            with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context) as executor:
+                futures = [executor.submit(worker, n, path, barrier, args.adds, args.updates, args.links) for n in range(workers)]
+                results = [future.result() for future in futures]
+            problems = check(results, path, dashboard.TASK_COLUMNS, workers, args.adds, args.links)
+
+        slowest = {name: max(result["timings"][name] for result in results) for name in ("add", "update", "link")}
+        failed |= bool(problems)
+        print(f"{workers:>7}  {workers * args.adds:>7}  {workers * args.adds / slowest['add']:>8.0f}  "
+              f"{workers * args.updates / slowest['update']:>9.0f}  {workers * args.links / slowest['link']:>8.0f}  "
+              f"{sum(result['leases'] for result in results):>6}  "
+              f"{max(result['idle_refresh_us'] for result in results):>15.1f}  "
+              + ("✅ consistent" if not problems else "❌ " + "; ".join(problems)))
+    manager.shutdown()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
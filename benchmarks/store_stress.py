@@ -0,0 +1,184 @@
+# ==============================================================================
+# TASK STORE STRESS TEST
+# ==============================================================================
+# python -m benchmarks.store_stress                       # 1, 2, 4, 8 writer threads
+# python -m benchmarks.store_stress --threads 16 --adds 50000
+#
+# Writers add tasks, update and rename them and race each other to link the same
+# tasks to Jira while a reader keeps rendering pages. Afterwards the store is checked
+# for lost or duplicated ids, index and search index drift and double-linked tasks.
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+def run_writers(threads: int, work) -> float:
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def worker(n: int):
+        barrier.wait()
+        try:
+            work(n)
+        except Exception as e:
+            errors.append(repr(e))
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} writer errors, first: {errors[0]}")
+    return time.perf_counter() - started
+
+def check_store(store, expected_tasks: int, linked_targets: set) -> List[str]:
+    problems = []
+    ids = [task["id"] for task in store.tasks]
+    if len(ids) != expected_tasks:
+        problems.append(f"expected {expected_tasks} tasks, found {len(ids)}")
+    if len(set(ids)) != len(ids):
+        problems.append(f"{len(ids) - len(set(ids))} duplicated ids")
+    if ids != sorted(ids):
+        problems.append("tasks list is not in id order")
+    if set(ids) != set(range(1, expected_tasks + 1)):
+        problems.append("ids are not contiguous (lost ids)")
+    if len(store.tasks_by_id) != len(ids):
+        problems.append(f"tasks_by_id has {len(store.tasks_by_id)} entries for {len(ids)} tasks")
+
+    indexed = sum(len(bucket) for bucket in store.composite_index.values())
+    if indexed != len(ids):
+        problems.append(f"composite index holds {indexed} ids for {len(ids)} tasks")
+    for key, bucket in store.composite_index.items():
+        drifted = [i for i in bucket if store._composite_key(store.tasks_by_id[i]) != key]
+        if drifted:
+            problems.append(f"{len(drifted)} tasks indexed under a stale {key}")
+    for sort_key, buckets in store.rank_index.items():
+        ranked = [i for bucket in buckets.values() for i in bucket]
+        if sorted(ranked) != sorted(ids):
+            problems.append(f"{sort_key} order holds {len(ranked)} ids for {len(ids)} tasks")
+        drifted = sum(store._rank_key(sort_key, store.tasks_by_id[i]) != key for key, bucket in buckets.items() for i in bucket)
+        if drifted:
+            problems.append(f"{drifted} tasks in a stale {sort_key} bucket")
+
+    # Every task is findable under each of its current tokens and under nothing else
+    index = store.search_index
+    expected_postings = 0
+    unsearchable = 0
+    for task in store.tasks:
+        terms = index.terms(task)
+        expected_postings += len(terms)
+        for token in terms:
+            ids = index.postings.get(token)
+            if not (ids == task.id if type(ids) is int else ids is not None and task.id in ids):
+                unsearchable += 1
+    if unsearchable:
+        problems.append(f"{unsearchable} task tokens missing from the search index")
+    postings = sum(1 if type(ids) is int else len(ids) for ids in index.postings.values())
+    if postings != expected_postings:
+        problems.append(f"search index holds {postings} postings for {expected_postings} task tokens")
+
+    linked = [ticket["task_id"] for ticket in store.jira_tickets]
+    if len(linked) != len(set(linked)):
+        problems.append(f"{len(linked) - len(set(linked))} tasks were linked more than once")
+    if set(linked) != linked_targets:
+        problems.append(f"{len(linked_targets - set(linked))} link targets have no ticket")
+    if len({ticket["id"] for ticket in store.jira_tickets}) != len(linked):
+        problems.append("duplicated Jira keys")
+    for ticket in store.jira_tickets:
+        if store.tasks_by_id[ticket["task_id"]]["jira_id"] != ticket["id"]:
+            problems.append(f"task {ticket['task_id']} points at the wrong ticket")
+            break
+    return problems
+
+def stress(dashboard, threads: int, adds: int, updates: int, links: int) -> Dict[str, Any]:
+    store = dashboard.TaskStore()
+    total = threads * adds
+    stop_reading = threading.Event()
+    reads = [0]
+
+    def reader():
+        rng = random.Random(0)
+        while not stop_reading.is_set():
+            store.get_tasks_display(rng.randint(1, 50), 25, rng.choice(store.SORT_KEYS))
+            store.find(priority="high", status="progress")
+            reads[0] += 1
+
+    def add(n: int):
+        for i in range(adds):
+            store.add_task(f"Stress task {n}-{i}", ("low", "medium", "high")[i % 3])
+
+    def update(n: int):
+        rng = random.Random(n)
+        for i in range(updates):
+            changes = dict(status=rng.choice(("todo", "progress", "done")), priority=rng.choice(("low", "medium", "high")))
+            # Every tenth update renames the task, which re-tokenizes it in the search index
+            if i % 10 == 0:
+                changes["title"] = f"Renamed by {n} {rng.choice(('alpha', 'beta', 'gamma'))}"
+            store.update_task(rng.randint(1, total), **changes)
+
+    # Every writer tries to link the same tasks; exactly one of them may win each
+    targets = set(range(1, min(links, total) + 1))
+
+    def link(n: int):
+        for task_id in sorted(targets):
+            try:
+                store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", f"writer-{n}", "Stress", "3")
+            except ValueError:
+                pass
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    try:
+        add_seconds = run_writers(threads, add)
+        update_seconds = run_writers(threads, update)
+        link_seconds = run_writers(threads, link)
+    finally:
+        stop_reading.set()
+        reader_thread.join()
+
+    return dict(
+        threads=threads,
+        tasks=total,
+        adds_per_s=round(total / add_seconds),
+        updates_per_s=round(threads * updates / update_seconds),
+        link_attempts_per_s=round(threads * len(targets) / link_seconds),
+        page_reads=reads[0],
+        problems=check_store(store, total, targets)
+    )
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.store_stress", description="TaskStore concurrency stress test")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="writer thread counts to run")
+    parser.add_argument("--adds", type=int, default=20000, help="tasks added per writer")
+    parser.add_argument("--updates", type=int, default=20000, help="updates per writer")
+    parser.add_argument("--links", type=int, default=2000, help="tasks every writer races to link to Jira")
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="GIL switch interval in seconds; tiny values force more interleavings")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.pop("PRODUCTMIND_DB", None)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+    sys.setswitchinterval(args.switch_interval)
+
+    failed = False
+    print(f"{'threads':>7}  {'tasks':>8}  {'adds/s':>9}  {'updates/s':>9}  {'links/s':>9}  {'page reads':>10}  result")
+    for threads in args.threads:
+        result = stress(dashboard, threads, args.adds, args.updates, args.links)
+        failed |= bool(result["problems"])
+        print(f"{result['threads']:>7}  {result['tasks']:>8}  {result['adds_per_s']:>9}  {result['updates_per_s']:>9}  "
+              f"{result['link_attempts_per_s']:>9}  {result['page_reads']:>10}  "
+              + ("✅ consistent" if not result["problems"] else "❌ " + "; ".join(result["problems"])))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
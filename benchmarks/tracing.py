@@ -0,0 +1,95 @@
+# ==============================================================================
+# TRACING OVERHEAD BENCHMARK
+# ==============================================================================
+# python -m benchmarks.tracing                           # off, every trace, 10% of traces
+# python -m benchmarks.tracing --requests 5000 --samples 1 0.01
+#
+# Runs the benchmark scenarios one request at a time (agent latency 0, so only the
+# framework's own work is timed) in a fresh process per tracing setting, since
+# PRODUCTMIND_TRACE_FILE and PRODUCTMIND_TRACE_SAMPLE are read at import. Reports the
+# time per request, spans per request and the bytes written to the trace file.
+
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+SCENARIO_NAMES = ("roadmap", "add_task", "mcp_call", "search")
+
+async def run_scenarios(dashboard, requests: int) -> Dict[str, float]:
+    from benchmarks.scenarios import SCENARIOS
+
+    timings = {}
+    for name in SCENARIO_NAMES:
+        if name == "search":
+            call = lambda n: asyncio.to_thread(dashboard.search_tasks_interface, f"benchmark product {n % 50}")
+        else:
+            scenario = SCENARIOS[name](dashboard, requests, requests)
+            await scenario.setup()
+            call = scenario.request
+        for n in range(min(requests, 50)):
+            await call(n)
+        started = time.perf_counter()
+        for n in range(requests):
+            await call(n)
+        timings[name] = (time.perf_counter() - started) / requests * 1e6
+    return timings
+
+# Runs in a fresh process: the tracing settings are read when dashboard is imported
+def run_mode(sample: Optional[float], requests: int, directory: str) -> Dict[str, Any]:
+    path = os.path.join(directory, f"trace-{sample}.jsonl")
+    for var in ("PRODUCTMIND_DB", "PRODUCTMIND_MODEL_URL", "PRODUCTMIND_SEED_BY_TOPIC", "PRODUCTMIND_MCP_SERVERS",
+                "PRODUCTMIND_TRACE_FILE", "JIRA_BASE_URL"):
+        os.environ.pop(var, None)
+    os.environ.update(PRODUCTMIND_AGENT_LATENCY="0", PRODUCTMIND_AGENT_EXECUTION="inline")
+    if sample is not None:
+        os.environ.update(PRODUCTMIND_TRACE_FILE=path, PRODUCTMIND_TRACE_SAMPLE=str(sample))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import dashboard
+
+        timings = asyncio.run(run_scenarios(dashboard, requests))
+        dashboard.tracer.flush()
+    stats = dashboard.tracer.get_stats()
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    return dict(timings=timings, spans=stats["exported_spans"], traces=stats["traces"], bytes=size)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.tracing", description="Tracing overhead per request")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--samples", type=float, nargs="+", default=[1.0, 0.1], help="sample rates to compare with tracing off")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, root)
+    os.environ["PYTHONPATH"] = root
+    context = multiprocessing.get_context("spawn")
+    modes: List[Optional[float]] = [None] + args.samples
+
+    print(f"🧪 {args.requests} sequential requests per scenario, agent latency 0")
+    print(f"{'tracing':>10}  " + "  ".join(f"{name + '_us':>12}" for name in SCENARIO_NAMES)
+          + f"  {'spans/trace':>11}  {'bytes/span':>10}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for sample in modes:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_mode, sample, args.requests, directory).result()
+            timings = result["timings"]
+            baseline = baseline or timings
+            cells = []
+            for name in SCENARIO_NAMES:
+                overhead = "" if timings is baseline else f" {(timings[name] / baseline[name] - 1) * 100:+.0f}%"
+                cells.append(f"{timings[name]:>7.1f}{overhead:>5}")
+            label = "off" if sample is None else f"{sample:.0%}"
+            per_trace = f"{result['spans'] / result['traces']:.1f}" if result["traces"] else "-"
+            per_span = f"{result['bytes'] / result['spans']:.0f}" if result["spans"] else "-"
+            print(f"{label:>10}  " + "  ".join(f"{cell:>12}" for cell in cells) + f"  {per_trace:>11}  {per_span:>10}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
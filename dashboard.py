@@ -5,44 +5,149 @@
 # STEP 1: Install packages
 # !pip install gradio pyngrok
 
-import gradio as gr
-import asyncio
 import time
+# Cold-start clock: reported at launch and by `python dashboard.py --cold-start`
+_IMPORT_STARTED = time.perf_counter()
+
+# gradio and pyngrok are imported inside create_dashboard()/launch, so workers,
+# benchmarks and the MCP tools can import this module without paying for the UI
+import argparse
+import asyncio
+import atexit
+import concurrent.futures
+import csv
+import http.server
+import io
+import itertools
+import json
+import os
+import tempfile
+import threading
 import random
-from datetime import datetime
+import re
+import zlib
+from collections import deque
+from collections.abc import Mapping
 from typing import List, Dict, Any
 
+from backends import AgentBackend, HTTPModelBackend, OfflineBackend
+from mcp_rpc import AGENT_POOL_OWNER_ENV, MCPServer, RemoteMCP, ServerBusyError, SimpleMCP, normalize_value
+from storage import TASK_COLUMNS, Task, TaskStore, open_task_backend
+from tracing import traced, traced_stream, tracer
+
+# ==============================================================================
+# ASYNC RUNTIME
+# ==============================================================================
+
+# Samples how late a loop wakes up from a short sleep; a busy or blocked loop shows up here
+class EventLoopLagMonitor:
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+    
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(loop.time() - expected, 0.0)
+            self.max_lag = max(self.max_lag, self.lag)
+
+# One long-lived event loop on a daemon thread that every handler submits to
+class BackgroundLoop:
+    def __init__(self, name: str = "mcp-loop"):
+        self.name = name
+        self.lag_monitor = EventLoopLagMonitor()
+        self._monitor_task = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    ready = threading.Event()
+                    
+                    def run_forever():
+                        asyncio.set_event_loop(loop)
+                        self._monitor_task = loop.create_task(self.lag_monitor.run())
+                        loop.call_soon(ready.set)
+                        loop.run_forever()
+                    
+                    self._thread = threading.Thread(target=run_forever, name=self.name, daemon=True)
+                    self._thread.start()
+                    ready.wait()
+                    self._loop = loop
+        return self._loop
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    async def run(self, coro):
+        # Already on the shared loop (e.g. a tool calling another tool): just await
+        if asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+    
+    def run_sync(self, coro, timeout: float = None):
+        return self.submit(coro).result(timeout)
+    
+    # Drive an async generator living on the shared loop from any other loop, one item at a time
+    async def stream(self, agen):
+        if asyncio.get_running_loop() is self._loop:
+            async for item in agen:
+                yield item
+            return
+        
+        async def next_item():
+            try:
+                return False, await agen.__anext__()
+            except StopAsyncIteration:
+                return True, None
+        
+        async def close():
+            try:
+                await agen.aclose()
+            except RuntimeError:
+                pass
+        
+        try:
+            while True:
+                done, item = await self.run(next_item())
+                if done:
+                    return
+                yield item
+        finally:
+            self.submit(close())
+    
+    def stop(self):
+        if self._loop is not None:
+            loop, monitor = self._loop, self._monitor_task
+            
+            # The loop stops once the monitor has unwound, so no task is left pending
+            def shutdown():
+                monitor.cancel()
+                monitor.add_done_callback(lambda task: loop.stop())
+            
+            loop.call_soon_threadsafe(shutdown)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+mcp_loop = BackgroundLoop()
+
 # ==============================================================================
 # MCP SERVER
 # ==============================================================================
 
-class SimpleMCP:
-    def __init__(self):
-        self.tools = {}
-        self.history = []
-    
-    def register_tool(self, name: str, func):
-        self.tools[name] = func
-        print(f"✅ MCP Tool: {name}")
-    
-    async def call_tool(self, tool_name: str, **kwargs):
-        if tool_name in self.tools:
-            result = await self.tools[tool_name](**kwargs)
-            self.history.append({
-                "tool": tool_name,
-                "input": kwargs,
-                "output": result,
-                "timestamp": datetime.now().strftime("%H:%M:%S")
-            })
-            return result
-        return f"Tool {tool_name} not found"
-    
-    def get_stats(self):
-        return {
-            "total_calls": len(self.history),
-            "tools_available": len(self.tools),
-            "last_call": self.history[-1]["timestamp"] if self.history else "None"
-        }
+# Pool processes import this module as well. They only render agent output, so they skip the
+# task database; the pool initializer records the owner's pid in the worker's environment.
+def in_agent_worker() -> bool:
+    return os.environ.get(AGENT_POOL_OWNER_ENV) == str(os.getppid())
 
 mcp = SimpleMCP()
 
@@ -50,96 +155,300 @@ mcp = SimpleMCP()
 # TASK AND JIRA DATA STORAGE
 # ==============================================================================
 
-class TaskStore:
-    def __init__(self):
-        self.tasks = []
-        self.jira_tickets = []
-        self.task_counter = 1
-        self.jira_counter = 100
-    
-    def add_task(self, title: str, priority: str, status: str = "todo"):
-        task = {
-            "id": self.task_counter,
-            "title": title,
-            "priority": priority,
-            "status": status,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "jira_id": None,
-            "jira_url": None
-        }
-        self.tasks.append(task)
-        self.task_counter += 1
-        return task
+# PRODUCTMIND_DB_SHARED=1 when several dashboard processes serve the same PRODUCTMIND_DB file
+DB_SHARED = os.environ.get("PRODUCTMIND_DB_SHARED", "").lower() in ("1", "true", "yes")
+
+# The store is opened by main() from --db, or else on first use from $PRODUCTMIND_DB, so
+# importing this module opens no file and starts no writer thread. Pool processes and MCP
+# servers never use it.
+_task_store = None
+_task_store_lock = threading.Lock()
+
+def _open_task_store(path: str, shared: bool) -> TaskStore:
+    global _task_store
+    previous = _task_store
+    _task_store = TaskStore(backend=open_task_backend(path, shared))
+    atexit.register(_task_store.close)
+    if previous is not None:
+        atexit.unregister(previous.close)
+        previous.close()
+    return _task_store
+
+def open_task_store(path: str = None, shared: bool = False) -> TaskStore:
+    with _task_store_lock:
+        return _open_task_store(path, shared)
+
+def get_task_store() -> TaskStore:
+    store = _task_store
+    if store is None:
+        with _task_store_lock:
+            store = _task_store or _open_task_store(None if in_agent_worker() else os.environ.get("PRODUCTMIND_DB"), DB_SHARED)
+    return store
+
+# ==============================================================================
+# JIRA SYNC
+# ==============================================================================
+
+class JiraError(Exception):
+    pass
+
+def parse_task_ids(text: str, max_ids: int = 5000) -> List[int]:
+    task_ids = []
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = (int(bound) for bound in part.split("-", 1))
+                if first > last:
+                    raise JiraError(f"Invalid range '{part}' (start is after end)")
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise JiraError(f"Invalid task ID '{part}' (use numbers and ranges, e.g. 1-500, 730)")
+        if first < 1:
+            raise JiraError(f"Invalid task ID '{part}' (task IDs start at 1)")
+        # Checked before the range is expanded, so "1-30000000" costs nothing
+        if len(task_ids) + last - first + 1 > max_ids:
+            raise JiraError(f"Too many task IDs (max {max_ids} per request)")
+        task_ids.extend(range(first, last + 1))
+    return list(dict.fromkeys(task_ids))
+
+class JiraClient:
+    # Talks to the Jira REST API (v2) through one pooled keep-alive client on the MCP loop.
+    # Every issue carries a productmind-task-<id> label that doubles as its idempotency key:
+    # before retrying an attempt whose outcome is unknown, the label is searched for first.
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
     
-    def create_jira_ticket(self, task_id: int, project: str, assignee: str, epic: str, story_points: str):
-        task = next((t for t in self.tasks if t["id"] == task_id), None)
-        if not task:
+    def __init__(self, base_url: str, email: str = None, api_token: str = None,
+                 max_concurrency: int = 16, max_retries: int = 4, timeout: float = 10.0, backoff: float = 0.25):
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.api_token = api_token
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self._client = None
+        self._semaphore = None
+    
+    @classmethod
+    def from_env(cls):
+        base_url = os.environ.get("JIRA_BASE_URL")
+        if not base_url:
             return None
+        return cls(base_url, os.environ.get("JIRA_EMAIL"), os.environ.get("JIRA_API_TOKEN"))
+    
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            
+            headers = {"Accept": "application/json"}
+            auth = None
+            if self.email and self.api_token:
+                auth = (self.email, self.api_token)
+            elif self.api_token:
+                headers["Authorization"] = f"Bearer {self.api_token}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=auth,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+    
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _find_by_label(self, label: str):
+        response = await self._get_client().get(
+            "/rest/api/2/search",
+            params={"jql": f'labels = "{label}"', "fields": "key", "maxResults": 1}
+        )
+        response.raise_for_status()
+        issues = response.json().get("issues", [])
+        return issues[0] if issues else None
+    
+    async def create_issue(self, fields: dict, idempotency_key: str) -> dict:
+        import httpx
         
-        jira_id = f"PROJ-{self.jira_counter}"
-        jira_url = f"https://your-domain.atlassian.net/browse/{jira_id}"
-        
-        jira_ticket = {
-            "id": jira_id,
-            "title": task["title"],
-            "priority": task["priority"],
-            "project": project,
-            "assignee": assignee,
-            "epic": epic,
-            "story_points": story_points,
-            "status": "Created in Jira",
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "url": jira_url
-        }
-        
-        task["jira_id"] = jira_id
-        task["jira_url"] = jira_url
-        
-        self.jira_tickets.append(jira_ticket)
-        self.jira_counter += 1
+        client = self._get_client()
+        fields = dict(fields, labels=list(fields.get("labels", [])) + [idempotency_key])
+        outcome_unknown = False
+        last_error = None
+        retry_after = 0
         
-        return jira_ticket
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    delay = self.backoff * 2 ** (attempt - 1)
+                    # A server's Retry-After replaces the backoff when it asks for longer
+                    await asyncio.sleep(max(retry_after, delay + random.uniform(0, delay)))
+                    retry_after = 0
+                try:
+                    if outcome_unknown:
+                        existing = await self._find_by_label(idempotency_key)
+                        if existing:
+                            return existing
+                    response = await client.post(
+                        "/rest/api/2/issue",
+                        json={"fields": fields},
+                        headers={"Idempotency-Key": idempotency_key}
+                    )
+                except httpx.HTTPError as e:
+                    outcome_unknown = True
+                    last_error = f"{type(e).__name__}: {e}"
+                    continue
+                
+                if response.status_code in (200, 201):
+                    return response.json()
+                last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in self.RETRY_STATUSES:
+                    break
+                # A 429 was definitely not applied; a 5xx might have been
+                outcome_unknown = outcome_unknown or response.status_code != 429
+                header = response.headers.get("Retry-After", "")
+                if header.isdigit():
+                    retry_after = min(int(header), 30)
+        raise JiraError(last_error or "unknown error")
     
-    def get_tasks_display(self):
-        if not self.tasks:
-            return "No tasks created yet. Add your first task above!"
-        
-        display = "📋 **CURRENT TASKS:**\n\n"
-        for task in self.tasks:
-            priority_emoji = "🔴" if task["priority"] == "high" else "🟡" if task["priority"] == "medium" else "🟢"
-            status_emoji = "✅" if task["status"] == "done" else "🔄" if task["status"] == "progress" else "📋"
-            
-            jira_info = ""
-            if task["jira_id"]:
-                jira_info = f"\n   🔗 **Jira:** {task['jira_id']}"
-            
-            display += f"""**{task['id']}.** {status_emoji} **{task['title']}**
-   {priority_emoji} Priority: {task['priority'].upper()}
-   📅 Created: {task['created_at']}
-   🏷️ Status: {task['status'].upper()}{jira_info}
+    # An issue created for a task that got linked elsewhere meanwhile: drop its idempotency
+    # label, so no retry ever returns it, and tag it for whoever cleans up the project
+    async def mark_duplicate(self, key: str, idempotency_key: str, linked_to: str):
+        response = await self._get_client().put(f"/rest/api/2/issue/{key}", json={"update": {
+            "labels": [{"remove": idempotency_key}, {"add": "productmind-duplicate"}],
+            "comment": [{"add": {"body": f"Duplicate: the task is already linked to {linked_to}"}}]
+        }})
+        response.raise_for_status()
 
----
-"""
-        
-        return display
+jira_client = JiraClient.from_env()
+
+# Task ids with a ticket being created right now; guards against double submits
+_jira_pending = set()
+jira_sync_stats = {"failed": 0}
 
-task_store = TaskStore()
+async def sync_jira_tickets(task_ids: List[int], project: str, assignee: str, epic: str, story_points: str) -> List[tuple]:
+    project_key = project.split("(")[-1].rstrip(")") if "(" in project else project
+    
+    # This runs on the shared MCP loop, so everything that may touch SQLite (opening the store,
+    # refresh, id leases, claiming the link) goes through a worker thread
+    async def create_one(task_id: int) -> tuple:
+        store = await asyncio.to_thread(get_task_store)
+        # Other dashboard processes may have linked it; their writes show up after a refresh
+        await asyncio.to_thread(store.refresh)
+        task = store.get_task(task_id)
+        if not task:
+            return task_id, False, "task not found"
+        if task["jira_id"]:
+            return task_id, True, f"already linked to {task['jira_id']}"
+        if task_id in _jira_pending:
+            return task_id, False, "ticket creation already in progress"
+        
+        _jira_pending.add(task_id)
+        try:
+            jira_id = jira_url = None
+            idempotency_key = f"productmind-task-{task_id}"
+            if jira_client is not None:
+                issue = await jira_client.create_issue({
+                    "project": {"key": project_key},
+                    "summary": task["title"],
+                    "issuetype": {"name": "Task"},
+                    "priority": {"name": task["priority"].capitalize()},
+                    "description": f"Epic: {epic}\nAssignee: {assignee}\nStory points: {story_points}"
+                }, idempotency_key=idempotency_key)
+                jira_id = issue["key"]
+                jira_url = f"{jira_client.base_url}/browse/{jira_id}"
+            try:
+                ticket = await asyncio.to_thread(store.create_jira_ticket, task_id, project, assignee, epic,
+                                                 story_points, jira_id=jira_id, jira_url=jira_url)
+            except ValueError:
+                # Linked by someone else while our issue was being created
+                await asyncio.to_thread(store.refresh)
+                linked_to = store.get_task(task_id)["jira_id"]
+                if not linked_to:
+                    raise
+                if jira_id and jira_id != linked_to:
+                    await jira_client.mark_duplicate(jira_id, idempotency_key, linked_to)
+                    print(f"⚠️ Jira issue {jira_id} duplicates {linked_to} for task {task_id}; labelled productmind-duplicate")
+                return task_id, True, f"already linked to {linked_to}"
+            return task_id, True, ticket
+        except Exception as e:
+            jira_sync_stats["failed"] += 1
+            return task_id, False, str(e)
+        finally:
+            _jira_pending.discard(task_id)
+    
+    return await asyncio.gather(*(create_one(task_id) for task_id in task_ids))
 
 # ==============================================================================
 # AI AGENTS
 # ==============================================================================
 
+# PRODUCTMIND_MODEL_URL switches every agent to the model endpoint; otherwise they stay offline.
+# Token usage and model latency are charged to the MCP tool that made the call.
+agent_backend = HTTPModelBackend.from_env(on_usage=mcp.record_model_usage) or OfflineBackend()
+
+SEED_BY_TOPIC = os.environ.get("PRODUCTMIND_SEED_BY_TOPIC", "").lower() in ("1", "true", "yes")
+# Simulated model round-trip per agent call; 0 measures the framework's own overhead
+AGENT_LATENCY = float(os.environ.get("PRODUCTMIND_AGENT_LATENCY", 1.0))
+# Where reports are rendered: "inline" on the event loop, or "thread" / "process" (see ToolExecutors)
+AGENT_EXECUTION = os.environ.get("PRODUCTMIND_AGENT_EXECUTION", "inline")
+
 class AIAgent:
-    def __init__(self, name: str, role: str):
+    # What the agent is asked to do when a model backend answers for it
+    instructions = ""
+    # AGENT_FACTORIES key, so a pool process can build the same agent
+    key = None
+    
+    # seed_by_topic: derive the RNG from the normalized prompt so the same topic
+    # always gets the same output (which is what makes the result cacheable)
+    def __init__(self, name: str, role: str, seed_by_topic: bool = False, backend: AgentBackend = None):
         self.name = name
         self.role = role
-        print(f"🤖 Agent Ready: {name}")
+        self.seed_by_topic = seed_by_topic
+        self.latency = AGENT_LATENCY
+        self.backend = backend or agent_backend
+        if not in_agent_worker():
+            print(f"🤖 Agent Ready: {name} ({self.backend.name})")
+    
+    def system_prompt(self) -> str:
+        return f"You are {self.name}, a {self.role} for product teams. {self.instructions}".strip()
+    
+    def rng(self, prompt: str):
+        if not self.seed_by_topic:
+            return random
+        # Case doesn't change the topic, so it doesn't change the seed either
+        return random.Random(zlib.crc32(normalize_value(prompt).casefold().encode()))
+    
+    # The offline report, synchronously: this is the CPU-bound part of an agent call
+    def render(self, prompt: str) -> str:
+        with tracer.span("agent.generate_response", agent=self.name):
+            return self.generate_response(prompt)
+    
+    # render() wherever the render_report tool is configured to run
+    async def build_report(self, prompt: str) -> str:
+        if self.key is None or mcp.executions.get("render_report", "inline") == "inline":
+            return self.render(prompt)
+        return await mcp.call_tool("render_report", agent=self.key, prompt=prompt)
     
     async def process(self, prompt: str) -> str:
-        await asyncio.sleep(1)
-        return self.generate_response(prompt)
+        with tracer.span("agent.process", agent=self.name, backend=self.backend.name):
+            return await self.backend.generate(self, prompt)
+    
+    # Same text as process(), but yielded paragraph by paragraph
+    def stream(self, prompt: str):
+        return traced_stream(tracer.span("agent.stream", agent=self.name, backend=self.backend.name),
+                             self.backend.stream(self, prompt))
 
 class RoadmapAgent(AIAgent):
+    key = "roadmap"
+    instructions = "Write a quarterly product roadmap (Q1-Q4) with goals, key features and success metrics."
+    
     def __init__(self):
         super().__init__("RoadmapMaster", "Product Strategist")
     
@@ -194,17 +503,21 @@ Q4 - GROWTH PHASE:
 5. Continuous Innovation"""
 
 class ResearchAgent(AIAgent):
-    def __init__(self):
-        super().__init__("ResearchAnalyst", "Market Intelligence")
+    key = "research"
+    instructions = "Analyze the market: size, growth, competitors, user needs, opportunities and risks."
+    
+    def __init__(self, seed_by_topic: bool = False):
+        super().__init__("ResearchAnalyst", "Market Intelligence", seed_by_topic)
     
     def generate_response(self, topic: str) -> str:
+        rng = self.rng(topic)
         market_sizes = ["$1.2B", "$2.8B", "$5.1B", "$3.4B", "$1.9B"]
         growth_rates = ["12%", "18%", "25%", "15%", "22%"]
-        user_interest = random.randint(65, 85)
-        competition_score = random.randint(6, 9)
+        user_interest = rng.randint(65, 85)
+        competition_score = rng.randint(6, 9)
         
-        market_size = random.choice(market_sizes)
-        growth_rate = random.choice(growth_rates)
+        market_size = rng.choice(market_sizes)
+        growth_rate = rng.choice(growth_rates)
         
         return f"""🔍 MARKET RESEARCH ANALYSIS: {topic}
 
@@ -245,15 +558,93 @@ class ResearchAgent(AIAgent):
 ✅ Build strong integration ecosystem"""
 
 class TaskAgent(AIAgent):
-    def __init__(self):
-        super().__init__("TaskAnalyst", "Task Management Specialist")
+    key = "task"
+    PRIORITIES = ("High", "Medium", "Low")
+    EFFORTS = ("2", "3", "5", "8", "13")
+    instructions = "Assess software tasks: priority (High, Medium or Low), effort in story points and implementation notes."
+    # "3. High 5" / "3) medium - 8 points" in a batch reply
+    BATCH_LINE = re.compile(r"^\W*(\d+)\W+(high|medium|low)\D+(\d+)", re.IGNORECASE | re.MULTILINE)
+    # Reply tokens one "<number>. <priority> <points>" line takes, with some headroom
+    REPLY_TOKENS_PER_TASK = 12
+    
+    def __init__(self, seed_by_topic: bool = False):
+        super().__init__("TaskAnalyst", "Task Management Specialist", seed_by_topic)
+    
+    # The structured part of an analysis: (priority, story points)
+    def assess(self, task_title: str) -> tuple:
+        rng = self.rng(task_title)
+        return rng.choice(self.PRIORITIES), rng.choice(self.EFFORTS)
+    
+    # Unseeded priorities and efforts for the whole batch come from one choices() call each;
+    # seeded ones must match assess() per title so cached and batched results agree
+    def assess_batch(self, task_titles: List[str]) -> List[tuple]:
+        if self.seed_by_topic:
+            return [self.assess(title) for title in task_titles]
+        count = len(task_titles)
+        return list(zip(random.choices(self.PRIORITIES, k=count), random.choices(self.EFFORTS, k=count)))
+    
+    # A model answers a batch in one numbered list, one line per title
+    def batch_prompt(self, task_titles: List[str]) -> str:
+        numbered = "\n".join(f"{i}. {title}" for i, title in enumerate(task_titles, 1))
+        return ("For each numbered task reply with exactly one line '<number>. <High|Medium|Low> <story points>' "
+                f"using story points from {', '.join(self.EFFORTS)}.\n\n{numbered}")
+    
+    def parse_batch(self, reply: str, task_titles: List[str]) -> List[tuple]:
+        parsed = {}
+        for number, priority, effort in self.BATCH_LINE.findall(reply):
+            closest = min(self.EFFORTS, key=lambda points: abs(int(points) - int(effort)))
+            parsed[int(number)] = (priority.capitalize(), closest)
+        # None for lines the model skipped, garbled or that were cut off by max_tokens
+        return [parsed.get(i) for i in range(1, len(task_titles) + 1)]
+    
+    # Titles go out in chunks whose replies fit the backend's max_tokens, and the titles a
+    # reply left out are asked for once more. Any still unanswered come back as None:
+    # a made-up assessment would be stored as if the model had given it.
+    async def model_batch(self, task_titles: List[str]) -> List[tuple]:
+        budget = self.backend.max_tokens
+        size = max(1, budget // self.REPLY_TOKENS_PER_TASK) if budget else len(task_titles)
+        assessments = [None] * len(task_titles)
+        missing = list(range(len(task_titles)))
+        for attempt in range(2):
+            chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+            with tracer.span("agent.model_batch", agent=self.name, attempt=attempt, chunks=len(chunks), tasks=len(missing)):
+                replies = await asyncio.gather(*(
+                    self.backend.generate(self, self.batch_prompt([task_titles[i] for i in chunk])) for chunk in chunks
+                ))
+            for chunk, reply in zip(chunks, replies):
+                for i, assessment in zip(chunk, self.parse_batch(reply, [task_titles[i] for i in chunk])):
+                    assessments[i] = assessment
+            missing = [i for i in missing if assessments[i] is None]
+            if not missing:
+                break
+        if missing:
+            print(f"⚠️ {self.name}: the model gave no assessment for {len(missing)} of {len(task_titles)} tasks")
+        return assessments
+    
+    # One model round trip per chunk of the batch instead of one per title
+    async def process_batch(self, task_titles: List[str]) -> List[Dict[str, Any]]:
+        with tracer.span("agent.process_batch", agent=self.name, backend=self.backend.name, tasks=len(task_titles)):
+            if self.backend.offline:
+                with tracer.span("model.offline", agent=self.name, latency=self.latency):
+                    await asyncio.sleep(self.latency)
+                assessments = self.assess_batch(task_titles)
+            else:
+                assessments = await self.model_batch(task_titles)
+            with tracer.span("agent.generate_response", agent=self.name, tasks=len(task_titles)):
+                return [self.batch_result(title, assessment) for title, assessment in zip(task_titles, assessments)]
+    
+    def batch_result(self, task_title: str, assessment: tuple) -> Dict[str, Any]:
+        if assessment is None:
+            return {"task": task_title, "priority": None, "effort": None,
+                    "analysis": f"⚠️ {self.name} got no assessment for this task from the model"}
+        priority, effort = assessment
+        return {"task": task_title, "priority": priority.lower(), "effort": int(effort),
+                "analysis": self.render_analysis(task_title, priority, effort)}
     
     def generate_response(self, task_title: str) -> str:
-        priorities = ["High", "Medium", "Low"]
-        efforts = ["2", "3", "5", "8", "13"]
-        priority = random.choice(priorities)
-        effort = random.choice(efforts)
-        
+        return self.render_analysis(task_title, *self.assess(task_title))
+    
+    def render_analysis(self, task_title: str, priority: str, effort: str) -> str:
         return f"""📋 TASK ANALYSIS: {task_title}
 
 🎯 PRIORITY ASSESSMENT: {priority}
@@ -273,10 +664,23 @@ class TaskAgent(AIAgent):
 • Implement proper error handling
 • Add comprehensive unit tests"""
 
-# Initialize agents
-roadmap_agent = RoadmapAgent()
-research_agent = ResearchAgent()
-task_agent = TaskAgent()
+# Agents are built on their first tool call, so a process only pays for the agents it uses
+AGENT_FACTORIES = {
+    "roadmap": RoadmapAgent,
+    "research": lambda: ResearchAgent(seed_by_topic=SEED_BY_TOPIC),
+    "task": lambda: TaskAgent(seed_by_topic=SEED_BY_TOPIC)
+}
+AGENTS = {}
+_agents_lock = threading.Lock()
+
+def get_agent(key: str) -> AIAgent:
+    agent = AGENTS.get(key)
+    if agent is None:
+        with _agents_lock:
+            agent = AGENTS.get(key)
+            if agent is None:
+                agent = AGENTS[key] = AGENT_FACTORIES[key]()
+    return agent
 
 # ==============================================================================
 # MCP TOOL REGISTRATION
@@ -284,72 +688,591 @@ task_agent = TaskAgent()
 
 async def generate_roadmap_tool(**kwargs):
     topic = kwargs.get('topic', 'Unknown Product')
-    return await roadmap_agent.process(topic)
+    return await get_agent("roadmap").process(topic)
 
 async def generate_research_tool(**kwargs):
     topic = kwargs.get('topic', 'Unknown Market')
-    return await research_agent.process(topic)
+    return await get_agent("research").process(topic)
 
 async def analyze_task_tool(**kwargs):
     task = kwargs.get('task', 'Unknown Task')
-    return await task_agent.process(task)
+    return await get_agent("task").process(task)
 
-mcp.register_tool("generate_roadmap", generate_roadmap_tool)
-mcp.register_tool("generate_research", generate_research_tool)
-mcp.register_tool("analyze_task", analyze_task_tool)
+async def analyze_tasks_tool(**kwargs):
+    return await get_agent("task").process_batch([str(title) for title in kwargs.get('tasks') or []])
+
+async def stream_roadmap_tool(**kwargs):
+    async for chunk in get_agent("roadmap").stream(kwargs.get('topic', 'Unknown Product')):
+        yield chunk
+
+async def stream_research_tool(**kwargs):
+    async for chunk in get_agent("research").stream(kwargs.get('topic', 'Unknown Market')):
+        yield chunk
+
+# Runs in whatever pool AGENT_EXECUTION names, so it takes an agent key rather than an agent
+def render_report_tool(agent: str, prompt: str) -> str:
+    return get_agent(agent).render(prompt)
+
+def _init_agent_worker(agent_keys: tuple):
+    for key in agent_keys:
+        get_agent(key)
+
+# Admission limits per agent tool; beyond running + queued, callers get ServerBusyError
+AGENT_TOOL_LIMITS = {"max_concurrency": 32, "max_queue": 128, "timeout": 30.0}
+
+# Roadmaps are deterministic per product; research and task analysis only when seeded by topic
+mcp.register_tool("generate_roadmap", generate_roadmap_tool, cache_ttl=600, stream=stream_roadmap_tool,
+                  **AGENT_TOOL_LIMITS)
+mcp.register_tool("generate_research", generate_research_tool, cache_ttl=600 if SEED_BY_TOPIC else None,
+                  stream=stream_research_tool, **AGENT_TOOL_LIMITS)
+mcp.register_tool("analyze_task", analyze_task_tool, cache_ttl=600 if SEED_BY_TOPIC else None,
+                  **AGENT_TOOL_LIMITS)
+# Batches are few and large, so they get fewer slots but a longer deadline than single calls
+mcp.register_tool("analyze_tasks", analyze_tasks_tool, max_concurrency=8, max_queue=64, timeout=60.0)
+# Pool processes build every agent before their first report
+mcp.executors.initializer = _init_agent_worker
+mcp.executors.initargs = (tuple(AGENT_FACTORIES),)
+mcp.register_tool("render_report", render_report_tool, coalesce=False, execution=AGENT_EXECUTION)
+
+# ==============================================================================
+# PRODUCT BRIEF (MULTI-AGENT FAN-OUT)
+# ==============================================================================
+
+# (section key, section label, agent name, tool name)
+BRIEF_SECTIONS = (
+    ("roadmap", "🗺️ Roadmap", "RoadmapMaster", "generate_roadmap"),
+    ("research", "🔍 Market Research", "ResearchAnalyst", "generate_research"),
+    ("task", "📋 Task Analysis", "TaskAnalyst", "analyze_task")
+)
+BRIEF_TIMEOUT = 10.0
+
+def _brief_calls(kwargs: dict) -> list:
+    topic = kwargs.get('topic', 'Unknown Product')
+    timeout = kwargs.get('timeout', BRIEF_TIMEOUT)
+    arguments = {
+        "roadmap": {"topic": topic},
+        "research": {"topic": topic},
+        "task": {"task": kwargs.get('task') or f"Build MVP for {topic}"}
+    }
+    return [
+        _brief_section(agent, tool, arguments[key], timeout.get(key, BRIEF_TIMEOUT) if isinstance(timeout, dict) else float(timeout))
+        for key, _, agent, tool in BRIEF_SECTIONS
+    ]
+
+def brief_header(agent: str) -> str:
+    return f"━━━━━━━━ {agent} ━━━━━━━━\n"
+
+# A slow or failing agent only costs its own section, never the whole brief
+async def _brief_section(agent: str, tool: str, arguments: dict, timeout: float) -> str:
+    try:
+        text = await asyncio.wait_for(mcp.call_tool(tool, **arguments), timeout)
+    except asyncio.TimeoutError:
+        text = f"⏱️ {agent} did not answer within {timeout:g}s"
+    except Exception as e:
+        text = f"❌ {agent} failed: {str(e)}"
+    return f"{brief_header(agent)}{text}\n\n"
+
+async def generate_product_brief_tool(**kwargs):
+    return "".join(await asyncio.gather(*_brief_calls(kwargs)))
+
+# Sections are yielded as they finish; if the consumer goes away (client disconnect, aclose()),
+# the agents still running are cancelled rather than left to finish for nobody
+async def stream_product_brief_tool(**kwargs):
+    tasks = [asyncio.ensure_future(call) for call in _brief_calls(kwargs)]
+    try:
+        for section in asyncio.as_completed(tasks):
+            yield await section
+    finally:
+        for task in tasks:
+            task.cancel()
+
+mcp.register_tool("generate_product_brief", generate_product_brief_tool, stream=stream_product_brief_tool,
+                  max_concurrency=16, max_queue=64, timeout=BRIEF_TIMEOUT + 5)
+
+# ==============================================================================
+# BATCHED TASK ANALYSIS
+# ==============================================================================
+
+# Collects concurrent single-item calls for up to max_delay and sends them as one batch call,
+# so N users adding tasks at once cost one agent round trip instead of N. Lives on the shared loop.
+class MicroBatcher:
+    def __init__(self, tool_name: str, argument: str, max_batch: int = 64, max_delay: float = 0.02):
+        self.tool_name = tool_name
+        self.argument = argument
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self._pending = []
+        self._timer = None
+    
+    # The batch call runs in the context of whichever caller opened or filled the batch, so it
+    # shows up in that caller's trace; the others see their wait in batch.submit
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with tracer.span("batch.submit", tool=self.tool_name):
+            self._pending.append((item, future))
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+            return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self.batches += 1
+            asyncio.get_running_loop().create_task(self._run(batch))
+    
+    async def _run(self, batch: list):
+        try:
+            results = await mcp.call_tool(self.tool_name, **{self.argument: [item for item, _ in batch]})
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+task_analysis_batcher = MicroBatcher("analyze_tasks", "tasks")
+
+# Bulk-created tasks are stored immediately; their estimate is filled in here afterwards,
+# one analyze_tasks batch per round trip, so imports never wait on the agent
+class TaskAnalysisQueue:
+    def __init__(self, tool_name: str = "analyze_tasks", workers: int = 4, batch_size: int = 1000):
+        self.tool_name = tool_name
+        self.workers = workers
+        self.batch_size = batch_size
+        self.pending = deque()
+        self.completed = 0
+        self.failed = 0
+        # Tasks the model returned no estimate for; they stay unestimated
+        self.unanswered = 0
+        self._active = 0
+    
+    def enqueue(self, task_ids):
+        self.pending.extend(task_ids)
+        mcp_loop.loop.call_soon_threadsafe(self._spawn_workers)
+    
+    # Runs on the shared loop only, so _active needs no lock
+    def _spawn_workers(self):
+        while self._active < min(self.workers, (len(self.pending) + self.batch_size - 1) // self.batch_size):
+            self._active += 1
+            mcp_loop.loop.create_task(self._work())
+    
+    async def _work(self):
+        try:
+            store = await asyncio.to_thread(get_task_store)
+            while self.pending:
+                # No await between the length check and the pops, so workers can't interleave here
+                ids = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+                tasks = [task for task in map(store.get_task, ids) if task is not None and task.estimate is None]
+                if not tasks:
+                    continue
+                try:
+                    results = await mcp.call_tool(self.tool_name, tasks=[task.title for task in tasks])
+                except ServerBusyError as e:
+                    self.pending.extendleft(reversed(ids))
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                except Exception as e:
+                    self.failed += len(tasks)
+                    print(f"❌ Background analysis of {len(tasks)} tasks failed: {e}")
+                    continue
+                answered = [(task, result["effort"]) for task, result in zip(tasks, results) if result["effort"] is not None]
+                # Updates write through to SQLite, so keep them off the shared loop
+                await asyncio.to_thread(self._save_estimates, store, answered)
+                self.completed += len(answered)
+                self.unanswered += len(tasks) - len(answered)
+        finally:
+            self._active -= 1
+    
+    def _save_estimates(self, store: TaskStore, answered: list):
+        for task, estimate in answered:
+            store.update_task(task.id, estimate=estimate)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"pending": len(self.pending), "completed": self.completed, "failed": self.failed,
+                "unanswered": self.unanswered, "workers": self._active}
+
+analysis_queue = TaskAnalysisQueue()
+
+# ==============================================================================
+# BULK IMPORT / EXPORT
+# ==============================================================================
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+EXPORT_COLUMNS = TASK_COLUMNS + ("project", "story_points", "jira_status")
+
+def file_format(path: str) -> str:
+    fmt = IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported file type: {os.path.basename(path)} (use .csv or .jsonl)")
+    return fmt
+
+# Pipeline: read_task_rows -> clean_task_rows -> batched -> TaskStore.add_tasks.
+# Every stage is a generator, so memory stays at one batch whatever the file size.
+def read_task_rows(path: str):
+    fmt = file_format(path)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"invalid JSON ({e.msg})")
+
+def clean_task_rows(rows, report: Dict[str, Any], max_errors: int = 20):
+    for line_no, row in rows:
+        problem = None
+        if isinstance(row, Exception):
+            problem = str(row)
+        elif not isinstance(row, dict):
+            problem = "expected an object"
+        else:
+            title = str(row.get("title") or "").strip()
+            priority = str(row.get("priority") or "medium").strip().lower()
+            status = str(row.get("status") or "todo").strip().lower()
+            if not title:
+                problem = "missing title"
+            elif priority not in TaskStore.PRIORITY_RANK:
+                problem = f"unknown priority {priority!r}"
+            elif status not in TaskStore.STATUS_RANK:
+                problem = f"unknown status {status!r}"
+        
+        if problem:
+            report["skipped"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append(f"line {line_no}: {problem}")
+            continue
+        yield {
+            "title": title,
+            "priority": priority,
+            "status": status,
+            "epic": str(row.get("epic") or "").strip() or None,
+            "assignee": str(row.get("assignee") or "").strip() or None
+        }
+
+def batched(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def import_tasks(path: str, analyze: bool = True, batch_size: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+    started = time.perf_counter()
+    report = {"imported": 0, "skipped": 0, "errors": [], "queued_for_analysis": 0}
+    for batch in batched(clean_task_rows(read_task_rows(path), report), batch_size):
+        tasks = get_task_store().add_tasks(batch)
+        report["imported"] += len(tasks)
+        if analyze:
+            analysis_queue.enqueue(task.id for task in tasks)
+            report["queued_for_analysis"] += len(tasks)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+def _export_record(task: Task) -> dict:
+    record = dict(task)
+    ticket = get_task_store().get_jira_ticket(task.jira_id) if task.jira_id else None
+    record["project"] = ticket.project if ticket else None
+    record["story_points"] = ticket.story_points if ticket else None
+    record["jira_status"] = ticket.status if ticket else None
+    return record
+
+# Yields the file piece by piece; callers write each chunk out as it comes
+def export_tasks(fmt: str = "csv"):
+    # The list is append-only, so a slice is a consistent snapshot of the tasks so far
+    tasks = get_task_store().tasks[:]
+    if fmt == "jsonl":
+        for task in tasks:
+            yield json.dumps(_export_record(task), ensure_ascii=False) + "\n"
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for task in tasks:
+        writer.writerow(_export_record(task))
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def export_tasks_to_file(fmt: str = "csv", directory: str = None) -> str:
+    handle, path = tempfile.mkstemp(prefix="productmind-tasks-", suffix=f".{fmt}", dir=directory)
+    with os.fdopen(handle, "w", newline="", encoding="utf-8") as f:
+        for chunk in export_tasks(fmt):
+            f.write(chunk)
+    return path
+
+# ==============================================================================
+# MCP OVER JSON-RPC
+# ==============================================================================
+
+# Agent tools keep no state, so any number of server processes can answer them; task and Jira
+# tools stay on the UI's own store
+REMOTE_TOOLS = ("generate_roadmap", "generate_research", "analyze_task", "analyze_tasks")
+
+def serve_mcp(endpoint: str):
+    server = MCPServer(mcp)
+    mcp.start_executors()
+    if endpoint == "stdio":
+        mcp_loop.run_sync(server.serve_stdio())
+        return
+    host, _, port = endpoint.removeprefix("tcp://").rpartition(":")
+    try:
+        mcp_loop.run_sync(server.serve_tcp(host or "127.0.0.1", int(port)))
+    except KeyboardInterrupt:
+        pass
+
+# Serves the agent tools from the given servers; the dashboard keeps its cache, admission limits
+# and stats for them, and runs everything else itself
+def connect_mcp_servers(endpoints: List[str]) -> RemoteMCP:
+    remote = RemoteMCP(endpoints)
+    available = mcp_loop.run_sync(remote.list_tools(), timeout=60)
+    mcp.mount(remote, [name for name in REMOTE_TOOLS if name in available])
+    # Starting every server now keeps the first calls from waiting on interpreter start-up
+    mcp_loop.run_sync(remote.connect(), timeout=60)
+    atexit.register(lambda: mcp_loop.run_sync(remote.close(), timeout=5))
+    print(f"🛰️ Agent tools served by {len(endpoints)} MCP server(s): {', '.join(endpoints)}")
+    return remote
+
+# ==============================================================================
+# METRICS
+# ==============================================================================
+
+# Started with the loop, so the status panel reports real lag whether or not /metrics is served
+loop_monitor = mcp_loop.lag_monitor
+
+# One snapshot feeds both the Prometheus endpoint and the dashboard status panel
+def collect_metrics() -> Dict[str, Any]:
+    store = get_task_store()
+    store.refresh()
+    return {
+        "mcp": mcp.get_stats(),
+        "histograms": {name: stats.latency for name, stats in list(mcp.tool_stats.items())},
+        "agents": {key: (agent.name, agent.role) for key, agent in list(AGENTS.items())},
+        "tasks": {
+            "by_status_priority": store.count_by_status_priority()
+        },
+        "jira": {
+            "created": len(store.jira_tickets),
+            "failed": jira_sync_stats["failed"],
+            "pending": len(_jira_pending)
+        },
+        "analysis": analysis_queue.get_stats(),
+        "model": agent_backend.get_stats(),
+        "event_loop": {"lag": loop_monitor.lag, "max_lag": loop_monitor.max_lag},
+        "tracing": tracer.get_stats()
+    }
+
+def _prometheus_labels(**labels) -> str:
+    if not labels:
+        return ""
+    escaped = {key: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for key, value in labels.items()}
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+def render_prometheus(snapshot: Dict[str, Any] = None) -> str:
+    snapshot = snapshot or collect_metrics()
+    lines = []
+    
+    def metric(name: str, kind: str, help_text: str, samples: list):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value, suffix in samples:
+            lines.append(f"{name}{suffix}{_prometheus_labels(**labels)} {value}")
+    
+    tools = snapshot["mcp"]["tools"]
+    for field, name, kind, help_text in (
+        ("calls", "productmind_tool_calls_total", "counter", "MCP tool calls, including cached and coalesced ones"),
+        ("errors", "productmind_tool_errors_total", "counter", "MCP tool calls that raised, timed out or were rejected"),
+        ("cancelled", "productmind_tool_cancelled_total", "counter", "MCP tool calls whose caller stopped waiting for the result"),
+        ("cache_hits", "productmind_tool_cache_hits_total", "counter", "MCP tool calls served from the result cache"),
+        ("coalesced", "productmind_tool_coalesced_total", "counter", "MCP tool calls that joined an identical in-flight call"),
+        ("rejected", "productmind_tool_rejected_total", "counter", "MCP tool calls rejected because the queue was full"),
+        ("timed_out", "productmind_tool_timeouts_total", "counter", "MCP tool calls that exceeded their deadline"),
+        ("model_calls", "productmind_tool_model_calls_total", "counter", "Model backend requests made on behalf of the MCP tool"),
+        ("prompt_tokens", "productmind_tool_prompt_tokens_total", "counter", "Prompt tokens spent on behalf of the MCP tool"),
+        ("completion_tokens", "productmind_tool_completion_tokens_total", "counter", "Completion tokens spent on behalf of the MCP tool"),
+        ("model_seconds", "productmind_tool_model_seconds_total", "counter", "Time spent waiting on the model backend for the MCP tool"),
+        ("active", "productmind_tool_in_flight", "gauge", "MCP tool executions currently running"),
+        ("waiting", "productmind_tool_queued", "gauge", "MCP tool executions waiting for a concurrency slot")
+    ):
+        metric(name, kind, help_text, [({"tool": tool}, values[field], "") for tool, values in tools.items()])
+    
+    samples = []
+    for tool, histogram in snapshot["histograms"].items():
+        for bound, count in histogram.cumulative_buckets():
+            samples.append(({"tool": tool, "le": f"{bound:.6g}"}, count, "_bucket"))
+        samples.append(({"tool": tool, "le": "+Inf"}, histogram.count, "_bucket"))
+        samples.append(({"tool": tool}, f"{histogram.total:.6f}", "_sum"))
+        samples.append(({"tool": tool}, histogram.count, "_count"))
+    metric("productmind_tool_latency_seconds", "histogram", "MCP tool call latency", samples)
+    
+    cache = snapshot["mcp"]["cache"]
+    metric("productmind_cache_entries", "gauge", "Entries in the MCP result cache", [({}, cache["entries"], "")])
+    metric("productmind_cache_hits_total", "counter", "MCP result cache hits", [({}, cache["hits"], "")])
+    metric("productmind_cache_misses_total", "counter", "MCP result cache misses", [({}, cache["misses"], "")])
+    metric("productmind_cache_evictions_total", "counter", "MCP result cache LRU evictions", [({}, cache["evictions"], "")])
+    
+    tasks = snapshot["tasks"]
+    metric("productmind_tasks", "gauge", "Tasks in the store by status and priority", [
+        ({"status": status, "priority": priority}, count, "")
+        for (status, priority), count in sorted(tasks["by_status_priority"].items())
+    ])
+    
+    jira = snapshot["jira"]
+    metric("productmind_jira_tickets_created_total", "counter", "Jira tickets linked to tasks", [({}, jira["created"], "")])
+    metric("productmind_jira_sync_failures_total", "counter", "Jira ticket creations that failed", [({}, jira["failed"], "")])
+    metric("productmind_jira_sync_pending", "gauge", "Jira ticket creations in progress", [({}, jira["pending"], "")])
+    
+    model = snapshot["model"]
+    if model["backend"] == "http":
+        labels = {"model": model["model"]}
+        metric("productmind_model_requests_total", "counter", "Requests sent to the model endpoint", [(labels, model["requests"], "")])
+        metric("productmind_model_retries_total", "counter", "Model requests retried after an error", [(labels, model["retries"], "")])
+        metric("productmind_model_errors_total", "counter", "Agent calls that failed after all retries", [(labels, model["errors"], "")])
+        metric("productmind_model_tokens_total", "counter", "Tokens reported by the model endpoint", [
+            (dict(labels, kind="prompt"), model["prompt_tokens"], ""),
+            (dict(labels, kind="completion"), model["completion_tokens"], "")
+        ])
+    
+    analysis = snapshot["analysis"]
+    metric("productmind_analysis_pending", "gauge", "Tasks waiting for a background AI estimate", [({}, analysis["pending"], "")])
+    metric("productmind_analysis_completed_total", "counter", "Background AI estimates stored", [({}, analysis["completed"], "")])
+    metric("productmind_analysis_failed_total", "counter", "Background AI estimates that failed", [({}, analysis["failed"], "")])
+    metric("productmind_analysis_unanswered_total", "counter", "Background AI estimates the model left out of its reply", [({}, analysis["unanswered"], "")])
+    
+    loop_stats = snapshot["event_loop"]
+    metric("productmind_event_loop_lag_seconds", "gauge", "Latest wake-up delay of the MCP event loop", [({}, f"{loop_stats['lag']:.6f}", "")])
+    metric("productmind_event_loop_lag_max_seconds", "gauge", "Largest wake-up delay of the MCP event loop", [({}, f"{loop_stats['max_lag']:.6f}", "")])
+    
+    tracing = snapshot["tracing"]
+    if tracing["enabled"]:
+        metric("productmind_trace_spans_exported_total", "counter", "Spans written to the trace file", [({}, tracing["exported_spans"], "")])
+        metric("productmind_trace_spans_dropped_total", "counter", "Spans lost to a full buffer or a failed write", [({}, tracing["dropped_spans"], "")])
+    
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1"):
+    try:
+        server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"❌ Metrics endpoint unavailable on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"📈 Prometheus metrics: http://{host}:{port}/metrics")
+    return server
 
 # ==============================================================================
 # GRADIO INTERFACE FUNCTIONS
 # ==============================================================================
 
-def generate_roadmap_interface(product_name: str) -> str:
+@traced("ui.generate_roadmap", root=True)
+async def generate_roadmap_interface(product_name: str):
     if not product_name.strip():
-        return "❌ Please enter a product name"
+        yield "❌ Please enter a product name"
+        return
     
     print(f"🔗 MCP calling: generate_roadmap with {product_name}")
     
+    output = ""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(mcp.call_tool("generate_roadmap", topic=product_name))
-        return result
+        async for chunk in mcp_loop.stream(mcp.stream_tool("generate_roadmap", topic=product_name)):
+            output += chunk
+            yield output
+    except ServerBusyError as e:
+        yield f"⏳ {e}"
     except Exception as e:
-        return f"❌ Error generating roadmap: {str(e)}"
-    finally:
-        loop.close()
+        yield f"❌ Error generating roadmap: {str(e)}"
 
-def generate_research_interface(research_topic: str) -> str:
+@traced("ui.generate_research", root=True)
+async def generate_research_interface(research_topic: str):
     if not research_topic.strip():
-        return "❌ Please enter a research topic"
+        yield "❌ Please enter a research topic"
+        return
     
     print(f"🔗 MCP calling: generate_research with {research_topic}")
     
+    output = ""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(mcp.call_tool("generate_research", topic=research_topic))
-        return result
+        async for chunk in mcp_loop.stream(mcp.stream_tool("generate_research", topic=research_topic)):
+            output += chunk
+            yield output
+    except ServerBusyError as e:
+        yield f"⏳ {e}"
     except Exception as e:
-        return f"❌ Error generating research: {str(e)}"
-    finally:
-        loop.close()
+        yield f"❌ Error generating research: {str(e)}"
 
-def add_task_interface(task_title: str, priority: str, status: str) -> tuple:
+@traced("ui.generate_product_brief", root=True)
+async def generate_product_brief_interface(product_name: str):
+    if not product_name.strip():
+        yield ("❌ Please enter a product name", "", "")
+        return
+    
+    print(f"🔗 MCP calling: generate_product_brief with {product_name}")
+    
+    sections = {key: f"⏳ {agent} is working..." for key, _, agent, _ in BRIEF_SECTIONS}
+    yield tuple(sections.values())
+    try:
+        async for chunk in mcp_loop.stream(mcp.stream_tool("generate_product_brief", topic=product_name)):
+            for key, _, agent, _ in BRIEF_SECTIONS:
+                if chunk.startswith(brief_header(agent)):
+                    sections[key] = chunk[len(brief_header(agent)):].strip()
+            yield tuple(sections.values())
+    except ServerBusyError as e:
+        yield (f"⏳ {e}", "", "")
+    except Exception as e:
+        yield (f"❌ Error generating product brief: {str(e)}", "", "")
+
+@traced("ui.add_task", root=True)
+async def add_task_interface(task_title: str, priority: str, status: str, page: int = 1, page_size: int = 25, sort_key: str = "id") -> tuple:
+    store = get_task_store()
     if not task_title.strip():
-        return "❌ Please enter a task title", task_store.get_tasks_display()
+        return "❌ Please enter a task title", store.get_tasks_display(page, page_size, sort_key)
     
     print(f"🔗 MCP analyzing task: {task_title}")
     
+    estimate = None
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        analysis = loop.run_until_complete(mcp.call_tool("analyze_task", task=task_title))
+        result = await mcp_loop.run(task_analysis_batcher.submit(task_title))
+        analysis, estimate = result["analysis"], result["effort"]
+    except ServerBusyError as e:
+        analysis = f"⏳ AI analysis skipped — {e}"
     except Exception as e:
         analysis = f"❌ Error analyzing task: {str(e)}"
-    finally:
-        loop.close()
     
-    task = task_store.add_task(task_title, priority, status)
+    task = store.add_task(task_title, priority, status, estimate=estimate)
     
     success_message = f"""✅ **Task Created Successfully!**
 
@@ -362,23 +1285,101 @@ def add_task_interface(task_title: str, priority: str, status: str) -> tuple:
 {analysis}
 """
     
-    return success_message, task_store.get_tasks_display()
+    return success_message, store.get_tasks_display(page, page_size, sort_key)
+
+# Parsing and inserting run in a worker thread so a large file doesn't stall other sessions
+@traced("ui.import_tasks", root=True)
+async def import_tasks_interface(file, analyze: bool, page: int = 1, page_size: int = 25, sort_key: str = "id") -> tuple:
+    store = get_task_store()
+    if not file:
+        return "❌ Please choose a CSV or JSONL file", store.get_tasks_display(page, page_size, sort_key)
+    
+    path = getattr(file, "name", file)
+    try:
+        report = await asyncio.to_thread(import_tasks, path, analyze)
+    except (OSError, ValueError, csv.Error) as e:
+        return f"❌ Import failed: {str(e)}", store.get_tasks_display(page, page_size, sort_key)
+    
+    lines = [f"📥 Imported {report['imported']} tasks in {report['seconds']:.2f}s ({report['skipped']} rows skipped)"]
+    if report["queued_for_analysis"]:
+        lines.append(f"🤖 {report['queued_for_analysis']} tasks queued for AI estimates")
+    lines.extend(f"⚠️ {error}" for error in report["errors"])
+    if report["skipped"] > len(report["errors"]):
+        lines.append(f"… and {report['skipped'] - len(report['errors'])} more skipped rows")
+    return "\n".join(lines), store.get_tasks_display(page, page_size, sort_key)
+
+@traced("ui.export_tasks", root=True)
+async def export_tasks_interface(fmt: str) -> str:
+    return await asyncio.to_thread(export_tasks_to_file, fmt if fmt in ("csv", "jsonl") else "csv")
 
-def create_jira_ticket_interface(task_ids: str, project: str, assignee: str, epic: str, story_points: str) -> str:
+@traced("ui.refresh_tasks", root=True)
+def refresh_tasks_interface(page: int, page_size: int, sort_key: str, last_view: tuple) -> tuple:
+    store = get_task_store()
+    # Skip re-sending the page when neither the store nor the view settings changed
+    if last_view and last_view[:4] == (store.version, page, page_size, sort_key):
+        import gradio as gr
+        return gr.update(), last_view
+    version, display, ids = store.get_tasks_page(page, page_size, sort_key)
+    return display, (version, page, page_size, sort_key, ids)
+
+# Seconds between live task list polls per open dashboard; 0 turns live updates off
+LIVE_INTERVAL = float(os.environ.get("PRODUCTMIND_LIVE_INTERVAL", "2"))
+
+# Timer tick: asks the change feed what happened since this session's last view. Nothing
+# is sent when nothing changed; otherwise the status line lists the changed rows and the
+# page is only re-sent if one of those changes lands on it.
+def poll_tasks_interface(page: int, page_size: int, sort_key: str, last_view: tuple) -> tuple:
+    import gradio as gr
+    store = get_task_store()
+    if not last_view or last_view[1:4] != (page, page_size, sort_key):
+        version, display, ids = store.get_tasks_page(page, page_size, sort_key)
+        return store.get_live_display(), display, (version, page, page_size, sort_key, ids)
+    
+    version, changes = store.changes_since(last_view[0])
+    if changes == {}:
+        return gr.skip(), gr.skip(), gr.skip()
+    
+    live = store.get_live_display(changes)
+    if changes is not None and not store.page_affected(changes, last_view[4], page, page_size, sort_key):
+        return live, gr.skip(), (version,) + last_view[1:]
+    version, display, ids = store.get_tasks_page(page, page_size, sort_key)
+    return live, display, (version, page, page_size, sort_key, ids)
+
+@traced("ui.search_tasks", root=True)
+def search_tasks_interface(query: str, status: str = "any", priority: str = "any", jira: str = "any") -> str:
+    filters = {}
+    if status and status != "any":
+        filters["status"] = status
+    if priority and priority != "any":
+        filters["priority"] = priority
+    if jira in ("linked", "not linked"):
+        filters["has_jira"] = jira == "linked"
+    return get_task_store().get_search_display(query or "", **filters)
+
+@traced("ui.create_jira_ticket", root=True)
+async def create_jira_ticket_interface(task_ids: str, project: str, assignee: str, epic: str, story_points: str) -> str:
     if not task_ids.strip():
         return "❌ Please enter a task ID"
     
     try:
-        task_id = int(task_ids.strip())
-    except ValueError:
+        ids = parse_task_ids(task_ids)
+    except JiraError as e:
+        return f"❌ {e}"
+    if not ids:
         return "❌ Please enter a valid task ID (number)"
     
-    jira_ticket = task_store.create_jira_ticket(task_id, project, assignee, epic, story_points)
-    
-    if not jira_ticket:
-        return f"❌ Task with ID {task_id} not found"
+    started = time.perf_counter()
+    results = await mcp_loop.run(sync_jira_tickets(ids, project, assignee, epic, story_points))
+    elapsed = time.perf_counter() - started
     
-    return f"""🎉 **Jira Ticket Created Successfully!**
+    if len(results) == 1:
+        task_id, ok, jira_ticket = results[0]
+        if not ok:
+            return f"❌ Task with ID {task_id} not found" if jira_ticket == "task not found" else f"❌ Task {task_id}: {jira_ticket}"
+        if not isinstance(jira_ticket, Mapping):
+            return f"ℹ️ Task {task_id} is {jira_ticket}"
+        
+        return f"""🎉 **Jira Ticket Created Successfully!**
 
 **Jira ID:** {jira_ticket['id']}
 **Title:** {jira_ticket['title']}
@@ -391,33 +1392,105 @@ def create_jira_ticket_interface(task_ids: str, project: str, assignee: str, epi
 🔗 **Jira URL:** {jira_ticket['url']}
 
 ✅ Task has been successfully linked to Jira!"""
+    
+    created = sum(1 for _, ok, detail in results if ok and isinstance(detail, Mapping))
+    skipped = sum(1 for _, ok, detail in results if ok and not isinstance(detail, Mapping))
+    failed = len(results) - created - skipped
+    lines = []
+    for task_id, ok, detail in results:
+        if ok and isinstance(detail, Mapping):
+            lines.append(f"✅ Task {task_id} → {detail['id']} ({detail['url']})")
+        elif ok:
+            lines.append(f"ℹ️ Task {task_id}: {detail}")
+        else:
+            lines.append(f"❌ Task {task_id}: {detail}")
+    
+    return f"""🎫 **Bulk Jira Sync:** {created} created, {skipped} skipped, {failed} failed in {elapsed:.1f}s
+
+""" + "\n".join(lines)
 
 def get_mcp_status() -> str:
-    stats = mcp.get_stats()
-    task_count = len(task_store.tasks)
-    jira_count = len(task_store.jira_tickets)
+    snapshot = collect_metrics()
+    stats = snapshot["mcp"]
+    cache = stats["cache"]
+    tasks = snapshot["tasks"]
+    latency_lines = "\n".join(
+        f"• {name}: {tool['calls']} calls ({tool['cache_hits']} cached, {tool['coalesced']} coalesced), {tool['errors']} errors, "
+        f"{tool['cancelled']} cancelled — "
+        f"{tool['p50_ms']:.0f} / {tool['p95_ms']:.0f} / {tool['p99_ms']:.0f} ms"
+        for name, tool in stats["tools"].items()
+    )
+    admission_lines = "\n".join(
+        f"• {name}: running {tool['active']}/{tool['max_concurrency'] or '∞'}, "
+        f"queued {tool['waiting']}/{'∞' if tool['max_queue'] is None else tool['max_queue']}, "
+        f"rejected {tool['rejected']}, timed out {tool['timed_out']}"
+        + (f" (deadline {tool['timeout']:g}s)" if tool['timeout'] else "")
+        for name, tool in stats["tools"].items()
+    )
+    agent_lines = "\n".join(
+        f"• {snapshot['agents'][key][0]} ({snapshot['agents'][key][1]})" if key in snapshot["agents"] else f"• {key}: loads on first use"
+        for key in AGENT_FACTORIES
+    )
+    tool_lines = "\n".join(f"• {name}" for name in stats["tools"])
+    model = snapshot["model"]
+    if model["backend"] == "http":
+        token_lines = "\n".join(
+            f"• {name}: {tool['model_calls']} requests, {tool['prompt_tokens']} prompt + {tool['completion_tokens']} completion tokens"
+            for name, tool in stats["tools"].items() if tool["model_calls"]
+        )
+        model_lines = (f"• Backend: {model['model']} over HTTP — {model['requests']} requests, {model['retries']} retries, "
+                       f"{model['errors']} failed, {model['p50_ms']:.0f} / {model['p99_ms']:.0f} ms (p50 / p99)"
+                       + (f"\n{token_lines}" if token_lines else ""))
+    else:
+        model_lines = "• Backend: offline (canned responses, simulated latency)"
+    tracing = snapshot["tracing"]
+    if tracing["enabled"]:
+        tracing_line = (f"{tracing['file']} — {tracing['sample_rate']:.0%} sampled, {tracing['traces']} traces, "
+                        f"{tracing['exported_spans']} spans written, {tracing['dropped_spans']} dropped")
+    else:
+        tracing_line = "off (set PRODUCTMIND_TRACE_FILE)"
+    status_counts = {}
+    priority_counts = {}
+    for (status, priority), count in tasks["by_status_priority"].items():
+        status_counts[status] = status_counts.get(status, 0) + count
+        priority_counts[priority] = priority_counts.get(priority, 0) + count
     
     return f"""🔗 MCP SERVER STATUS:
 
 ✅ Server: Active
 🛠️ Tools Available: {stats['tools_available']}
 📊 Total API Calls: {stats['total_calls']}
+⚠️ Failed Calls: {stats['total_errors']}
 ⏰ Last Call: {stats['last_call']}
+🔁 Event Loop Lag: {snapshot['event_loop']['lag'] * 1000:.1f} ms (max {snapshot['event_loop']['max_lag'] * 1000:.1f} ms)
+🧵 Tracing: {tracing_line}
+
+📈 TOOL LATENCY (p50 / p95 / p99):
+{latency_lines}
+
+🚦 ADMISSION CONTROL:
+{admission_lines}
+
+🗄️ RESULT CACHE:
+• Hits / Misses: {cache['hits']} / {cache['misses']} ({cache['hit_rate']:.0%} hit rate)
+• Entries: {cache['entries']} / {cache['max_entries']} ({cache['evictions']} evicted)
 
 🤖 REGISTERED AGENTS:
-• RoadmapMaster (Product Strategist)
-• ResearchAnalyst (Market Intelligence)
-• TaskAnalyst (Task Management Specialist)
+{agent_lines}
+
+🧠 MODEL:
+{model_lines}
 
 🔧 AVAILABLE TOOLS:
-• generate_roadmap
-• generate_research
-• analyze_task
+{tool_lines}
 
 📋 TASK MANAGEMENT:
-• Total Tasks: {task_count}
-• Jira Tickets: {jira_count}
-• Integration: Active
+• Total Tasks: {tasks['total']}
+• By Status: {", ".join(f"{k} {v}" for k, v in sorted(status_counts.items())) or "—"}
+• By Priority: {", ".join(f"{k} {v}" for k, v in sorted(priority_counts.items())) or "—"}
+• Jira Tickets: {snapshot['jira']['created']} ({snapshot['jira']['failed']} failed syncs)
+• AI Estimates: {snapshot['analysis']['completed']} done, {snapshot['analysis']['pending']} queued, {snapshot['analysis']['failed']} failed
+• Integration: {"Jira REST" if jira_client else "Local"}
 
 💡 All systems operational and ready for use!"""
 
@@ -425,7 +1498,11 @@ def get_mcp_status() -> str:
 # CREATE GRADIO DASHBOARD
 # ==============================================================================
 
-def create_dashboard():
+DASHBOARD_TABS = ("roadmap", "tasks", "research", "brief")
+
+def create_dashboard(tabs=DASHBOARD_TABS):
+    import gradio as gr
+    
     with gr.Blocks(title="ProductMind AI Dashboard") as demo:
         # Header
         gr.HTML("""
@@ -480,196 +1557,381 @@ def create_dashboard():
                         refresh_status_btn.click(fn=get_mcp_status, outputs=mcp_status_display)
             
             # Roadmap Tab
-            with gr.TabItem("🗺️ AI Roadmap"):
-                gr.HTML("""
-                <div style='text-align: center; background: rgba(139, 92, 246, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
-                    <h3 style='color: #8b5cf6;'>🎯 AI-Powered Roadmap Generation</h3>
-                    <p>Generate comprehensive product roadmaps using RoadmapMaster agent via MCP server</p>
-                </div>
-                """)
-                
-                with gr.Row():
-                    with gr.Column(scale=1):
-                        roadmap_input = gr.Textbox(
-                            label="📝 Product Name",
-                            placeholder="e.g., E-commerce Mobile App, AI Chatbot Platform",
-                            lines=2
-                        )
+            if "roadmap" in tabs:
+                with gr.TabItem("🗺️ AI Roadmap"):
+                    gr.HTML("""
+                    <div style='text-align: center; background: rgba(139, 92, 246, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
+                        <h3 style='color: #8b5cf6;'>🎯 AI-Powered Roadmap Generation</h3>
+                        <p>Generate comprehensive product roadmaps using RoadmapMaster agent via MCP server</p>
+                    </div>
+                    """)
+                    
+                    with gr.Row():
+                        with gr.Column(scale=1):
+                            roadmap_input = gr.Textbox(
+                                label="📝 Product Name",
+                                placeholder="e.g., E-commerce Mobile App, AI Chatbot Platform",
+                                lines=2
+                            )
+                            
+                            generate_roadmap_btn = gr.Button(
+                                "🚀 Generate Roadmap via MCP",
+                                variant="primary",
+                                size="lg"
+                            )
                         
-                        generate_roadmap_btn = gr.Button(
-                            "🚀 Generate Roadmap via MCP",
-                            variant="primary",
-                            size="lg"
-                        )
+                        with gr.Column(scale=2):
+                            roadmap_output = gr.Textbox(
+                                label="📋 Generated Product Roadmap",
+                                lines=25,
+                                placeholder="Your AI-generated roadmap will appear here...",
+                                interactive=False
+                            )
                     
-                    with gr.Column(scale=2):
-                        roadmap_output = gr.Textbox(
-                            label="📋 Generated Product Roadmap",
-                            lines=25,
-                            placeholder="Your AI-generated roadmap will appear here...",
-                            interactive=False
-                        )
+                    generate_roadmap_btn.click(
+                        fn=generate_roadmap_interface,
+                        inputs=roadmap_input,
+                        outputs=roadmap_output
+                    )
                 
-                generate_roadmap_btn.click(
-                    fn=generate_roadmap_interface,
-                    inputs=roadmap_input,
-                    outputs=roadmap_output
-                )
-            
             # Tasks & Jira Tab
-            with gr.TabItem("📋 Tasks & Jira"):
-                gr.HTML("""
-                <div style='text-align: center; background: rgba(34, 197, 94, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
-                    <h3 style='color: #22c55e;'>📋 Task Management with Jira Integration</h3>
-                    <p>Create tasks with AI analysis and sync them to Jira</p>
-                </div>
-                """)
-                
-                with gr.Row():
-                    # Task Creation
-                    with gr.Column(scale=1):
-                        gr.HTML("<h4>➕ Add New Task</h4>")
-                        
-                        task_title_input = gr.Textbox(
-                            label="Task Title",
-                            placeholder="e.g., Implement user authentication system",
-                            lines=2
-                        )
-                        
-                        with gr.Row():
-                            task_priority = gr.Dropdown(
-                                choices=["low", "medium", "high"],
-                                value="medium",
-                                label="Priority"
+            if "tasks" in tabs:
+                with gr.TabItem("📋 Tasks & Jira"):
+                    gr.HTML("""
+                    <div style='text-align: center; background: rgba(34, 197, 94, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
+                        <h3 style='color: #22c55e;'>📋 Task Management with Jira Integration</h3>
+                        <p>Create tasks with AI analysis and sync them to Jira</p>
+                    </div>
+                    """)
+                    
+                    with gr.Row():
+                        # Task Creation
+                        with gr.Column(scale=1):
+                            gr.HTML("<h4>➕ Add New Task</h4>")
+                            
+                            task_title_input = gr.Textbox(
+                                label="Task Title",
+                                placeholder="e.g., Implement user authentication system",
+                                lines=2
                             )
                             
-                            task_status = gr.Dropdown(
-                                choices=["todo", "progress", "done"],
-                                value="todo", 
-                                label="Status"
+                            with gr.Row():
+                                task_priority = gr.Dropdown(
+                                    choices=["low", "medium", "high"],
+                                    value="medium",
+                                    label="Priority"
+                                )
+                                
+                                task_status = gr.Dropdown(
+                                    choices=["todo", "progress", "done"],
+                                    value="todo", 
+                                    label="Status"
+                                )
+                            
+                            add_task_btn = gr.Button(
+                                "🤖 Add Task (AI Analysis)",
+                                variant="primary"
                             )
-                        
-                        add_task_btn = gr.Button(
-                            "🤖 Add Task (AI Analysis)",
-                            variant="primary"
-                        )
-                        
-                        task_result = gr.Textbox(
-                            label="Task Creation Result",
-                            lines=10,
-                            interactive=False
-                        )
-                        
-                        # Jira Integration Section
-                        gr.HTML("<br><h4>🔗 Create Jira Ticket</h4>")
-                        
-                        with gr.Row():
-                            jira_task_id = gr.Textbox(
-                                label="Task ID",
-                                placeholder="Enter task ID to create Jira ticket"
+                            
+                            task_result = gr.Textbox(
+                                label="Task Creation Result",
+                                lines=10,
+                                interactive=False
                             )
                             
-                            jira_project = gr.Dropdown(
-                                choices=["PRODUCTMIND (PM)", "DEVELOPMENT (DEV)", "DESIGN (DES)"],
-                                value="PRODUCTMIND (PM)",
-                                label="Project"
+                            # Jira Integration Section
+                            gr.HTML("<br><h4>🔗 Create Jira Ticket</h4>")
+                            
+                            with gr.Row():
+                                jira_task_id = gr.Textbox(
+                                    label="Task IDs",
+                                    placeholder="e.g. 3 or 1-500, 730"
+                                )
+                                
+                                jira_project = gr.Dropdown(
+                                    choices=["PRODUCTMIND (PM)", "DEVELOPMENT (DEV)", "DESIGN (DES)"],
+                                    value="PRODUCTMIND (PM)",
+                                    label="Project"
+                                )
+                            
+                            with gr.Row():
+                                jira_assignee = gr.Dropdown(
+                                    choices=["John Smith", "Sarah Johnson", "Mike Chen", "Unassigned"],
+                                    value="Unassigned",
+                                    label="Assignee"
+                                )
+                                
+                                jira_story_points = gr.Dropdown(
+                                    choices=["1", "2", "3", "5", "8", "13"],
+                                    value="5",
+                                    label="Story Points"
+                                )
+                            
+                            jira_epic = gr.Dropdown(
+                                choices=["PM-Epic-Q1-Features", "PM-Epic-User-Experience", "PM-Epic-Performance"],
+                                value="PM-Epic-Q1-Features",
+                                label="Epic Link"
                             )
-                        
-                        with gr.Row():
-                            jira_assignee = gr.Dropdown(
-                                choices=["John Smith", "Sarah Johnson", "Mike Chen", "Unassigned"],
-                                value="Unassigned",
-                                label="Assignee"
+                            
+                            create_jira_btn = gr.Button(
+                                "🎫 Create Jira Ticket",
+                                variant="secondary"
                             )
                             
-                            jira_story_points = gr.Dropdown(
-                                choices=["1", "2", "3", "5", "8", "13"],
-                                value="5",
-                                label="Story Points"
+                            jira_result = gr.Textbox(
+                                label="Jira Creation Result",
+                                lines=8,
+                                max_lines=20,
+                                interactive=False
+                            )
+                            
+                            # Bulk Import / Export Section
+                            gr.HTML("<br><h4>📦 Bulk Import / Export</h4>")
+                            
+                            import_file = gr.File(
+                                label="Import CSV / JSONL (title, priority, status, epic, assignee)",
+                                file_types=[".csv", ".jsonl", ".ndjson"],
+                                type="filepath"
+                            )
+                            
+                            import_analyze = gr.Checkbox(
+                                value=True,
+                                label="Queue AI estimates in the background"
+                            )
+                            
+                            import_btn = gr.Button("📥 Import Tasks")
+                            
+                            import_result = gr.Textbox(
+                                label="Import Result",
+                                lines=4,
+                                max_lines=12,
+                                interactive=False
+                            )
+                            
+                            with gr.Row():
+                                export_format = gr.Dropdown(
+                                    choices=["csv", "jsonl"],
+                                    value="csv",
+                                    label="Export Format"
+                                )
+                                
+                                export_btn = gr.Button("📤 Export Tasks")
+                            
+                            export_file = gr.File(
+                                label="Exported Tasks",
+                                interactive=False
                             )
                         
-                        jira_epic = gr.Dropdown(
-                            choices=["PM-Epic-Q1-Features", "PM-Epic-User-Experience", "PM-Epic-Performance"],
-                            value="PM-Epic-Q1-Features",
-                            label="Epic Link"
-                        )
-                        
-                        create_jira_btn = gr.Button(
-                            "🎫 Create Jira Ticket",
-                            variant="secondary"
+                        # Task List Display
+                        with gr.Column(scale=2):
+                            gr.HTML("<h4>🔎 Search Tasks</h4>")
+                            
+                            task_search = gr.Textbox(
+                                label="Search",
+                                placeholder="Title, epic, assignee or Jira key — prefixes and typos are fine"
+                            )
+                            
+                            with gr.Row():
+                                search_status = gr.Dropdown(
+                                    choices=["any", "todo", "progress", "done"],
+                                    value="any",
+                                    label="Status"
+                                )
+                                
+                                search_priority = gr.Dropdown(
+                                    choices=["any", "low", "medium", "high"],
+                                    value="any",
+                                    label="Priority"
+                                )
+                                
+                                search_jira = gr.Dropdown(
+                                    choices=["any", "linked", "not linked"],
+                                    value="any",
+                                    label="Jira"
+                                )
+                            
+                            search_results = gr.Markdown(
+                                value=get_task_store().get_search_display(""),
+                                label="Search Results"
+                            )
+                            
+                            gr.HTML("<h4>📝 Current Tasks</h4>")
+                            
+                            with gr.Row():
+                                tasks_page = gr.Number(
+                                    value=1,
+                                    precision=0,
+                                    minimum=1,
+                                    label="Page"
+                                )
+                                
+                                tasks_page_size = gr.Dropdown(
+                                    choices=[10, 25, 50, 100],
+                                    value=25,
+                                    label="Page Size"
+                                )
+                                
+                                tasks_sort = gr.Dropdown(
+                                    choices=list(TaskStore.SORT_KEYS),
+                                    value="id",
+                                    label="Sort By"
+                                )
+                            
+                            tasks_live = gr.Markdown(
+                                value=get_task_store().get_live_display(),
+                                label="Live Status"
+                            )
+                            
+                            tasks_version, tasks_markdown, tasks_ids = get_task_store().get_tasks_page()
+                            tasks_display = gr.Markdown(
+                                value=tasks_markdown,
+                                label="Tasks List"
+                            )
+                            
+                            tasks_view = gr.State((tasks_version, 1, 25, "id", tasks_ids))
+                            
+                            refresh_tasks_btn = gr.Button("🔄 Refresh Tasks")
+                    
+                    # Wire up functions
+                    add_task_btn.click(
+                        fn=add_task_interface,
+                        inputs=[task_title_input, task_priority, task_status, tasks_page, tasks_page_size, tasks_sort],
+                        outputs=[task_result, tasks_display]
+                    )
+                    
+                    create_jira_btn.click(
+                        fn=create_jira_ticket_interface,
+                        inputs=[jira_task_id, jira_project, jira_assignee, jira_epic, jira_story_points],
+                        outputs=jira_result
+                    )
+                    
+                    import_btn.click(
+                        fn=import_tasks_interface,
+                        inputs=[import_file, import_analyze, tasks_page, tasks_page_size, tasks_sort],
+                        outputs=[import_result, tasks_display]
+                    )
+                    
+                    export_btn.click(
+                        fn=export_tasks_interface,
+                        inputs=export_format,
+                        outputs=export_file
+                    )
+                    
+                    tasks_view_inputs = [tasks_page, tasks_page_size, tasks_sort, tasks_view]
+                    refresh_tasks_btn.click(
+                        fn=refresh_tasks_interface,
+                        inputs=tasks_view_inputs,
+                        outputs=[tasks_display, tasks_view]
+                    )
+                    
+                    for control in (tasks_page, tasks_page_size, tasks_sort):
+                        control.change(
+                            fn=refresh_tasks_interface,
+                            inputs=tasks_view_inputs,
+                            outputs=[tasks_display, tasks_view]
                         )
-                        
-                        jira_result = gr.Textbox(
-                            label="Jira Creation Result",
-                            lines=8,
-                            interactive=False
+                    
+                    # Live updates: every open dashboard polls the change feed; idle ticks send nothing
+                    if LIVE_INTERVAL > 0:
+                        gr.Timer(LIVE_INTERVAL).tick(
+                            fn=poll_tasks_interface,
+                            inputs=tasks_view_inputs,
+                            outputs=[tasks_live, tasks_display, tasks_view],
+                            show_progress="hidden",
+                            concurrency_limit=None
                         )
                     
-                    # Task List Display
-                    with gr.Column(scale=2):
-                        gr.HTML("<h4>📝 Current Tasks</h4>")
-                        
-                        tasks_display = gr.Markdown(
-                            value=task_store.get_tasks_display(),
-                            label="Tasks List"
+                    # Queries are sub-millisecond, so results follow every keystroke
+                    search_inputs = [task_search, search_status, search_priority, search_jira]
+                    for control in search_inputs:
+                        control.change(
+                            fn=search_tasks_interface,
+                            inputs=search_inputs,
+                            outputs=search_results,
+                            trigger_mode="always_last"
                         )
-                        
-                        refresh_tasks_btn = gr.Button("🔄 Refresh Tasks")
-                
-                # Wire up functions
-                add_task_btn.click(
-                    fn=add_task_interface,
-                    inputs=[task_title_input, task_priority, task_status],
-                    outputs=[task_result, tasks_display]
-                )
-                
-                create_jira_btn.click(
-                    fn=create_jira_ticket_interface,
-                    inputs=[jira_task_id, jira_project, jira_assignee, jira_epic, jira_story_points],
-                    outputs=jira_result
-                )
                 
-                refresh_tasks_btn.click(
-                    fn=task_store.get_tasks_display,
-                    outputs=tasks_display
-                )
-            
             # Research Tab
-            with gr.TabItem("🔍 Market Research"):
-                gr.HTML("""
-                <div style='text-align: center; background: rgba(6, 182, 212, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
-                    <h3 style='color: #06b6d4;'>📊 AI Market Intelligence</h3>
-                    <p>Comprehensive market analysis using ResearchAnalyst agent</p>
-                </div>
-                """)
+            if "research" in tabs:
+                with gr.TabItem("🔍 Market Research"):
+                    gr.HTML("""
+                    <div style='text-align: center; background: rgba(6, 182, 212, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
+                        <h3 style='color: #06b6d4;'>📊 AI Market Intelligence</h3>
+                        <p>Comprehensive market analysis using ResearchAnalyst agent</p>
+                    </div>
+                    """)
+                    
+                    with gr.Row():
+                        with gr.Column(scale=1):
+                            research_input = gr.Textbox(
+                                label="🎯 Research Topic",
+                                placeholder="e.g., Food Delivery Market, AI SaaS Tools",
+                                lines=2
+                            )
+                            
+                            generate_research_btn = gr.Button(
+                                "🔬 Generate Research via MCP",
+                                variant="primary",
+                                size="lg"
+                            )
+                        
+                        with gr.Column(scale=2):
+                            research_output = gr.Textbox(
+                                label="📈 Market Research Analysis",
+                                lines=25,
+                                placeholder="Your AI-generated market research will appear here...",
+                                interactive=False
+                            )
+                    
+                    generate_research_btn.click(
+                        fn=generate_research_interface,
+                        inputs=research_input,
+                        outputs=research_output
+                    )
                 
-                with gr.Row():
-                    with gr.Column(scale=1):
-                        research_input = gr.Textbox(
-                            label="🎯 Research Topic",
-                            placeholder="e.g., Food Delivery Market, AI SaaS Tools",
-                            lines=2
+            # Product Brief Tab
+            if "brief" in tabs:
+                with gr.TabItem("🧭 Product Brief"):
+                    gr.HTML("""
+                    <div style='text-align: center; background: rgba(236, 72, 153, 0.1); padding: 20px; border-radius: 12px; margin-bottom: 20px;'>
+                        <h3 style='color: #ec4899;'>🧭 Combined Product Brief</h3>
+                        <p>Roadmap, market research and task analysis from all three agents in parallel</p>
+                    </div>
+                    """)
+                    
+                    with gr.Row():
+                        brief_input = gr.Textbox(
+                            label="📝 Product Name",
+                            placeholder="e.g., E-commerce Mobile App, AI Chatbot Platform",
+                            lines=2,
+                            scale=3
                         )
                         
-                        generate_research_btn = gr.Button(
-                            "🔬 Generate Research via MCP",
+                        generate_brief_btn = gr.Button(
+                            "⚡ Generate Brief via MCP",
                             variant="primary",
-                            size="lg"
+                            size="lg",
+                            scale=1
                         )
                     
-                    with gr.Column(scale=2):
-                        research_output = gr.Textbox(
-                            label="📈 Market Research Analysis",
-                            lines=25,
-                            placeholder="Your AI-generated market research will appear here...",
-                            interactive=False
-                        )
-                
-                generate_research_btn.click(
-                    fn=generate_research_interface,
-                    inputs=research_input,
-                    outputs=research_output
-                )
+                    with gr.Row():
+                        brief_outputs = [
+                            gr.Textbox(
+                                label=f"{label} · {agent}",
+                                lines=25,
+                                interactive=False
+                            )
+                            for _, label, agent, _ in BRIEF_SECTIONS
+                        ]
+                    
+                    generate_brief_btn.click(
+                        fn=generate_product_brief_interface,
+                        inputs=brief_input,
+                        outputs=brief_outputs
+                    )
+    
+    # Handlers only await the MCP loop, so many can run at once; the MCP gates do the limiting
+    demo.queue(default_concurrency_limit=64, max_size=512)
     
     return demo
 
@@ -677,76 +1939,132 @@ def create_dashboard():
 # LAUNCH FUNCTIONS
 # ==============================================================================
 
-def launch_dashboard():
+def _start_metrics(metrics_port: int = None):
+    if metrics_port is None:
+        metrics_port = int(os.environ.get("PRODUCTMIND_METRICS_PORT", 9464))
+    if metrics_port:
+        start_metrics_server(metrics_port)
+
+def launch_dashboard(host: str = "0.0.0.0", port: int = 7860, share: bool = True, tabs=DASHBOARD_TABS,
+                     metrics_port: int = None):
     print("🚀 Initializing ProductMind AI Dashboard...")
-    print("🔗 MCP Server: Ready")
-    print("🤖 AI Agents: Loaded (RoadmapMaster, ResearchAnalyst, TaskAnalyst)")
-    print("🎫 Jira Integration: Active")
+    print(f"🔗 MCP Server: {len(mcp.tools)} tools")
+    for line in mcp.describe_tools():
+        print(f"   {line}")
+    print("🤖 AI Agents: Load on first use (RoadmapMaster, ResearchAnalyst, TaskAnalyst)")
+    print(f"🎫 Jira Integration: {'Jira REST' if jira_client else 'Local'}")
     print("🎨 Gradio Interface: Building...")
     
-    demo = create_dashboard()
+    build_started = time.perf_counter()
+    demo = create_dashboard(tabs)
+    _start_metrics(metrics_port)
+    mcp.start_executors()
     
-    print("\n✅ Dashboard ready!")
-    print("🌐 Launching with ngrok tunneling...")
-    print("🎯 Complete Features:")
-    print("   • AI Roadmap Generation")
-    print("   • Market Research Analysis")
-    print("   • Task Management with AI Analysis")
-    print("   • Jira Integration & Ticket Creation")
-    print("   • MCP Server with 3 AI Agents")
+    print(f"\n✅ Dashboard ready! (UI built in {time.perf_counter() - build_started:.2f}s, "
+          f"{time.perf_counter() - _IMPORT_STARTED:.2f}s since import)")
+    print("🌐 Launching with a Gradio share link..." if share else f"🌐 Launching on http://{host}:{port}")
+    print("🎯 Enabled tabs: " + ", ".join(tabs))
     
     return demo.launch(
-        share=True,
-        server_name="0.0.0.0",
-        server_port=7860,
+        share=share,
+        server_name=host,
+        server_port=port,
         show_error=True,
         quiet=False
     )
 
-def launch_dashboard_with_ngrok():
+def launch_dashboard_with_ngrok(port: int = 7860, tabs=DASHBOARD_TABS, metrics_port: int = None):
+    demo = None
     try:
         from pyngrok import ngrok
         
         print("🚀 Setting up explicit ngrok tunnel...")
         
-        demo = create_dashboard()
+        demo = create_dashboard(tabs)
+        _start_metrics(metrics_port)
+        mcp.start_executors()
         
         demo.launch(
             share=False,
             server_name="127.0.0.1", 
-            server_port=7860,
+            server_port=port,
             prevent_thread_lock=True,
             show_error=True
         )
         
-        public_url = ngrok.connect(7860)
-        print(f"\n✅ Dashboard launched successfully!")
-        print(f"🌐 Public URL: {public_url}")
-        print(f"📱 Access your complete dashboard from anywhere!")
-        
-        return public_url
-        
+        public_url = ngrok.connect(port)
     except Exception as e:
         print(f"❌ Ngrok setup failed: {e}")
         print("💡 Trying standard launch...")
-        return launch_dashboard()
+        # The local server may already hold the port
+        if demo is not None:
+            demo.close()
+        return launch_dashboard(port=port, tabs=tabs, metrics_port=0)
+    
+    print(f"\n✅ Dashboard launched successfully!")
+    print(f"🌐 Public URL: {public_url}")
+    print(f"📱 Access your complete dashboard from anywhere!")
+    
+    # The server runs on daemon threads, so keep the process alive until Ctrl+C
+    demo.block_thread()
+    return public_url
 
 # ==============================================================================
-# USAGE INSTRUCTIONS
+# COMMAND LINE
 # ==============================================================================
 
-print("🎯 ProductMind AI Dashboard - Complete Version!")
-print("📦 MCP Server + 3 AI Agents + Jira Integration!")
-print("")
-print("🚀 TO LAUNCH:")
-print("   launch_dashboard()")
-print("")
-print("✅ All syntax errors fixed!")
-print("✅ Complete Jira task integration included!")
-print("✅ Ready for production use!")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ProductMind AI Dashboard")
+    parser.add_argument("--host", default="0.0.0.0", help="interface to bind (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=7860, help="dashboard port (default: 7860)")
+    parser.add_argument("--share", choices=("gradio", "ngrok", "none"), default="gradio",
+                        help="public access: Gradio share link, ngrok tunnel or local only (default: gradio)")
+    parser.add_argument("--tabs", nargs="+", choices=DASHBOARD_TABS, default=list(DASHBOARD_TABS),
+                        help="tabs to show next to the status tab (default: all)")
+    parser.add_argument("--db", default=os.environ.get("PRODUCTMIND_DB"),
+                        help="SQLite file for tasks and Jira links (default: $PRODUCTMIND_DB, in-memory when unset)")
+    parser.add_argument("--shared-db", action="store_true", default=DB_SHARED,
+                        help="other dashboard processes use the same --db file: lease ids in blocks and "
+                             "pick up their changes (default: $PRODUCTMIND_DB_SHARED)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus endpoint port, 0 disables (default: $PRODUCTMIND_METRICS_PORT or 9464)")
+    parser.add_argument("--mcp-serve", metavar="ENDPOINT",
+                        help="serve the MCP tools instead of the UI: stdio or tcp://HOST:PORT")
+    parser.add_argument("--mcp-servers", nargs="+", metavar="ENDPOINT",
+                        default=os.environ.get("PRODUCTMIND_MCP_SERVERS", "").replace(",", " ").split(),
+                        help="run agent tools on these MCP servers; stdio starts a local server process "
+                             "(default: $PRODUCTMIND_MCP_SERVERS, in-process when unset)")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="report import and UI build time, then exit without serving")
+    return parser.parse_args(argv)
 
-# Try this first
-launch_dashboard()
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # MCP servers only run agent tools, so they never open the task store
+    if args.mcp_serve:
+        return serve_mcp(args.mcp_serve)
+    open_task_store(args.db, args.shared_db)
+    
+    print("🎯 ProductMind AI Dashboard")
+    print("📦 MCP Server + 3 AI Agents + Jira Integration")
+    
+    if args.cold_start:
+        imported = time.perf_counter() - _IMPORT_STARTED
+        build_started = time.perf_counter()
+        create_dashboard(args.tabs)
+        print(f"⏱️ Module import: {imported:.3f}s")
+        print(f"⏱️ UI build (incl. gradio import): {time.perf_counter() - build_started:.3f}s")
+        return None
+    
+    if args.mcp_servers:
+        connect_mcp_servers(args.mcp_servers)
+    
+    tabs = tuple(args.tabs)
+    if args.share == "ngrok":
+        return launch_dashboard_with_ngrok(port=args.port, tabs=tabs, metrics_port=args.metrics_port)
+    return launch_dashboard(host=args.host, port=args.port, share=args.share == "gradio", tabs=tabs,
+                            metrics_port=args.metrics_port)
 
-# Or if you need explicit ngrok setup
-launch_dashboard_with_ngrok()
+if __name__ == "__main__":
+    main()
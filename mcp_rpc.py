@@ -0,0 +1,1071 @@
+# ==============================================================================
+# MCP
+# ==============================================================================
+
+# The in-process tool server (SimpleMCP) and the JSON-RPC transport that serves it to other
+# processes and lets a dashboard call tools on remote servers
+import asyncio
+import atexit
+import bisect
+import concurrent.futures
+import contextvars
+import functools
+import hashlib
+import http.server
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import List, Dict, Any
+
+from tracing import SPAN_KIND_SERVER, current_span, traced_stream, tracer
+
+# ==============================================================================
+# MCP SERVER
+# ==============================================================================
+
+# Log-scale latency buckets (~19% wide) from 100µs to ~100s: fixed memory per tool
+class LatencyHistogram:
+    BOUNDS = tuple(0.0001 * 2 ** (i / 4) for i in range(81))
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.BOUNDS[i - 1] if i else 0.0
+                upper = self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+    
+    # Cumulative (upper bound, count) pairs on every step-th bound, for Prometheus "le" buckets
+    def cumulative_buckets(self, step: int = 4) -> List[tuple]:
+        buckets = []
+        seen = 0
+        for i, bound in enumerate(self.BOUNDS):
+            seen += self.counts[i]
+            if i % step == 0:
+                buckets.append((bound, seen))
+        return buckets
+
+class ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        # Callers that went away before their result (disconnects, closed streams); not errors
+        self.cancelled = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.latency = LatencyHistogram()
+        # Filled in by model backends for calls made while this tool was executing
+        self.model_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.model_seconds = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "model_calls": self.model_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "model_seconds": round(self.model_seconds, 3),
+            "p50_ms": round(self.latency.percentile(50) * 1000, 1),
+            "p95_ms": round(self.latency.percentile(95) * 1000, 1),
+            "p99_ms": round(self.latency.percentile(99) * 1000, 1)
+        }
+
+# Cache and coalescing keys ignore extra whitespace but not case: agent output echoes the
+# product or topic as typed, so "acme widgets" must not get back another caller's "ACME Widgets"
+def normalize_value(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_value(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize_value(item)) for key, item in value.items()))
+    return value
+
+def tool_call_key(tool_name: str, kwargs: dict) -> tuple:
+    return (tool_name, normalize_value(kwargs))
+
+# Size-bounded LRU of tool results; each entry expires after its tool's TTL
+class ToolResultCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class ServerBusyError(Exception):
+    def __init__(self, tool_name: str, retry_after: float):
+        super().__init__(f"Server busy: {tool_name} is at capacity, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+class ToolTimeoutError(Exception):
+    pass
+
+# Per-tool admission control: at most max_concurrency running, max_queue waiting,
+# and each admitted call (queue wait included) must finish within timeout seconds
+class ToolGate:
+    def __init__(self, max_concurrency: int = None, max_queue: int = None, timeout: float = None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._semaphore = None
+    
+    def is_full(self) -> bool:
+        if not self.max_concurrency or self.max_queue is None:
+            return False
+        return self.active + self.waiting >= self.max_concurrency + self.max_queue
+    
+    # Counted as waiting from admission (not from when the task first runs), so a
+    # burst arriving within one loop iteration is still rejected beyond the queue depth
+    def start(self, tool_name: str, make_coro, typical_latency: float) -> asyncio.Future:
+        if self.is_full():
+            self.rejected += 1
+            raise ServerBusyError(tool_name, max(1.0, typical_latency * (self.waiting + 1) / self.max_concurrency))
+        self.waiting += 1
+        ticket = {"waiting": True}
+        coro = make_coro()
+        task = asyncio.ensure_future(self._run(tool_name, coro, ticket))
+        task.add_done_callback(lambda _: (self._leave_queue(ticket), coro.close()))
+        return task
+    
+    def _leave_queue(self, ticket: dict):
+        if ticket["waiting"]:
+            ticket["waiting"] = False
+            self.waiting -= 1
+    
+    async def _run(self, tool_name: str, coro, ticket: dict):
+        try:
+            if self.timeout:
+                return await asyncio.wait_for(self._acquire_and_run(tool_name, coro, ticket), self.timeout)
+            return await self._acquire_and_run(tool_name, coro, ticket)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ToolTimeoutError(f"{tool_name} exceeded its {self.timeout:g}s deadline")
+    
+    async def _acquire_and_run(self, tool_name: str, coro, ticket: dict):
+        if not self.max_concurrency:
+            self._leave_queue(ticket)
+            return await coro
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        with tracer.span("mcp.queue_wait", tool=tool_name, queued=self._semaphore.locked()):
+            await self._semaphore.acquire()
+        self._leave_queue(ticket)
+        self.active += 1
+        try:
+            return await coro
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
+
+class ToolFlight:
+    def __init__(self, streaming: bool):
+        self.streaming = streaming
+        self.task = None
+        self.waiters = 1
+        self.chunks = []
+        self.updated = asyncio.Event()
+
+TOOL_EXECUTIONS = ("inline", "thread", "process")
+AGENT_POOL_OWNER_ENV = "PRODUCTMIND_AGENT_POOL_OWNER"
+
+# Runs in a pool worker: the start time comes back with the result
+def _timed_call(call) -> tuple:
+    return time.time_ns(), call()
+
+# Pool initializer: tells the worker which process owns it, then runs the configured initializer.
+# The pid is set in the worker's environment only; the owner's stays untouched.
+def _init_pool_worker(owner_pid: int, initializer, initargs: tuple):
+    os.environ[AGENT_POOL_OWNER_ENV] = str(owner_pid)
+    if initializer is not None:
+        initializer(*initargs)
+
+def _pool_worker_pid(delay: float) -> int:
+    time.sleep(delay)
+    return os.getpid()
+
+# Where non-inline tools run: "thread" for blocking calls and C code that releases the GIL,
+# "process" for pure-Python CPU work that would otherwise stall every session on the loop.
+# Processes are spawned (the parent runs threads, so forking is unsafe), all started up front
+# and initialized before they take work, so no call pays for an interpreter start.
+class ToolExecutors:
+    def __init__(self, threads: int = None, processes: int = None):
+        self.threads = threads or int(os.environ.get("PRODUCTMIND_TOOL_THREADS", 0)) or min(32, (os.cpu_count() or 1) + 4)
+        self.processes = processes or int(os.environ.get("PRODUCTMIND_TOOL_PROCESSES", 0)) or max(1, (os.cpu_count() or 2) - 1)
+        # Runs once in every pool process, e.g. to build agents
+        self.initializer = None
+        self.initargs = ()
+        self.busy = {"thread": 0, "process": 0}
+        self.restarts = 0
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+    
+    def thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._thread_pool is None:
+            with self._lock:
+                if self._thread_pool is None:
+                    self._thread_pool = concurrent.futures.ThreadPoolExecutor(self.threads, thread_name_prefix="mcp-tool")
+        return self._thread_pool
+    
+    def process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._process_pool is None:
+            with self._lock:
+                if self._process_pool is None:
+                    self._process_pool = self._start_process_pool()
+        return self._process_pool
+    
+    def _start_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        import multiprocessing
+        
+        started = time.perf_counter()
+        pool = concurrent.futures.ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"),
+                                                      initializer=_init_pool_worker,
+                                                      initargs=(os.getpid(), self.initializer, self.initargs))
+        # One short call per worker spawns them all at once; repeat until every worker has answered
+        pids = set()
+        while len(pids) < self.processes and time.perf_counter() - started < 60:
+            pids.update(f.result() for f in [pool.submit(_pool_worker_pid, 0.05) for _ in range(self.processes)])
+        print(f"🏭 Tool process pool: {len(pids)} workers ready in {time.perf_counter() - started:.2f}s")
+        return pool
+    
+    async def run(self, execution: str, func, kwargs: dict):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, **kwargs)
+        # Traced calls report when a worker picked them up, splitting pool queueing from the work
+        traced_call = current_span.get() is not None
+        if traced_call:
+            submitted = time.time_ns()
+            call = functools.partial(_timed_call, call)
+        if execution == "thread":
+            pool = self.thread_pool()
+        else:
+            # Starting the pool blocks for a moment, so never on the loop itself
+            pool = self._process_pool or await asyncio.to_thread(self.process_pool)
+        self.busy[execution] += 1
+        try:
+            result = await loop.run_in_executor(pool, call)
+        except concurrent.futures.BrokenExecutor:
+            # A worker died (killed, out of memory): this call fails, the next one gets a fresh pool
+            with self._lock:
+                if self._process_pool is pool:
+                    self._process_pool = None
+                    self.restarts += 1
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            self.busy[execution] -= 1
+        if traced_call:
+            started, result = result
+            tracer.record("executor.wait", submitted, started, execution=execution)
+            tracer.record("executor.run", started, time.time_ns(), execution=execution)
+        return result
+    
+    def shutdown(self):
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "threads": self.threads,
+            "processes": self.processes,
+            "process_pool": "running" if self._process_pool is not None else "stopped",
+            "busy_threads": self.busy["thread"],
+            "busy_processes": self.busy["process"],
+            "restarts": self.restarts
+        }
+
+# The tool whose execution is running in the current task; lets code deep inside an agent
+# (e.g. a model backend) attribute work to the tool that caused it
+current_tool = contextvars.ContextVar("current_tool", default=None)
+
+class SimpleMCP:
+    # history_output: "full", "truncate" (first output_preview chars), "hash" or "none"
+    def __init__(self, history_size: int = 200, history_output: str = "truncate", output_preview: int = 200,
+                 cache_size: int = 1024):
+        self.tools = {}
+        self.stream_tools = {}
+        self.cache_ttls = {}
+        self.coalesce = {}
+        self.gates = {}
+        self.executions = {}
+        self.executors = ToolExecutors()
+        self.cache = ToolResultCache(cache_size)
+        self._inflight = {}
+        self.history = deque(maxlen=history_size)
+        self.history_output = history_output
+        self.output_preview = output_preview
+        self.tool_stats = {}
+        self.total_calls = 0
+        self.remote = None
+    
+    # cache_ttl: seconds to serve repeat calls (same tool + normalized args) from cache
+    # stream: optional async-generator variant of func used by stream_tool
+    # coalesce: let identical concurrent calls share one execution (turn off for side effects)
+    # max_concurrency / max_queue / timeout: admission control, see ToolGate
+    # execution: "inline" awaits func on the loop; "thread" and "process" run a plain function
+    # in a pool (see ToolExecutors) — for "process" func and its arguments must be picklable
+    def register_tool(self, name: str, func, cache_ttl: float = None, stream=None, coalesce: bool = True,
+                      max_concurrency: int = None, max_queue: int = None, timeout: float = None,
+                      execution: str = "inline"):
+        if execution not in TOOL_EXECUTIONS:
+            raise ValueError(f"{name}: execution must be one of {', '.join(TOOL_EXECUTIONS)}")
+        if execution != "inline" and asyncio.iscoroutinefunction(func):
+            raise ValueError(f"{name}: {execution} tools must be plain functions, not coroutines")
+        self.tools[name] = func
+        self.executions[name] = execution
+        self.coalesce[name] = coalesce
+        self.gates[name] = ToolGate(max_concurrency, max_queue, timeout)
+        if stream is not None:
+            self.stream_tools[name] = stream
+        else:
+            self.stream_tools.pop(name, None)
+        if cache_ttl:
+            self.cache_ttls[name] = cache_ttl
+        else:
+            self.cache_ttls.pop(name, None)
+        self.tool_stats.setdefault(name, ToolStats())
+    
+    # For the launch banner; registration itself stays quiet, since it runs at import
+    def describe_tools(self) -> List[str]:
+        return [
+            f"✅ MCP Tool: {name}" + (f" (cached {self.cache_ttls[name]:g}s)" if name in self.cache_ttls else "")
+            + (f" ({self.executions[name]})" if self.executions.get(name, "inline") != "inline" else "")
+            for name in self.tools
+        ]
+    
+    # Starts the pools registered tools will need, so the first call doesn't wait for them
+    def start_executors(self):
+        if "process" in self.executions.values():
+            self.executors.process_pool()
+        if "thread" in self.executions.values():
+            self.executors.thread_pool()
+    
+    # Serves the named tools from a RemoteMCP; caching, coalescing, admission and stats stay here
+    def mount(self, remote, names: List[str]):
+        for name in names:
+            self.tools[name] = functools.partial(remote.call_tool, name)
+            self.executions[name] = "inline"
+            if name in self.stream_tools:
+                self.stream_tools[name] = functools.partial(remote.stream_tool, name)
+        self.remote = remote
+    
+    async def call_tool(self, tool_name: str, **kwargs):
+        if tool_name not in self.tools:
+            return f"Tool {tool_name} not found"
+        with tracer.span("mcp.call_tool", tool=tool_name) as span:
+            started = time.perf_counter()
+            cache_key = tool_call_key(tool_name, kwargs)
+            cached = self._cached_result(tool_name, cache_key)
+            if cached is not None:
+                span.set("cached", True)
+                self._record(tool_name, kwargs, cached, time.perf_counter() - started, False, cached=True)
+                return cached
+            
+            try:
+                flight, coalesced = self._join_flight(tool_name, cache_key, kwargs, streaming=False)
+            except ServerBusyError:
+                self._record(tool_name, kwargs, None, time.perf_counter() - started, True)
+                raise
+            span.set("coalesced", coalesced)
+            result = None
+            failed = True
+            cancelled = False
+            try:
+                result = await asyncio.shield(flight.task)
+                failed = False
+                return result
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                self._leave_flight(flight)
+                self._record(tool_name, kwargs, result, time.perf_counter() - started, failed, coalesced=coalesced,
+                             cancelled=cancelled)
+    
+    # Yields output chunks as the tool produces them; history, stats and cache see the joined result.
+    # The span is opened here, in the caller's context, since the stream may be driven from another loop.
+    def stream_tool(self, tool_name: str, **kwargs):
+        span = tracer.span("mcp.stream_tool", tool=tool_name)
+        return traced_stream(span, self._stream_tool(tool_name, kwargs, span))
+    
+    async def _stream_tool(self, tool_name: str, kwargs: dict, span):
+        if tool_name not in self.tools:
+            yield f"Tool {tool_name} not found"
+            return
+        
+        started = time.perf_counter()
+        cache_key = tool_call_key(tool_name, kwargs)
+        cached = self._cached_result(tool_name, cache_key)
+        if cached is not None:
+            span.set("cached", True)
+            self._record(tool_name, kwargs, cached, time.perf_counter() - started, False, cached=True)
+            yield cached
+            return
+        
+        try:
+            flight, coalesced = self._join_flight(tool_name, cache_key, kwargs, streaming=tool_name in self.stream_tools)
+        except ServerBusyError:
+            self._record(tool_name, kwargs, None, time.perf_counter() - started, True)
+            raise
+        span.set("coalesced", coalesced)
+        result = None
+        failed = True
+        cancelled = False
+        try:
+            sent = 0
+            while True:
+                while sent < len(flight.chunks):
+                    yield flight.chunks[sent]
+                    sent += 1
+                if flight.task.done():
+                    break
+                flight.updated.clear()
+                await flight.updated.wait()
+            result = flight.task.result()
+            if not flight.streaming:
+                yield result
+            failed = False
+        except (asyncio.CancelledError, GeneratorExit):
+            cancelled = True
+            raise
+        finally:
+            self._leave_flight(flight)
+            self._record(tool_name, kwargs, result, time.perf_counter() - started, failed, coalesced=coalesced,
+                         cancelled=cancelled)
+    
+    def _cached_result(self, tool_name: str, cache_key: tuple):
+        if tool_name not in self.cache_ttls:
+            return None
+        with tracer.span("mcp.cache_lookup", tool=tool_name) as span:
+            result = self.cache.get(cache_key)
+            span.set("hit", result is not None)
+            return result
+    
+    # Single-flight: identical concurrent calls share one running task. Every caller,
+    # blocking or streaming, subscribes to it; the task is cancelled once nobody waits.
+    def _join_flight(self, tool_name: str, cache_key: tuple, kwargs: dict, streaming: bool):
+        flight = self._inflight.get(cache_key)
+        if flight is not None:
+            flight.waiters += 1
+            return flight, True
+        
+        # Rejected up front when the queue is full, so overload costs the caller nothing
+        flight = ToolFlight(streaming)
+        if streaming:
+            make_coro = lambda: self._produce_stream(tool_name, cache_key, kwargs, flight)
+        else:
+            make_coro = lambda: self._produce(tool_name, cache_key, kwargs)
+        typical_latency = self.tool_stats[tool_name].latency.percentile(50) or 1.0
+        flight.task = self.gates[tool_name].start(tool_name, make_coro, typical_latency)
+        flight.task.add_done_callback(lambda _: self._finish_flight(cache_key, flight))
+        if self.coalesce.get(tool_name, True):
+            self._inflight[cache_key] = flight
+        return flight, False
+    
+    def _leave_flight(self, flight):
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            flight.task.cancel()
+    
+    def _finish_flight(self, cache_key: tuple, flight):
+        if self._inflight.get(cache_key) is flight:
+            del self._inflight[cache_key]
+        flight.updated.set()
+    
+    async def _produce(self, tool_name: str, cache_key: tuple, kwargs: dict):
+        current_tool.set(tool_name)
+        execution = self.executions.get(tool_name, "inline")
+        with tracer.span("mcp.execute", tool=tool_name, execution=execution):
+            if execution == "inline":
+                result = await self.tools[tool_name](**kwargs)
+            else:
+                result = await self.executors.run(execution, self.tools[tool_name], kwargs)
+        if tool_name in self.cache_ttls and isinstance(result, str):
+            self.cache.put(cache_key, result, self.cache_ttls[tool_name])
+        return result
+    
+    async def _produce_stream(self, tool_name: str, cache_key: tuple, kwargs: dict, flight):
+        current_tool.set(tool_name)
+        with tracer.span("mcp.execute", tool=tool_name, execution="stream") as span:
+            async for chunk in self.stream_tools[tool_name](**kwargs):
+                flight.chunks.append(chunk)
+                flight.updated.set()
+            span.set("chunks", len(flight.chunks))
+        result = "".join(flight.chunks)
+        if tool_name in self.cache_ttls:
+            self.cache.put(cache_key, result, self.cache_ttls[tool_name])
+        return result
+    
+    def _summarize(self, value, mode: str):
+        if mode == "full" or value is None or isinstance(value, (bool, int, float)):
+            return value
+        if not isinstance(value, str):
+            return self._summarize_items(value, mode)
+        if mode == "hash":
+            return f"sha1:{hashlib.sha1(value.encode()).hexdigest()[:12]} ({len(value)} chars)"
+        if mode == "none":
+            return f"({len(value)} chars)"
+        if len(value) > self.output_preview:
+            return value[:self.output_preview] + f"… (+{len(value) - self.output_preview} chars)"
+        return value
+    
+    # Batch inputs and results (title lists, result dicts) become their size plus, when
+    # truncating, a JSON preview of the first few items, so a 1,000-title call stays small
+    def _summarize_items(self, value, mode: str) -> str:
+        if isinstance(value, dict):
+            head = dict(itertools.islice(value.items(), 8))
+        elif isinstance(value, (list, tuple)):
+            head = list(value[:8])
+        else:
+            return self._summarize(str(value), "truncate" if mode == "hash" else mode)
+        summary = f"({len(value)} items)"
+        if mode != "truncate":
+            return summary
+        return f"{summary} {self._summarize(json.dumps(head, ensure_ascii=False, default=str), mode)}"
+    
+    # cancelled: the caller stopped waiting (the shared execution may still finish for others);
+    # counted apart from errors so disconnects don't show up as failing tools
+    def _record(self, tool_name: str, kwargs: dict, result, duration: float, failed: bool,
+                cached: bool = False, coalesced: bool = False, cancelled: bool = False):
+        stats = self.tool_stats.setdefault(tool_name, ToolStats())
+        stats.calls += 1
+        if cached:
+            stats.cache_hits += 1
+        if coalesced:
+            stats.coalesced += 1
+        stats.latency.record(duration)
+        if cancelled:
+            stats.cancelled += 1
+            failed = False
+        elif failed:
+            stats.errors += 1
+        self.total_calls += 1
+        
+        input_mode = "truncate" if self.history_output == "hash" else self.history_output
+        self.history.append({
+            "tool": tool_name,
+            "input": {k: self._summarize(v, input_mode) for k, v in kwargs.items()},
+            "output": self._summarize(result, self.history_output),
+            "duration_ms": round(duration * 1000, 1),
+            "error": failed,
+            "cancelled": cancelled,
+            "cached": cached,
+            "coalesced": coalesced,
+            "timestamp": datetime.now().strftime("%H:%M:%S")
+        })
+    
+    def record_model_usage(self, prompt_tokens: int, completion_tokens: int, duration: float):
+        stats = self.tool_stats.get(current_tool.get())
+        if stats is None:
+            return
+        stats.model_calls += 1
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        stats.model_seconds += duration
+    
+    def get_stats(self):
+        return {
+            "total_calls": self.total_calls,
+            "total_errors": sum(stats.errors for stats in self.tool_stats.values()),
+            "in_flight": len(self._inflight),
+            "tools_available": len(self.tools),
+            "last_call": self.history[-1]["timestamp"] if self.history else "None",
+            "tools": {name: dict(stats.to_dict(), **self.gates[name].get_stats(), execution=self.executions.get(name, "inline"))
+                      for name, stats in self.tool_stats.items()},
+            "executors": self.executors.get_stats(),
+            "remote": self.remote.get_stats() if self.remote is not None else None,
+            "cache": self.cache.get_stats()
+        }
+
+# ==============================================================================
+# MCP OVER JSON-RPC
+# ==============================================================================
+
+# MCPServer serves a SimpleMCP's tools to any MCP client (`python dashboard.py --mcp-serve stdio`
+# or tcp://127.0.0.1:8765); RemoteMCP is the client side (`--mcp-servers stdio tcp://host:8765`).
+# Messages are newline-delimited JSON-RPC 2.0. Each request runs as its own task, so one
+# connection carries any number of calls at once and replies are matched by id.
+MCP_PROTOCOL_VERSION = "2025-03-26"
+MCP_MAX_MESSAGE = 64 * 1024 * 1024
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_SERVER_BUSY = -32000
+# What a "stdio" endpoint starts as its server process
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+
+class RemoteToolError(Exception):
+    pass
+
+class JSONRPCError(Exception):
+    def __init__(self, code: int, message: str, data: dict = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+def jsonrpc_line(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+# Answers MCP requests (initialize, ping, tools/list, tools/call) from a SimpleMCP. Calls go
+# through mcp.call_tool, so the server applies its own caching, coalescing and admission limits.
+class MCPServer:
+    def __init__(self, mcp: SimpleMCP, name: str = "productmind"):
+        self.mcp = mcp
+        self.name = name
+        self.sessions = 0
+        self.requests = 0
+    
+    # notify(method, params) sends a notification to the client that made this request
+    async def handle(self, message: dict, notify) -> dict:
+        request_id = message.get("id")
+        try:
+            method = message.get("method")
+            params = message.get("params") or {}
+            if message.get("jsonrpc") != "2.0" or not isinstance(method, str) or not isinstance(params, dict):
+                raise JSONRPCError(JSONRPC_INVALID_REQUEST, "Invalid request")
+            if request_id is None:
+                return None
+            self.requests += 1
+            if method == "initialize":
+                result = {"protocolVersion": MCP_PROTOCOL_VERSION, "capabilities": {"tools": {}},
+                          "serverInfo": {"name": self.name, "version": "1.0"}}
+            elif method == "ping":
+                result = {}
+            elif method == "tools/list":
+                result = {"tools": [{"name": name, "inputSchema": {"type": "object"}} for name in self.mcp.tools]}
+            elif method == "tools/call":
+                result = await self._call_tool(params, notify)
+            else:
+                raise JSONRPCError(JSONRPC_METHOD_NOT_FOUND, f"Method not found: {method}")
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except ServerBusyError as e:
+            error = {"code": JSONRPC_SERVER_BUSY, "message": str(e), "data": {"retryAfter": e.retry_after}}
+        except JSONRPCError as e:
+            error = {"code": e.code, "message": str(e)}
+            if e.data is not None:
+                error["data"] = e.data
+        return {"jsonrpc": "2.0", "id": request_id, "error": error}
+    
+    # With a progressToken, streaming tools send each chunk as a notifications/progress message
+    async def _call_tool(self, params: dict, notify) -> dict:
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        if name not in self.mcp.tools or not isinstance(arguments, dict):
+            raise JSONRPCError(JSONRPC_INVALID_PARAMS, f"Unknown tool or bad arguments: {name}")
+        meta = params.get("_meta") or {}
+        token = meta.get("progressToken")
+        with tracer.span("mcp.server.call_tool", root=True, kind=SPAN_KIND_SERVER,
+                         traceparent=meta.get("traceparent"), tool=name) as span:
+            try:
+                if token is not None and name in self.mcp.stream_tools:
+                    chunks = []
+                    async for chunk in self.mcp.stream_tool(name, **arguments):
+                        chunks.append(chunk)
+                        await notify("notifications/progress", {"progressToken": token, "progress": len(chunks), "message": chunk})
+                    result = "".join(chunks)
+                else:
+                    result = await self.mcp.call_tool(name, **arguments)
+            except ServerBusyError:
+                raise
+            except Exception as e:
+                span.fail(f"{type(e).__name__}: {e}")
+                return {"content": [{"type": "text", "text": f"{type(e).__name__}: {e}"}], "isError": True}
+        if isinstance(result, str):
+            return {"content": [{"type": "text", "text": result}], "isError": False}
+        return {"content": [{"type": "text", "text": json.dumps(result, ensure_ascii=False)}],
+                "structuredContent": {"result": result}, "isError": False}
+    
+    # One client on one stream: stdio, or a TCP connection that didn't open with HTTP
+    async def serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, first_line: bytes = b""):
+        running = {}
+        self.sessions += 1
+        
+        async def send(message: dict):
+            writer.write(jsonrpc_line(message))
+            await writer.drain()
+        
+        async def notify(method: str, params: dict):
+            await send({"jsonrpc": "2.0", "method": method, "params": params})
+        
+        async def answer(message: dict):
+            response = await self.handle(message, notify)
+            if response is not None:
+                await send(response)
+        
+        try:
+            line = first_line or await reader.readline()
+            while line:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict):
+                    if line.strip():
+                        await send({"jsonrpc": "2.0", "id": None, "error": {"code": JSONRPC_PARSE_ERROR, "message": "Parse error"}})
+                elif message.get("method") == "notifications/cancelled":
+                    task = running.get((message.get("params") or {}).get("requestId"))
+                    if task is not None:
+                        task.cancel()
+                else:
+                    task = asyncio.create_task(answer(message))
+                    request_id = message.get("id")
+                    if request_id is not None:
+                        running[request_id] = task
+                        task.add_done_callback(lambda _, request_id=request_id: running.pop(request_id, None))
+                line = await reader.readline()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # The client is gone: nobody is left to read what these would return
+            for task in list(running.values()):
+                task.cancel()
+            self.sessions -= 1
+            writer.close()
+    
+    # Plain request/response: POST /mcp with one JSON-RPC message per request, keep-alive
+    async def serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request_line: bytes):
+        async def ignore(method: str, params: dict):
+            pass
+        
+        try:
+            while request_line:
+                method, path = (request_line.decode("latin-1").split() + ["", ""])[:2]
+                headers = {}
+                while (line := await reader.readline()).strip():
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                
+                status, payload = 200, None
+                if path.split("?")[0] != "/mcp":
+                    status = 404
+                elif method != "POST":
+                    status = 405
+                else:
+                    try:
+                        message = json.loads(body)
+                    except ValueError:
+                        message = None
+                    if isinstance(message, dict):
+                        payload = await self.handle(message, ignore)
+                    else:
+                        payload = {"jsonrpc": "2.0", "id": None, "error": {"code": JSONRPC_PARSE_ERROR, "message": "Parse error"}}
+                    if payload is None:
+                        status = 202
+                
+                data = jsonrpc_line(payload) if payload is not None else b""
+                reason = http.server.BaseHTTPRequestHandler.responses[status][0]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+                request_line = await reader.readline()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    # JSON-RPC lines and HTTP share the port; the first line tells them apart
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            first_line = await reader.readline()
+        except (ConnectionError, ValueError):
+            writer.close()
+            return
+        if first_line.split(b" ", 1)[0] in (b"GET", b"POST", b"HEAD", b"PUT", b"DELETE", b"OPTIONS"):
+            await self.serve_http(reader, writer, first_line)
+        else:
+            await self.serve_stream(reader, writer, first_line)
+    
+    async def serve_tcp(self, host: str, port: int):
+        server = await asyncio.start_server(self._accept, host, port, limit=MCP_MAX_MESSAGE)
+        print(f"🛰️ MCP server on tcp://{host}:{port} (JSON-RPC lines, or HTTP POST /mcp)")
+        async with server:
+            await server.serve_forever()
+    
+    # stdout carries the protocol, so everything printed from here on goes to stderr instead
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+        sys.stdout.flush()
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        reader = asyncio.StreamReader(limit=MCP_MAX_MESSAGE)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, protocol_out)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        print(f"🛰️ MCP server on stdio (pid {os.getpid()})")
+        await self.serve_stream(reader, writer)
+
+# One client connection to an MCP server: a TCP socket, or the pipes of a server process it
+# starts itself ("stdio"). Any number of requests can be in flight; the reader task hands
+# each reply to the caller waiting on its id.
+class MCPConnection:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.pending = {}
+        self.progress = {}
+        self.requests = 0
+        self.reconnects = 0
+        self._ids = itertools.count(1)
+        self._reader = None
+        self._writer = None
+        self._process = None
+        self._read_task = None
+        self._lock = None
+    
+    @property
+    def connected(self) -> bool:
+        return self._read_task is not None and not self._read_task.done()
+    
+    async def _ensure_connected(self):
+        if self.connected:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.connected:
+                return
+            await self._close_transport()
+            if self.endpoint == "stdio":
+                # A fresh agent server: in-memory store, and it must not fan out to servers of its own
+                env = {k: v for k, v in os.environ.items() if k not in ("PRODUCTMIND_DB", "PRODUCTMIND_MCP_SERVERS")}
+                self._process = await asyncio.create_subprocess_exec(
+                    sys.executable, SERVER_SCRIPT, "--mcp-serve", "stdio",
+                    stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, env=env, limit=MCP_MAX_MESSAGE)
+                self._reader, self._writer = self._process.stdout, self._process.stdin
+            else:
+                host, _, port = self.endpoint.removeprefix("tcp://").rpartition(":")
+                self._reader, self._writer = await asyncio.open_connection(host, int(port), limit=MCP_MAX_MESSAGE)
+            self._read_task = asyncio.create_task(self._read_replies())
+            self.reconnects += 1
+            await self._send_request("initialize", {"protocolVersion": MCP_PROTOCOL_VERSION, "capabilities": {},
+                                                    "clientInfo": {"name": "productmind-dashboard", "version": "1.0"}})
+            self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+    
+    def _send(self, message: dict):
+        self._writer.write(jsonrpc_line(message))
+    
+    # on_progress(message) receives the chunks of a streaming tool as they arrive
+    async def request(self, method: str, params: dict, on_progress=None) -> dict:
+        await self._ensure_connected()
+        return await self._send_request(method, params, on_progress)
+    
+    async def _send_request(self, method: str, params: dict, on_progress=None) -> dict:
+        request_id = next(self._ids)
+        reply = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = reply
+        meta = {}
+        if on_progress is not None:
+            meta["progressToken"] = request_id
+            self.progress[request_id] = on_progress
+        # The server continues this trace under the caller's span
+        span = current_span.get()
+        if span is not None:
+            meta["traceparent"] = span.traceparent
+        if meta:
+            params = dict(params, _meta=meta)
+        self.requests += 1
+        try:
+            self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            await self._writer.drain()
+            return await reply
+        except asyncio.CancelledError:
+            # Nobody waits for the answer any more: let the server stop working on it
+            if self.connected:
+                self._send({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": request_id}})
+            raise
+        finally:
+            self.pending.pop(request_id, None)
+            self.progress.pop(request_id, None)
+    
+    async def _read_replies(self):
+        error = ConnectionError(f"MCP server {self.endpoint} closed the connection")
+        try:
+            while line := await self._reader.readline():
+                # A server started over stdio may print its banner before speaking the protocol
+                if not line.startswith(b"{"):
+                    continue
+                message = json.loads(line)
+                if "id" in message and "method" not in message:
+                    reply = self.pending.get(message["id"])
+                    if reply is not None and not reply.done():
+                        reply.set_result(message)
+                elif message.get("method") == "notifications/progress":
+                    params = message.get("params") or {}
+                    on_progress = self.progress.get(params.get("progressToken"))
+                    if on_progress is not None:
+                        on_progress(params.get("message", ""))
+        except (ConnectionError, ValueError) as e:
+            error = ConnectionError(f"MCP server {self.endpoint}: {e}")
+        finally:
+            for reply in self.pending.values():
+                if not reply.done():
+                    reply.set_exception(error)
+    
+    async def _close_transport(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._read_task is not None:
+            self._read_task.cancel()
+        if self._process is not None and self._process.returncode is None:
+            # With stdin closed the server exits by itself (flushing its traces); stragglers are terminated
+            try:
+                await asyncio.wait_for(self._process.wait(), 2)
+            except asyncio.TimeoutError:
+                self._process.terminate()
+                await self._process.wait()
+        self._reader = self._writer = self._process = self._read_task = None
+    
+    async def close(self):
+        await self._close_transport()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"endpoint": self.endpoint, "connected": self.connected, "in_flight": len(self.pending),
+                "requests": self.requests, "connects": self.reconnects}
+
+# Client for one or more MCP servers. Each call goes to the connection with the fewest calls
+# in flight, so load spreads over every server process behind the dashboard.
+class RemoteMCP:
+    def __init__(self, endpoints: List[str], connections: int = 1):
+        self.connections = [MCPConnection(endpoint) for endpoint in endpoints for _ in range(connections)]
+        self._turn = itertools.count()
+    
+    def _pick(self) -> MCPConnection:
+        # Rotate the starting point so idle connections take turns instead of the first always winning
+        start = next(self._turn) % len(self.connections)
+        rotated = self.connections[start:] + self.connections[:start]
+        return min(rotated, key=lambda connection: len(connection.pending))
+    
+    async def connect(self):
+        await asyncio.gather(*(connection.request("ping", {}) for connection in self.connections))
+    
+    async def list_tools(self) -> List[str]:
+        result = await self._pick().request("tools/list", {})
+        return [tool["name"] for tool in result["result"]["tools"]]
+    
+    async def call_tool(self, tool_name: str, **kwargs):
+        reply = await self._pick().request("tools/call", {"name": tool_name, "arguments": kwargs})
+        return self._unwrap(tool_name, reply)
+    
+    async def stream_tool(self, tool_name: str, **kwargs):
+        chunks = asyncio.Queue()
+        call = asyncio.create_task(self._pick().request("tools/call", {"name": tool_name, "arguments": kwargs},
+                                                        on_progress=chunks.put_nowait))
+        call.add_done_callback(lambda _: chunks.put_nowait(None))
+        streamed = False
+        try:
+            while (chunk := await chunks.get()) is not None:
+                streamed = True
+                yield chunk
+            result = self._unwrap(tool_name, call.result())
+            if not streamed:
+                yield result
+        finally:
+            call.cancel()
+    
+    def _unwrap(self, tool_name: str, reply: dict):
+        error = reply.get("error")
+        if error is not None:
+            if error.get("code") == JSONRPC_SERVER_BUSY:
+                raise ServerBusyError(tool_name, (error.get("data") or {}).get("retryAfter", 1.0))
+            raise RemoteToolError(f"{tool_name}: {error.get('message')}")
+        result = reply["result"]
+        text = "".join(part.get("text", "") for part in result.get("content", []))
+        if result.get("isError"):
+            raise RemoteToolError(text)
+        if "structuredContent" in result:
+            return result["structuredContent"]["result"]
+        return text
+    
+    async def close(self):
+        for connection in self.connections:
+            await connection.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"servers": [connection.get_stats() for connection in self.connections]}
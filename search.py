@@ -0,0 +1,416 @@
+# ==============================================================================
+# TASK SEARCH
+# ==============================================================================
+
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+from typing import List, Dict, Any
+
+
+SEARCH_TOKEN = re.compile(r"[a-z0-9]+")
+# Every ASCII byte outside [a-z0-9] becomes a space
+_TOKEN_BYTES = b"0123456789abcdefghijklmnopqrstuvwxyz"
+_ASCII_SEPARATORS = bytes.maketrans(bytes(range(128)), bytes(c if c in _TOKEN_BYTES else 32 for c in range(128)))
+
+def search_tokens(text: str) -> List[str]:
+    if not text:
+        return []
+    text = text.lower()
+    # Same tokens as SEARCH_TOKEN, but splitting a translated copy is faster for ASCII text,
+    # which is nearly every title; loading a store tokenizes all of them
+    if text.isascii():
+        return text.encode().translate(_ASCII_SEPARATORS).decode().split()
+    return SEARCH_TOKEN.findall(text)
+
+def _deletions(token: str) -> set:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+# Sorted distinct values (tokens, task ids) kept in blocks of at most 2 * BLOCK, so an insert
+# shifts one block instead of the whole list, a prefix range is found with two bisects and a
+# position is reached by skipping whole blocks. Like a set, adding a value that is already
+# there or removing one that isn't does nothing.
+class SortedList:
+    BLOCK = 512
+    
+    def __init__(self):
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+    
+    # From values already sorted and distinct, e.g. ids read in id order; no per-value inserts
+    @classmethod
+    def from_sorted(cls, values: list) -> "SortedList":
+        self = cls()
+        self._blocks = [values[i:i + cls.BLOCK] for i in range(0, len(values), cls.BLOCK)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(values)
+        return self
+    
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+    
+    def __contains__(self, value) -> bool:
+        i = bisect.bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        j = bisect.bisect_left(block, value)
+        return j < len(block) and block[j] == value
+    
+    def add(self, value):
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+        else:
+            i = min(bisect.bisect_left(self._maxes, value), len(self._maxes) - 1)
+            block = self._blocks[i]
+            j = bisect.bisect_left(block, value)
+            if j < len(block) and block[j] == value:
+                return
+            block.insert(j, value)
+            self._maxes[i] = block[-1]
+            if len(block) > 2 * self.BLOCK:
+                self._blocks[i:i + 1] = [block[:self.BLOCK], block[self.BLOCK:]]
+                self._maxes[i:i + 1] = [block[self.BLOCK - 1], block[-1]]
+        self._len += 1
+    
+    def remove(self, value):
+        i = bisect.bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return
+        block = self._blocks[i]
+        j = bisect.bisect_left(block, value)
+        if j < len(block) and block[j] == value:
+            del block[j]
+            self._len -= 1
+            if block:
+                self._maxes[i] = block[-1]
+            else:
+                del self._blocks[i]
+                del self._maxes[i]
+    
+    # Values at positions start..end-1, like list(self)[start:end]
+    def slice(self, start: int, end: int) -> list:
+        found = []
+        for block in self._blocks:
+            if start >= len(block):
+                start -= len(block)
+                end -= len(block)
+                continue
+            found.extend(block[start:end])
+            end -= len(block)
+            if end <= 0:
+                break
+            start = 0
+        return found
+    
+    def prefixed(self, prefix: str, limit: int) -> List[str]:
+        found = []
+        i = bisect.bisect_left(self._maxes, prefix)
+        while i < len(self._blocks) and len(found) < limit:
+            block = self._blocks[i]
+            for token in block[bisect.bisect_left(block, prefix):]:
+                if not token.startswith(prefix) or len(found) == limit:
+                    return found
+                found.append(token)
+            i += 1
+        return found
+
+# Inverted index over task titles, epics, assignees and Jira keys, kept up to date by
+# TaskStore on every insert and on updates that touch those fields. Every query word must
+# match (exactly, as a prefix or, failing both, with one typo); tasks are ranked by match
+# quality weighted by how rare the matched token is, newest first on ties.
+class TaskSearchIndex:
+    FIELDS = ("title", "epic", "assignee", "jira_id")
+    # Match quality per kind of hit
+    EXACT = 1.0
+    PREFIX = 0.6
+    FUZZY = 0.4
+    # A short prefix like "a" would otherwise pull in a large part of the vocabulary
+    MAX_EXPANSIONS = 32
+    # Typo matching only for words; ids and numbers must match exactly or by prefix
+    FUZZY_MIN_LENGTH = 4
+    # Queries with fewer candidates than this are counted exactly; larger ones stop at the limit
+    EXACT_TOTAL_BELOW = 1000
+    # Postings holding at least 1 in this many ids are walked by probing ids, not by sorting
+    DENSE_POSTINGS = 16
+    
+    # Postings hold a bare task id until a second task shares the token: most tokens in
+    # a large store (numbers, ids, rare words) belong to one task and cost no set at all
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = SortedList()
+        # token with one character deleted -> tokens it came from (typo lookups)
+        self.deletes = {}
+        self.documents = 0
+        self.top_id = 0
+        # Queries pick their postings under the lock too; both sides are short (see _walk)
+        self._lock = threading.Lock()
+    
+    # A task's tokens, repeats included; terms() is the set of them
+    def tokens(self, task) -> List[str]:
+        return search_tokens(" ".join(filter(None, (task.title, task.epic, task.assignee, task.jira_id))))
+    
+    def terms(self, task) -> set:
+        return set(self.tokens(task))
+    
+    def add(self, task_id: int, terms: set):
+        self.add_many([(task_id, terms)])
+    
+    # entries: [(task_id, terms)], where terms may also be a token list with repeats; one lock
+    # round per batch and the common cases inlined, since bulk imports spend most of their
+    # indexing time here
+    def add_many(self, entries: list):
+        new_tokens = []
+        with self._lock:
+            postings = self.postings
+            for task_id, terms in entries:
+                for token in terms:
+                    ids = postings.get(token)
+                    if ids is None:
+                        postings[token] = task_id
+                        new_tokens.append(token)
+                    elif type(ids) is int:
+                        if ids != task_id:
+                            postings[token] = {ids, task_id}
+                    else:
+                        ids.add(task_id)
+            # Loading a store brings mostly new tokens: one merge beats an insert per token
+            if len(new_tokens) > len(self.vocabulary):
+                self.vocabulary = SortedList.from_sorted(sorted(list(self.vocabulary) + new_tokens))
+                for token in new_tokens:
+                    self._add_variants(token)
+            else:
+                for token in new_tokens:
+                    self._add_token(token)
+            self.documents += len(entries)
+            if entries:
+                self.top_id = max(self.top_id, max(task_id for task_id, _ in entries))
+    
+    def reindex(self, task_id: int, old_terms: set, new_terms: set):
+        if old_terms == new_terms:
+            return
+        with self._lock:
+            for token in old_terms - new_terms:
+                self._unpost(token, task_id)
+            for token in new_terms - old_terms:
+                self._post(token, task_id)
+    
+    def _fuzzy(self, token: str) -> bool:
+        return len(token) >= self.FUZZY_MIN_LENGTH and token.isalpha()
+    
+    def _add_token(self, token: str):
+        self.vocabulary.add(token)
+        self._add_variants(token)
+    
+    def _add_variants(self, token: str):
+        if self._fuzzy(token):
+            for variant in _deletions(token):
+                self.deletes.setdefault(variant, set()).add(token)
+    
+    def _post(self, token: str, task_id: int):
+        ids = self.postings.get(token)
+        if ids is None:
+            self.postings[token] = task_id
+            self._add_token(token)
+        elif type(ids) is int:
+            if ids != task_id:
+                self.postings[token] = {ids, task_id}
+        else:
+            ids.add(task_id)
+    
+    def _unpost(self, token: str, task_id: int):
+        ids = self.postings.get(token)
+        if ids is None:
+            return
+        if type(ids) is not int:
+            ids.discard(task_id)
+            if len(ids) == 1:
+                self.postings[token] = next(iter(ids))
+            return
+        if ids != task_id:
+            return
+        del self.postings[token]
+        self.vocabulary.remove(token)
+        if self._fuzzy(token):
+            for variant in _deletions(token):
+                tokens = self.deletes.get(variant)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.deletes[variant]
+    
+    # Tokens one edit away: the word with a letter added or removed, a letter changed
+    # or two letters swapped all share a one-deletion variant with it
+    def _near(self, word: str) -> set:
+        found = set(self.deletes.get(word, ()))
+        for variant in _deletions(word):
+            if variant in self.postings:
+                found.add(variant)
+            found.update(self.deletes.get(variant, ()))
+        found.discard(word)
+        return found
+    
+    # [(postings, weight)] for every token a query word can match
+    def _expand(self, word: str) -> list:
+        qualities = {}
+        if word in self.postings:
+            qualities[word] = self.EXACT
+        for token in self.vocabulary.prefixed(word, self.MAX_EXPANSIONS + 1):
+            qualities.setdefault(token, self.PREFIX)
+        # Typos are only considered for words that match nothing as typed; otherwise a common
+        # neighbour ("form" for "from") would flood a precise query with weak matches
+        if not qualities and self._fuzzy(word):
+            for token in self._near(word):
+                qualities.setdefault(token, self.FUZZY)
+        
+        documents = max(self.documents, 1)
+        matches = []
+        for token, quality in qualities.items():
+            ids = self.postings[token]
+            count = 1 if type(ids) is int else len(ids)
+            matches.append((ids, quality * math.log(1 + documents / count)))
+        return matches
+    
+    # Returns (ranked task ids, total matches, whether total is an estimate). accept(task_id)
+    # applies structured filters.
+    def search(self, query: str, limit: int = 25, accept=None) -> tuple:
+        words = list(dict.fromkeys(search_tokens(query)))
+        if not words:
+            return [], 0, False
+        
+        with self._lock:
+            expanded = [self._expand(word) for word in words]
+            # Start from the word with the fewest candidates; later words only probe those
+            expanded.sort(key=lambda matches: sum(1 if type(ids) is int else len(ids) for ids, _ in matches))
+            if not expanded[0]:
+                return [], 0, False
+            top_id = self.top_id
+            # A single word, or one token per word, ranks by tiers of equal score, newest first
+            # within a tier, so the best ids can be walked to instead of scoring every match
+            if len(words) == 1:
+                tiers = self._tiers(expanded[0])
+                candidates = sum(1 if type(ids) is int else len(ids) for ids, _ in expanded[0])
+                exact = len(tiers) == 1 and len(tiers[0]) == 1
+            elif all(len(matches) == 1 for matches in expanded):
+                shared = set.intersection(*({ids} if type(ids) is int else ids for (ids, _), in expanded))
+                if not shared:
+                    return [], 0, False
+                tiers, candidates, exact = [[shared]], len(shared), True
+            else:
+                tiers, scores = None, self._scores(expanded)
+        
+        if tiers is not None:
+            return self._walk(tiers, top_id, candidates, exact, limit, accept)
+        if accept is None:
+            return self._ranked(scores, limit), len(scores), False
+        if len(scores) < self.EXACT_TOTAL_BELOW:
+            scores = {task_id: score for task_id, score in scores.items() if accept(task_id)}
+            return self._ranked(scores, limit), len(scores), False
+        # Filters are checked on the best ranked ids only, in growing windows, until limit pass
+        found, examined, window = [], 0, limit
+        while len(found) < limit and examined < len(scores):
+            for task_id in self._ranked(scores, window)[examined:]:
+                examined += 1
+                if accept(task_id):
+                    found.append(task_id)
+                    if len(found) == limit:
+                        break
+            window *= 4
+        if examined == len(scores):
+            return found, len(found), False
+        return found, self._estimate(len(scores), found, examined), True
+    
+    # task id -> score for multi-word queries: a task scores the best match of each word.
+    # Matches are applied from the weakest up, so the best one wins, and in bulk, so broad
+    # words stay in C loops.
+    def _scores(self, expanded: list) -> dict:
+        scores = {}
+        for ids, weight in sorted(expanded[0], key=lambda match: match[1]):
+            if type(ids) is int:
+                scores[ids] = weight
+            else:
+                scores.update(dict.fromkeys(ids, weight))
+        for matches in expanded[1:]:
+            narrowed = {}
+            for ids, weight in sorted(matches, key=lambda match: match[1]):
+                if type(ids) is int:
+                    hits = (ids,) if ids in scores else ()
+                else:
+                    hits = scores.keys() & ids
+                narrowed.update({task_id: scores[task_id] + weight for task_id in hits})
+            scores = narrowed
+        return scores
+    
+    # Ids come out of the postings mostly ascending, which is nlargest's worst case
+    # (every item replaces the heap's minimum); walked newest first, most items are one compare
+    def _ranked(self, scores: dict, limit: int) -> List[int]:
+        return [task_id for _, task_id in heapq.nlargest(limit, zip(reversed(scores.values()), reversed(scores.keys())))]
+    
+    # A single word's matches as rank tiers, best first: the postings of every token with the
+    # same weight go in one tier, since their tasks tie and are ranked by id
+    def _tiers(self, matches: list) -> List[list]:
+        return [[ids for ids, _ in group]
+                for _, group in itertools.groupby(sorted(matches, key=lambda match: -match[1]), key=lambda match: match[1])]
+    
+    # Postings newest first, produced lazily. Dense ones are probed id by id downwards, all in
+    # C, so a common word costs about limit / density probes instead of a pass over its ids.
+    # Sparser ones are probed over the top ids expected to hold `wanted` of them, then over
+    # doubling windows below, until probing would cost more than sorting what is left.
+    def _newest_first(self, ids, top_id: int, wanted: int):
+        if type(ids) is int:
+            yield ids
+            return
+        if len(ids) * self.DENSE_POSTINGS >= top_id:
+            yield from filter(ids.__contains__, range(top_id, 0, -1))
+            return
+        high, window = top_id, 2 * wanted * top_id // len(ids) + 1
+        while high > 0 and window < 4 * len(ids):
+            low = max(0, high - window)
+            yield from filter(ids.__contains__, range(high, low, -1))
+            high, window = low, 2 * window
+        if high > 0:
+            rest = sorted(ids)
+            yield from reversed(rest[:bisect.bisect_right(rest, high)])
+    
+    # Walks the tiers in rank order and stops at the limit-th accepted id, unless the query
+    # matches so few tasks that counting them all exactly is cheap. Reads the postings
+    # outside the lock: probes and set copies are single C calls, and a query that misses
+    # a task posted meanwhile is no different from one that ran a moment earlier.
+    def _walk(self, tiers: List[list], top_id: int, candidates: int, exact: bool, limit: int, accept) -> tuple:
+        stop = candidates >= self.EXACT_TOTAL_BELOW
+        found, examined, accepted, seen = [], 0, 0, set()
+        # A task under several tokens ranks by the best one, which comes first
+        overlap = len(tiers) > 1 or len(tiers[0]) > 1
+        for tier in tiers:
+            walks = [self._newest_first(ids, top_id, limit - len(found)) for ids in tier]
+            for task_id in walks[0] if len(walks) == 1 else heapq.merge(*walks, reverse=True):
+                if overlap:
+                    if task_id in seen:
+                        continue
+                    seen.add(task_id)
+                examined += 1
+                if accept is None or accept(task_id):
+                    accepted += 1
+                    if len(found) < limit:
+                        found.append(task_id)
+                        if stop and len(found) == limit:
+                            if exact and accept is None:
+                                return found, candidates, False
+                            return found, self._estimate(candidates, found, examined), True
+        return found, accepted, False
+    
+    # Total for a ranking cut short: the candidates, scaled by the share of them accepted so far
+    def _estimate(self, candidates: int, found: list, examined: int) -> int:
+        return max(len(found), round(candidates * len(found) / examined))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"documents": self.documents, "tokens": len(self.postings), "typo_variants": len(self.deletes)}
@@ -0,0 +1,1102 @@
+# ==============================================================================
+# TASK STORAGE
+# ==============================================================================
+
+# Task and Jira records, their persistence backends and the in-memory TaskStore with its indexes
+import bisect
+import concurrent.futures
+import heapq
+import itertools
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from datetime import datetime
+from typing import List, Dict, Any
+
+from search import SortedList, TaskSearchIndex, search_tokens
+from tracing import traced
+
+# ==============================================================================
+# TASK RECORDS
+# ==============================================================================
+
+TASK_COLUMNS = ("id", "title", "priority", "status", "created_at", "jira_id", "jira_url", "epic", "assignee", "estimate")
+JIRA_COLUMNS = ("id", "task_id", "title", "priority", "project", "assignee", "epic", "story_points", "status", "created_at", "url")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+# Stores written before records held epochs contain "YYYY-MM-DD HH:MM" strings
+def to_epoch(value) -> int:
+    if isinstance(value, str):
+        return int(datetime.strptime(value, TIMESTAMP_FORMAT).timestamp())
+    return int(value)
+
+def format_epoch(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch).strftime(TIMESTAMP_FORMAT)
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+# Slotted record with a dict face: record["title"], dict(record), record.get(...) and
+# record.update(...) keep working, but a task costs one small object instead of a dict
+# plus a formatted date string. Low-cardinality fields share one string per value.
+class Record(Mapping):
+    __slots__ = ()
+    FIELDS = ()
+    INTERNED = ()
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in self.INTERNED else value)
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self):
+        return len(self.FIELDS)
+    
+    def update(self, changes: dict):
+        for key, value in changes.items():
+            self[key] = value
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+class Task(Record):
+    __slots__ = ("id", "title", "priority", "status", "created", "jira_id", "jira_url", "epic", "assignee", "estimate")
+    FIELDS = TASK_COLUMNS
+    INTERNED = ("priority", "status", "epic", "assignee")
+    
+    # estimate: story points from the background TaskAgent analysis, None until it has run
+    def __init__(self, id: int, title: str, priority: str, status: str, created_at, jira_id: str = None,
+                 jira_url: str = None, epic: str = None, assignee: str = None, estimate: int = None):
+        self.id = id
+        self.title = title
+        self.priority = _intern(priority)
+        self.status = _intern(status)
+        self.created = to_epoch(created_at)
+        self.jira_id = jira_id
+        self.jira_url = jira_url
+        self.epic = _intern(epic)
+        self.assignee = _intern(assignee)
+        self.estimate = estimate
+    
+    # Formatted only when someone reads it (rendering, API callers)
+    @property
+    def created_at(self) -> str:
+        return format_epoch(self.created)
+    
+    @created_at.setter
+    def created_at(self, value):
+        self.created = to_epoch(value)
+    
+    def row(self) -> tuple:
+        return (self.id, self.title, self.priority, self.status, self.created, self.jira_id, self.jira_url,
+                self.epic, self.assignee, self.estimate)
+
+# Title and priority are read through the linked task rather than copied into the ticket
+class JiraTicket(Record):
+    __slots__ = ("id", "task", "project", "assignee", "epic", "story_points", "status", "created", "url")
+    FIELDS = JIRA_COLUMNS
+    INTERNED = ("project", "assignee", "epic", "story_points", "status")
+    
+    def __init__(self, id: str, task: Task, project: str, assignee: str, epic: str, story_points: str,
+                 status: str, created_at, url: str):
+        self.id = id
+        self.task = task
+        self.project = _intern(project)
+        self.assignee = _intern(assignee)
+        self.epic = _intern(epic)
+        self.story_points = _intern(story_points)
+        self.status = _intern(status)
+        self.created = to_epoch(created_at)
+        self.url = url
+    
+    @classmethod
+    def from_row(cls, row: tuple, tasks_by_id: dict) -> "JiraTicket":
+        id, task_id, title, priority, project, assignee, epic, story_points, status, created_at, url = row
+        # A ticket whose task row is gone keeps a detached copy of what it was created from
+        task = tasks_by_id.get(task_id) or Task(task_id, title, priority, "todo", created_at, jira_id=id, jira_url=url)
+        return cls(id, task, project, assignee, epic, story_points, status, created_at, url)
+    
+    @property
+    def task_id(self) -> int:
+        return self.task.id
+    
+    @property
+    def title(self) -> str:
+        return self.task.title
+    
+    @property
+    def priority(self) -> str:
+        return self.task.priority
+    
+    @property
+    def created_at(self) -> str:
+        return format_epoch(self.created)
+    
+    def row(self) -> tuple:
+        return (self.id, self.task.id, self.task.title, self.task.priority, self.project, self.assignee, self.epic,
+                self.story_points, self.status, self.created, self.url)
+
+# ==============================================================================
+# TASK PERSISTENCE
+# ==============================================================================
+
+# Default backend: keeps nothing, so TaskStore behaves as a pure in-memory store.
+# load() yields rows as tuples in TASK_COLUMNS / JIRA_COLUMNS order.
+class TaskBackend:
+    # True when other processes write to the same store (see TaskStore.refresh)
+    shared = False
+    
+    def load(self):
+        return iter(()), iter(()), {}
+    
+    # Reserves count ids of counter `name`, none below floor; nobody else hands out ids here
+    def lease_ids(self, name: str, floor: int, count: int) -> range:
+        return range(floor, floor + count)
+    
+    # Gives back the unused end of a lease, if nobody has leased past it since
+    def release_ids(self, name: str, next_id: int, end: int):
+        pass
+    
+    # Cheap check for commits by other processes; load_changes() then returns their rows,
+    # leaving out rows this process is about to overwrite
+    def changed(self) -> bool:
+        return False
+    
+    def load_changes(self):
+        return [], []
+    
+    # Records that task_id is linked to jira_id; False if some other process linked it first
+    def claim_link(self, task_id: int, jira_id: str) -> bool:
+        return True
+    
+    def save_task(self, task: Task):
+        pass
+    
+    def save_tasks(self, tasks: List[Task]):
+        for task in tasks:
+            self.save_task(task)
+    
+    def save_jira_ticket(self, ticket: JiraTicket):
+        pass
+    
+    def save_counter(self, name: str, value: int):
+        pass
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        pass
+
+class TaskBackendError(Exception):
+    pass
+
+# Every commit stamps the rows it writes with the next value of the change_seq counter,
+# so another process can fetch exactly what changed since it last looked.
+class SQLiteTaskBackend(TaskBackend):
+    # Writes are queued and group-committed by one writer thread, so callers never wait on fsync.
+    # A failed commit keeps its rows and retries them with the next batch, backing off from
+    # retry_delay up to max_retry_delay; flush() and close() raise TaskBackendError while rows
+    # are unwritten. close() gives up after close_retries attempts.
+    # shared: several processes use the file at once; ids are leased from the counters table
+    # in blocks, and each store pulls in the others' commits through load_changes()
+    def __init__(self, path: str, commit_interval: float = 0.05, batch_size: int = 5000, shared: bool = False,
+                 retry_delay: float = 0.1, max_retry_delay: float = 5.0, close_retries: int = 5):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.batch_size = batch_size
+        self.shared = shared
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.close_retries = close_retries
+        self.failed_commits = 0
+        self.last_error = None
+        self._close_error = None
+        self._queue = queue.Queue()
+        
+        conn = self._connect()
+        conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, {", ".join(TASK_COLUMNS[1:])}, seq INTEGER);
+            CREATE TABLE IF NOT EXISTS jira_tickets (id TEXT PRIMARY KEY, {", ".join(JIRA_COLUMNS[1:])}, seq INTEGER);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER);
+            CREATE TABLE IF NOT EXISTS jira_links (task_id INTEGER PRIMARY KEY, jira_id TEXT);
+            INSERT OR IGNORE INTO counters VALUES ('change_seq', 0);
+        """)
+        # Databases created by older versions lack columns added since (e.g. estimate)
+        for table, columns in (("tasks", TASK_COLUMNS), ("jira_tickets", JIRA_COLUMNS)):
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column in columns + ("seq",):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_seq ON {table} (seq)")
+        conn.commit()
+        conn.close()
+        
+        # Shared mode: id leases and change polling use their own connection, off the writer thread
+        self._reader = self._connect() if shared else None
+        self._reader_lock = threading.Lock()
+        self._data_version = None
+        self._seen_seq = 0
+        # (table, key) -> queued writes not yet committed
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        
+        self._writer = threading.Thread(target=self._write_loop, name="task-backend-writer", daemon=True)
+        self._writer.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Other processes may hold the write lock for a group commit; wait for it rather than fail
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def load(self):
+        conn = self._connect()
+        counters = dict(conn.execute("SELECT name, value FROM counters"))
+        # Read before the rows: anything committed while they stream in is fetched again, never missed
+        self._seen_seq = counters.get("change_seq", 0)
+        
+        def stream(table: str, columns: tuple, order: str):
+            cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}")
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                yield from rows
+        
+        return stream("tasks", TASK_COLUMNS, "id"), stream("jira_tickets", JIRA_COLUMNS, "rowid"), counters
+    
+    def save_task(self, task: Task):
+        row = task.row()
+        self._track("tasks", (row,), 1)
+        self._queue.put(("tasks", row))
+    
+    def save_tasks(self, tasks: List[Task]):
+        rows = [task.row() for task in tasks]
+        self._track("tasks", rows, 1)
+        self._queue.put(("tasks_many", rows))
+    
+    def save_jira_ticket(self, ticket: JiraTicket):
+        row = ticket.row()
+        self._track("jira_tickets", (row,), 1)
+        self._queue.put(("jira_tickets", row))
+    
+    # Shared counters are leased instead; a queued absolute value would overwrite other workers' leases
+    def save_counter(self, name: str, value: int):
+        if not self.shared:
+            self._queue.put(("counters", (name, value)))
+    
+    def _track(self, table: str, rows, delta: int):
+        if not self.shared:
+            return
+        with self._pending_lock:
+            for row in rows:
+                key = (table, row[0])
+                count = self._pending.get(key, 0) + delta
+                if count:
+                    self._pending[key] = count
+                else:
+                    del self._pending[key]
+    
+    # Whether a write of this row from this process is still queued
+    def has_pending(self, table: str, key) -> bool:
+        return (table, key) in self._pending
+    
+    def lease_ids(self, name: str, floor: int, count: int) -> range:
+        if not self.shared:
+            return super().lease_ids(name, floor, count)
+        with self._reader_lock, self._reader:
+            self._reader.execute("INSERT OR IGNORE INTO counters VALUES (?, ?)", (name, floor))
+            end = self._reader.execute("UPDATE counters SET value = max(value, ?) + ? WHERE name = ? RETURNING value",
+                                       (floor, count, name)).fetchall()[0][0]
+        return range(end - count, end)
+    
+    # Committed right away rather than queued: the answer decides whether this worker may link
+    def claim_link(self, task_id: int, jira_id: str) -> bool:
+        if not self.shared:
+            return True
+        with self._reader_lock, self._reader:
+            claimed = self._reader.execute("INSERT OR IGNORE INTO jira_links VALUES (?, ?)", (task_id, jira_id)).rowcount
+        return claimed == 1
+    
+    def release_ids(self, name: str, next_id: int, end: int):
+        if self.shared and next_id < end:
+            with self._reader_lock, self._reader:
+                self._reader.execute("UPDATE counters SET value = ? WHERE name = ? AND value = ?", (next_id, name, end))
+    
+    # PRAGMA data_version moves whenever another connection (any process, or this one's writer) commits
+    def changed(self) -> bool:
+        if not self.shared:
+            return False
+        with self._reader_lock:
+            version = self._reader.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+    
+    # Rows committed since the last call, read in one snapshot so tickets never arrive before their
+    # tasks. Rows this process still has queued are held back, since its own write usually commits
+    # later and wins. But the writer untracks a batch only after committing it, so that write may
+    # already be in the file and be the older one. Held-back rows are therefore read again, in
+    # seq order, on the next call.
+    def load_changes(self):
+        with self._reader_lock:
+            seen = self._seen_seq
+            self._reader.execute("BEGIN")
+            try:
+                tasks = self._reader.execute(f"SELECT {', '.join(TASK_COLUMNS)}, seq FROM tasks WHERE seq > ? ORDER BY seq",
+                                             (seen,)).fetchall()
+                tickets = self._reader.execute(f"SELECT {', '.join(JIRA_COLUMNS)}, seq FROM jira_tickets WHERE seq > ? ORDER BY seq",
+                                               (seen,)).fetchall()
+            finally:
+                self._reader.commit()
+            held = {("tasks", row[0]): row[-1] for row in tasks if self.has_pending("tasks", row[0])}
+            held.update({("jira_tickets", row[0]): row[-1] for row in tickets if self.has_pending("jira_tickets", row[0])})
+            if held:
+                self._seen_seq = min(held.values()) - 1
+                # Read again even if nothing else commits meanwhile
+                self._data_version = None
+            else:
+                self._seen_seq = max([seen] + [row[-1] for row in tasks[-1:] + tickets[-1:]])
+        return ([row[:-1] for row in tasks if ("tasks", row[0]) not in held],
+                [row[:-1] for row in tickets if ("jira_tickets", row[0]) not in held])
+    
+    # Waits until everything queued so far is committed
+    def flush(self):
+        done = concurrent.futures.Future()
+        self._queue.put(("flush", done))
+        done.result()
+    
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(("close", None))
+            self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._close_error is not None:
+            raise self._close_error
+    
+    def _write_loop(self):
+        conn = self._connect()
+        statements = {
+            "tasks": f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_COLUMNS)}, seq) VALUES ({', '.join('?' * (len(TASK_COLUMNS) + 1))})",
+            "jira_tickets": f"INSERT OR REPLACE INTO jira_tickets ({', '.join(JIRA_COLUMNS)}, seq) VALUES ({', '.join('?' * (len(JIRA_COLUMNS) + 1))})",
+            "counters": "INSERT OR REPLACE INTO counters VALUES (?, ?)"
+        }
+        stamped = ("tasks", "jira_tickets")
+        rows = {table: [] for table in statements}
+        running = True
+        failures = 0
+        while running:
+            # After a failed commit, wait out the backoff, taking in whatever is queued meanwhile
+            if failures:
+                try:
+                    batch = [self._queue.get(timeout=min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay))]
+                except queue.Empty:
+                    batch = []
+            else:
+                batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while batch and len(batch) < self.batch_size and batch[-1][0] not in ("flush", "close"):
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            
+            waiters = []
+            for kind, payload in batch:
+                if kind in rows:
+                    rows[kind].append(payload)
+                elif kind == "tasks_many":
+                    rows["tasks"].extend(payload)
+                elif kind == "flush":
+                    waiters.append(payload)
+                else:
+                    running = False
+            
+            count = sum(map(len, rows.values()))
+            try:
+                with conn:
+                    # Taking the next change_seq also takes the write lock, so seqs commit in order
+                    if any(rows[table] for table in stamped):
+                        seq = conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'change_seq' RETURNING value").fetchall()[0][0]
+                    for table, table_rows in rows.items():
+                        if table_rows:
+                            conn.executemany(statements[table], [row + (seq,) for row in table_rows] if table in stamped else table_rows)
+            except sqlite3.Error as e:
+                self.failed_commits += 1
+                self.last_error = str(e)
+                if not failures:
+                    print(f"❌ Task backend write failed ({count} rows kept for retry): {e}")
+                failures += 1
+                error = TaskBackendError(f"{count} rows not written to {self.path}: {e}")
+                for waiter in waiters:
+                    waiter.set_exception(error)
+                # Closing: keep trying for a while, then report what is lost
+                if not running and failures < self.close_retries:
+                    running = True
+                    self._queue.put(("close", None))
+                elif not running:
+                    self._close_error = error
+                    print(f"❌ Task backend closed with {count} unwritten rows")
+                continue
+            
+            if failures:
+                print(f"✅ Task backend write recovered after {failures} failed attempts")
+                failures = 0
+            for table in stamped:
+                self._track(table, rows[table], -1)
+            rows = {table: [] for table in statements}
+            for waiter in waiters:
+                waiter.set_result(None)
+        conn.close()
+
+def open_task_backend(path: str = None, shared: bool = False) -> TaskBackend:
+    if not path:
+        return TaskBackend()
+    print(f"💾 Task storage: SQLite ({path}{', shared between processes' if shared else ''})")
+    return SQLiteTaskBackend(path, shared=shared)
+
+# ==============================================================================
+# TASK AND JIRA DATA STORAGE
+# ==============================================================================
+
+# Hands out ids from blocks leased from the backend. With a shared backend a worker leases
+# block_size ids in one transaction and then numbers tasks on its own until the block runs out.
+# Caller serializes take().
+class IdBlocks:
+    def __init__(self, backend: TaskBackend, name: str, start: int, block_size: int = 1):
+        self.backend = backend
+        self.name = name
+        self.block_size = block_size
+        self.next = start
+        self.end = start
+    
+    def take(self, count: int = 1) -> List[int]:
+        ids = list(range(self.next, min(self.next + count, self.end)))
+        self.next += len(ids)
+        if len(ids) < count:
+            lease = self.backend.lease_ids(self.name, self.next, max(count - len(ids), self.block_size))
+            self.end = lease.stop
+            self.next = lease.start + count - len(ids)
+            ids.extend(range(lease.start, self.next))
+        return ids
+    
+    def release(self):
+        self.backend.release_ids(self.name, self.next, self.end)
+        self.end = self.next
+
+class TaskStore:
+    # status/priority/has_jira are low-cardinality, so they share one composite index:
+    # any filter on them is a union of at most 18 buckets that contain only matches
+    COMPOSITE_FIELDS = ("status", "priority", "has_jira")
+    INDEXED_FIELDS = ("epic", "assignee")
+    SORT_KEYS = ("id", "newest", "priority", "status")
+    PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+    STATUS_RANK = {"progress": 0, "todo": 1, "done": 2}
+    SORT_RANKS = {"priority": PRIORITY_RANK, "status": STATUS_RANK}
+    LOCK_STRIPES = 64
+    # Ids leased per round trip when the backend is shared between processes
+    TASK_ID_BLOCK = 1000
+    JIRA_ID_BLOCK = 100
+    # Change events kept for live viewers; a viewer further behind re-renders its page in full
+    FEED_SIZE = 4096
+    
+    # Concurrency: Gradio worker threads, the MCP loop and Jira sync all write here.
+    # - ids come from IdBlocks under a tiny append lock (which also keeps self.tasks in id order)
+    # - a task's read-modify-write runs under its stripe lock, so different tasks never contend
+    # - each index has its own lock; index locks are never nested
+    # - readers take no locks and work on list()/set() snapshots; rank-ordered pages hold the
+    #   composite lock only while slicing
+    def __init__(self, backend: TaskBackend = None, row_cache_size: int = 10000):
+        self.backend = backend or TaskBackend()
+        self.tasks = []
+        self.tasks_by_id = {}
+        self.tasks_by_jira_id = {}
+        self.jira_tickets = []
+        self.jira_tickets_by_id = {}
+        # Composite and rank buckets are SortedLists of ids, so filtered and rank-ordered
+        # reads walk them in id order instead of sorting every match
+        self.composite_index = {}
+        self.rank_index = {sort_key: {} for sort_key in self.SORT_RANKS}
+        self.indexes = {field: {} for field in self.INDEXED_FIELDS}
+        self.search_index = TaskSearchIndex()
+        # Changes on every mutation; rendered pages are cached against it
+        self.version = 0
+        self.row_cache_size = row_cache_size
+        self._row_cache = OrderedDict()
+        self._page_cache = (None, None, ())
+        self._append_lock = threading.Lock()
+        self._jira_lock = threading.Lock()
+        self._row_cache_lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._index_locks = {field: threading.Lock() for field in ("composite",) + self.INDEXED_FIELDS}
+        self._versions = itertools.count(1)
+        self._feed = deque(maxlen=self.FEED_SIZE)
+        self._feed_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._load()
+    
+    @property
+    def task_counter(self) -> int:
+        return self._task_ids.next
+    
+    @property
+    def jira_counter(self) -> int:
+        return self._jira_ids.next
+    
+    def _lock_for(self, task_id: int) -> threading.Lock:
+        return self._stripes[task_id % self.LOCK_STRIPES]
+    
+    # Every mutation lands here: kind is "added" or "changed", ids the tasks it touched
+    def _bump_version(self, kind: str = "changed", ids=()):
+        with self._feed_lock:
+            version = next(self._versions)
+            self._feed.append((version, kind, ids))
+            self.version = version
+    
+    def _load(self):
+        started = time.perf_counter()
+        tasks, tickets, counters = self.backend.load()
+        for row in tasks:
+            task = Task(*row)
+            self.tasks.append(task)
+            self.tasks_by_id[task.id] = task
+        self._index_loaded(self.tasks)
+        self.search_index.add_many([(task.id, self.search_index.tokens(task)) for task in self.tasks])
+        for row in tickets:
+            ticket = JiraTicket.from_row(row, self.tasks_by_id)
+            self.jira_tickets.append(ticket)
+            self.jira_tickets_by_id[ticket.id] = ticket
+        
+        # Task ids continue after the highest stored id; the Jira counter is persisted
+        # separately since ticket keys can't be re-derived once tickets come from Jira
+        last_task_id = self.tasks[-1].id if self.tasks else 0
+        shared = self.backend.shared
+        self._task_ids = IdBlocks(self.backend, "task_counter", max(counters.get("task_counter", 1), last_task_id + 1),
+                                  self.TASK_ID_BLOCK if shared else 1)
+        self._jira_ids = IdBlocks(self.backend, "jira_counter", max(counters.get("jira_counter", 100), 100 + len(self.jira_tickets)),
+                                  self.JIRA_ID_BLOCK if shared else 1)
+        if self.tasks or self.jira_tickets:
+            print(f"💾 Loaded {len(self.tasks)} tasks and {len(self.jira_tickets)} Jira tickets in {time.perf_counter() - started:.2f}s")
+    
+    def _composite_key(self, task: Task) -> tuple:
+        return (task.status, task.priority, task.jira_id is not None)
+    
+    # Values outside the rank table share one bucket, ordered after every ranked one
+    def _rank_key(self, sort_key: str, task: Task):
+        value = getattr(task, sort_key)
+        return value if value in self.SORT_RANKS[sort_key] else None
+    
+    def _index(self, task: Task):
+        with self._index_locks["composite"]:
+            self.composite_index.setdefault(self._composite_key(task), SortedList()).add(task.id)
+            for sort_key, buckets in self.rank_index.items():
+                buckets.setdefault(self._rank_key(sort_key, task), SortedList()).add(task.id)
+        for field in self.INDEXED_FIELDS:
+            value = getattr(task, field)
+            if value is not None:
+                with self._index_locks[field]:
+                    self.indexes[field].setdefault(value, set()).add(task.id)
+        if task.jira_id:
+            self.tasks_by_jira_id[task.jira_id] = task
+    
+    # _index for a whole store at once, before anyone else can see it: tasks come in id order,
+    # so each bucket is collected already sorted and turned into a SortedList in one piece
+    def _index_loaded(self, tasks: List[Task]):
+        composite = {}
+        ranks = [(sort_key, self.SORT_RANKS[sort_key], {}) for sort_key in self.rank_index]
+        fields = [(field, {}) for field in self.INDEXED_FIELDS]
+        for task in tasks:
+            task_id = task.id
+            composite.setdefault(self._composite_key(task), []).append(task_id)
+            for sort_key, ranked, buckets in ranks:
+                value = getattr(task, sort_key)
+                buckets.setdefault(value if value in ranked else None, []).append(task_id)
+            for field, buckets in fields:
+                value = getattr(task, field)
+                if value is not None:
+                    buckets.setdefault(value, set()).add(task_id)
+            if task.jira_id:
+                self.tasks_by_jira_id[task.jira_id] = task
+        
+        def sorted_list(ids: list) -> SortedList:
+            ids.sort()
+            return SortedList.from_sorted(ids)
+        
+        self.composite_index = {key: sorted_list(ids) for key, ids in composite.items()}
+        self.rank_index = {sort_key: {key: sorted_list(ids) for key, ids in buckets.items()} for sort_key, _, buckets in ranks}
+        self.indexes = dict(fields)
+    
+    # A task is published before it is indexed, so an update can unindex it first and the
+    # late _index then finds it indexed already; both must tolerate that, as sets do
+    def _unindex(self, task: Task):
+        key = self._composite_key(task)
+        with self._index_locks["composite"]:
+            bucket = self.composite_index.get(key)
+            if bucket is not None:
+                bucket.remove(task.id)
+                if not bucket:
+                    del self.composite_index[key]
+            for sort_key, buckets in self.rank_index.items():
+                rank_key = self._rank_key(sort_key, task)
+                bucket = buckets.get(rank_key)
+                if bucket is not None:
+                    bucket.remove(task.id)
+                    if not bucket:
+                        del buckets[rank_key]
+        for field in self.INDEXED_FIELDS:
+            value = getattr(task, field)
+            if value is None:
+                continue
+            with self._index_locks[field]:
+                bucket = self.indexes[field].get(value)
+                if bucket is not None:
+                    bucket.discard(task.id)
+                    if not bucket:
+                        del self.indexes[field][value]
+        if task.jira_id:
+            self.tasks_by_jira_id.pop(task.jira_id, None)
+    
+    @traced("task_store.add_task")
+    def add_task(self, title: str, priority: str, status: str = "todo", estimate: int = None):
+        task = Task(None, title, priority, status, time.time(), estimate=estimate)
+        # Nobody else can reach the task until it is in tasks_by_id, so only this append is serialized
+        with self._append_lock:
+            task.id = self._task_ids.take()[0]
+            self._publish([task])
+        with self._lock_for(task.id):
+            self._index(task)
+            self.search_index.add(task.id, self.search_index.terms(task))
+            self.backend.save_task(task)
+        self._bump_version("added", (task.id,))
+        return task
+    
+    # Bulk insert for imports: one append-lock round, one backend write and one version bump
+    # per batch. rows are mappings with a title and optional priority/status/epic/assignee.
+    @traced("task_store.add_tasks")
+    def add_tasks(self, rows) -> List[Task]:
+        now = time.time()
+        tasks = [
+            Task(None, row["title"], row.get("priority") or "medium", row.get("status") or "todo", now,
+                 epic=row.get("epic") or None, assignee=row.get("assignee") or None)
+            for row in rows
+        ]
+        if not tasks:
+            return tasks
+        terms = [self.search_index.terms(task) for task in tasks]
+        # Saved and made searchable before they are published, so no update can reach the
+        # backend or the search index ahead of the insert
+        with self._append_lock:
+            for task, task_id in zip(tasks, self._task_ids.take(len(tasks))):
+                task.id = task_id
+            self.backend.save_tasks(tasks)
+            self.search_index.add_many([(task.id, task_terms) for task, task_terms in zip(tasks, terms)])
+            self._publish(tasks)
+        for task in tasks:
+            with self._lock_for(task.id):
+                self._index(task)
+        ids = [task.id for task in tasks]
+        # A leased block is contiguous, so the event usually holds a range rather than every id
+        self._bump_version("added", range(ids[0], ids[-1] + 1) if ids[-1] - ids[0] + 1 == len(ids) else ids)
+        return tasks
+    
+    # Caller holds the append lock; tasks are in id order. Another worker's lease can hand out
+    # higher ids than this one's, so late arrivals are merged in to keep self.tasks in id order
+    # (paging slices it). The merged list replaces the old one in a single assignment.
+    def _publish(self, tasks: List[Task]):
+        if not self.tasks or tasks[0].id > self.tasks[-1].id:
+            self.tasks.extend(tasks)
+        elif len(tasks) == 1:
+            bisect.insort(self.tasks, tasks[0], key=lambda task: task.id)
+        else:
+            self.tasks = list(heapq.merge(self.tasks, tasks, key=lambda task: task.id))
+        self.tasks_by_id.update((task.id, task) for task in tasks)
+    
+    # Shared backends only: applies what other processes committed since the last call. When
+    # nothing changed this costs one PRAGMA; otherwise only the changed rows are read, and a
+    # version bump invalidates the rendered pages.
+    def refresh(self) -> int:
+        if not self.backend.changed():
+            return 0
+        with self._refresh_lock:
+            task_rows, ticket_rows = self.backend.load_changes()
+            applied = 0
+            new_tasks = []
+            for row in task_rows:
+                task = self.tasks_by_id.get(row[0])
+                if task is None:
+                    new_tasks.append(Task(*row))
+                    continue
+                with self._lock_for(task.id):
+                    if task.row() != row:
+                        self._apply_update(task, dict(zip(TASK_COLUMNS[1:], row[1:])), save=False)
+                        applied += 1
+            if new_tasks:
+                new_tasks.sort(key=lambda task: task.id)
+                with self._append_lock:
+                    self.search_index.add_many([(task.id, self.search_index.terms(task)) for task in new_tasks])
+                    self._publish(new_tasks)
+                for task in new_tasks:
+                    with self._lock_for(task.id):
+                        self._index(task)
+            for row in ticket_rows:
+                if row[0] not in self.jira_tickets_by_id:
+                    ticket = JiraTicket.from_row(row, self.tasks_by_id)
+                    with self._jira_lock:
+                        self.jira_tickets.append(ticket)
+                        self.jira_tickets_by_id[ticket.id] = ticket
+                    applied += 1
+            # Updates were announced by _apply_update; new tickets only need the version to move
+            if new_tasks:
+                self._bump_version("added", [task.id for task in new_tasks])
+            elif applied:
+                self._bump_version()
+            return applied + len(new_tasks)
+    
+    # Returns unused leased ids to a shared backend, then closes it
+    def close(self):
+        with self._append_lock:
+            self._task_ids.release()
+        with self._jira_lock:
+            self._jira_ids.release()
+        self.backend.close()
+    
+    def get_task(self, task_id: int):
+        return self.tasks_by_id.get(task_id)
+    
+    def get_task_by_jira_id(self, jira_id: str):
+        return self.tasks_by_jira_id.get(jira_id)
+    
+    def get_jira_ticket(self, jira_id: str):
+        return self.jira_tickets_by_id.get(jira_id)
+    
+    @traced("task_store.update_task")
+    def update_task(self, task_id: int, **changes):
+        task = self.tasks_by_id.get(task_id)
+        if not task:
+            return None
+        invalid = (set(changes) - set(task.FIELDS)) | ({"id"} & set(changes))
+        if invalid:
+            raise ValueError(f"Cannot update task fields: {', '.join(sorted(invalid))}")
+        self.refresh()
+        with self._lock_for(task_id):
+            self._apply_update(task, changes)
+        return task
+    
+    # Caller holds the task's stripe lock; save=False for changes that came from the backend
+    def _apply_update(self, task: Task, changes: dict, save: bool = True):
+        # Status and priority changes don't touch the text index; only searchable fields are re-tokenized
+        searchable = not set(changes).isdisjoint(TaskSearchIndex.FIELDS)
+        old_terms = self.search_index.terms(task) if searchable else None
+        self._unindex(task)
+        task.update(changes)
+        self._index(task)
+        if searchable:
+            self.search_index.reindex(task.id, old_terms, self.search_index.terms(task))
+        if save:
+            self.backend.save_task(task)
+        # Dropping the cached row marks it dirty; only this row is re-rendered
+        if task.id in self._row_cache:
+            with self._row_cache_lock:
+                self._row_cache.pop(task.id, None)
+        self._bump_version("changed", (task.id,))
+    
+    def _check_filters(self, filters: dict):
+        unknown = set(filters) - set(self.COMPOSITE_FIELDS) - set(self.INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown task filter: {', '.join(sorted(unknown))}")
+    
+    # (matching ids in ascending order, how many match). With only status/priority/has_jira
+    # filters the ids are a lazy merge of the matching composite buckets and the total is
+    # their sizes, so callers that take a page never touch the rest. Epic/assignee filters
+    # walk the smallest of their buckets instead.
+    def _match(self, filters: dict) -> tuple:
+        keys = None
+        buckets = []
+        composite = {self.COMPOSITE_FIELDS.index(f): v for f, v in filters.items() if f in self.COMPOSITE_FIELDS}
+        if composite:
+            with self._index_locks["composite"]:
+                keys = {key for key in self.composite_index if all(key[i] == v for i, v in composite.items())}
+                buckets = [self.composite_index[key] for key in keys]
+        fields = [self.indexes[field].get(filters[field], ()) for field in self.INDEXED_FIELDS if field in filters]
+        
+        if not fields:
+            if keys is None:
+                tasks = self.tasks
+                return (task.id for task in tasks), len(tasks)
+            return heapq.merge(*buckets), sum(len(bucket) for bucket in buckets)
+        
+        # Buckets are copied before use, so concurrent writers can't resize them mid-iteration
+        fields.sort(key=len)
+        smallest, rest = set(fields[0]), [set(bucket) for bucket in fields[1:]]
+        tasks_by_id = self.tasks_by_id
+        ids = sorted(
+            i for i in smallest
+            if all(i in bucket for bucket in rest) and (keys is None or self._composite_key(tasks_by_id[i]) in keys)
+        )
+        return iter(ids), len(ids)
+    
+    # e.g. find(priority="high", status="progress", has_jira=False) -> matching tasks in id order
+    @traced("task_store.find")
+    def find(self, limit: int = None, **filters) -> List[Dict[str, Any]]:
+        self._check_filters(filters)
+        self.refresh()
+        ids, _ = self._match(filters)
+        return [self.tasks_by_id[i] for i in itertools.islice(ids, limit)]
+    
+    # e.g. search("checkout bug", status="todo", has_jira=True) -> (best matches, total matches,
+    # whether the total is an estimate)
+    @traced("task_store.search")
+    def search(self, query: str, limit: int = 25, **filters) -> tuple:
+        self._check_filters(filters)
+        self.refresh()
+        if not search_tokens(query):
+            if not filters:
+                return [], 0, False
+            # Filters alone list the first matches in id order; only those become records
+            ids, total = self._match(filters)
+            return [self.tasks_by_id[i] for i in itertools.islice(ids, limit)], total, False
+        
+        # Filters are checked on the text matches only, never by walking the store
+        def accept(task_id: int) -> bool:
+            task = self.tasks_by_id.get(task_id)
+            if task is None:
+                return False
+            for field, value in filters.items():
+                if field == "has_jira":
+                    if (task.jira_id is not None) != value:
+                        return False
+                elif getattr(task, field) != value:
+                    return False
+            return True
+        
+        ids, total, estimated = self.search_index.search(query, limit, accept if filters else None)
+        return [self.tasks_by_id[i] for i in ids], total, estimated
+    
+    def count_by(self, field: str) -> Dict[Any, int]:
+        self.refresh()
+        if field in self.INDEXED_FIELDS:
+            return {value: len(bucket) for value, bucket in list(self.indexes[field].items())}
+        position = self.COMPOSITE_FIELDS.index(field)
+        counts = {}
+        for key, bucket in list(self.composite_index.items()):
+            counts[key[position]] = counts.get(key[position], 0) + len(bucket)
+        return counts
+    
+    def count_by_status_priority(self) -> Dict[tuple, int]:
+        self.refresh()
+        counts = {}
+        for (status, priority, _), bucket in list(self.composite_index.items()):
+            counts[(status, priority)] = counts.get((status, priority), 0) + len(bucket)
+        return counts
+    
+    # jira_id/jira_url come from a real Jira instance; without them a local key is generated
+    @traced("task_store.create_jira_ticket")
+    def create_jira_ticket(self, task_id: int, project: str, assignee: str, epic: str, story_points: str,
+                           jira_id: str = None, jira_url: str = None):
+        self.refresh()
+        task = self.tasks_by_id.get(task_id)
+        if not task:
+            return None
+        
+        with self._lock_for(task_id):
+            # Two racing creators must not both link (and the loser overwrite) the task
+            if task.jira_id:
+                raise ValueError(f"Task {task_id} is already linked to {task.jira_id}")
+            
+            if not jira_id:
+                with self._jira_lock:
+                    number = self._jira_ids.take()[0]
+                    self.backend.save_counter("jira_counter", number + 1)
+                jira_id = f"PROJ-{number}"
+                jira_url = f"https://your-domain.atlassian.net/browse/{jira_id}"
+            # Another process may have linked it since our last refresh
+            if not self.backend.claim_link(task_id, jira_id):
+                raise ValueError(f"Task {task_id} is already linked in another process")
+            
+            jira_ticket = JiraTicket(jira_id, task, project, assignee, epic, story_points, "Created in Jira", time.time(), jira_url)
+            # The ticket fills in the task's epic and assignee, but never replaces ones it already has
+            changes = dict(jira_id=jira_id, jira_url=jira_url)
+            if epic and not task.epic:
+                changes["epic"] = epic
+            if assignee and not task.assignee:
+                changes["assignee"] = assignee
+            self._apply_update(task, changes)
+            self.jira_tickets.append(jira_ticket)
+            self.jira_tickets_by_id[jira_id] = jira_ticket
+            self.backend.save_jira_ticket(jira_ticket)
+        
+        return jira_ticket
+    
+    # Rows are cached with the fields they were rendered from, so a row rendered
+    # while a writer was mid-update is recognised as stale instead of sticking around
+    def _render_row(self, task: Task) -> str:
+        fields = (task.title, task.priority, task.status, task.created, task.jira_id, task.estimate)
+        with self._row_cache_lock:
+            cached = self._row_cache.get(task.id)
+            if cached is not None and cached[0] == fields:
+                self._row_cache.move_to_end(task.id)
+                return cached[1]
+        title, priority, status, created, jira_id, estimate = fields
+        
+        priority_emoji = "🔴" if priority == "high" else "🟡" if priority == "medium" else "🟢"
+        status_emoji = "✅" if status == "done" else "🔄" if status == "progress" else "📋"
+        
+        jira_info = ""
+        if jira_id:
+            jira_info = f"\n   🔗 **Jira:** {jira_id}"
+        estimate_info = f"\n   ⚡ Estimate: {estimate} story points" if estimate is not None else ""
+        
+        row = f"""**{task.id}.** {status_emoji} **{title}**
+   {priority_emoji} Priority: {priority.upper()}
+   📅 Created: {format_epoch(created)}
+   🏷️ Status: {status.upper()}{estimate_info}{jira_info}
+
+---
+"""
+        with self._row_cache_lock:
+            self._row_cache[task.id] = (fields, row)
+            if len(self._row_cache) > self.row_cache_size:
+                self._row_cache.popitem(last=False)
+        return row
+    
+    def _page_ids(self, start: int, end: int, sort_key: str) -> List[int]:
+        if sort_key == "id":
+            return [task.id for task in self.tasks[start:end]]
+        if sort_key == "newest":
+            total = len(self.tasks)
+            return [task.id for task in reversed(self.tasks[max(total - end, 0):total - start])]
+        
+        # Rank orders walk the id-ordered bucket of each rank in turn, skipping whole buckets
+        # (and whole blocks within one), so a page costs the same whatever changed before it
+        ranks = self.SORT_RANKS[sort_key]
+        buckets = self.rank_index[sort_key]
+        ids = []
+        with self._index_locks["composite"]:
+            for rank_key in sorted(ranks, key=ranks.get) + [None]:
+                bucket = buckets.get(rank_key)
+                if bucket is None:
+                    continue
+                ids.extend(bucket.slice(start, end))
+                start = max(start - len(bucket), 0)
+                end -= len(bucket)
+                if end <= 0:
+                    break
+        return ids
+    
+    def _clamp_view(self, page: int, page_size: int, sort_key: str) -> tuple:
+        page_size = max(5, min(int(page_size or 25), 100))
+        pages = (len(self.tasks) + page_size - 1) // page_size
+        return max(1, min(int(page or 1), pages)), page_size, sort_key if sort_key in self.SORT_KEYS else "id"
+    
+    def _view_ids(self, page: int, page_size: int, sort_key: str) -> tuple:
+        start = (page - 1) * page_size
+        return tuple(self._page_ids(start, min(start + page_size, len(self.tasks)), sort_key))
+    
+    # Returns (version, markdown, ids shown); the page and its ids are cached together
+    @traced("task_store.get_tasks_page")
+    def get_tasks_page(self, page: int = 1, page_size: int = 25, sort_key: str = "id") -> tuple:
+        self.refresh()
+        # Read the version before the data, so a page is never cached under a newer version than it shows
+        version = self.version
+        if not self.tasks:
+            return version, "No tasks created yet. Add your first task above!", ()
+        
+        page, page_size, sort_key = self._clamp_view(page, page_size, sort_key)
+        cache_key = (version, page, page_size, sort_key)
+        cached_key, cached_display, cached_ids = self._page_cache
+        if cached_key == cache_key:
+            return version, cached_display, cached_ids
+        
+        # Totals live in the status line (get_live_display), so adds elsewhere in the list
+        # don't make this page stale
+        ids = self._view_ids(page, page_size, sort_key)
+        start = (page - 1) * page_size
+        rows = [self._render_row(self.tasks_by_id[i]) for i in ids]
+        display = f"📋 **CURRENT TASKS:** {start + 1}–{start + len(ids)} · page {page} · sorted by {sort_key}\n\n" + "".join(rows)
+        
+        self._page_cache = (cache_key, display, ids)
+        return version, display, ids
+    
+    def get_tasks_display(self, page: int = 1, page_size: int = 25, sort_key: str = "id") -> str:
+        return self.get_tasks_page(page, page_size, sort_key)[1]
+    
+    # Change feed: (current version, {task_id: "added" | "changed"}) for everything after
+    # `version`. Walks back only over the new events. None instead of the dict means the
+    # feed no longer reaches that far, or more than max_ids tasks changed: render in full.
+    def changes_since(self, version: int, max_ids: int = 1000) -> tuple:
+        self.refresh()
+        current = self.version
+        if version >= current:
+            return current, {}
+        events = []
+        with self._feed_lock:
+            current = self.version
+            if not self._feed or self._feed[0][0] > version + 1:
+                return current, None
+            for event in reversed(self._feed):
+                if event[0] <= version:
+                    break
+                events.append(event)
+        
+        changes = {}
+        for _, kind, ids in reversed(events):
+            if len(changes) + len(ids) > max_ids:
+                return current, None
+            for task_id in ids:
+                changes[task_id] = "added" if kind == "added" or changes.get(task_id) == "added" else "changed"
+        return current, changes
+    
+    # Whether a page showing `ids` looks different after `changes`: one of its rows changed,
+    # or the page now holds other tasks. Only the ids are compared, nothing is rendered.
+    def page_affected(self, changes: Dict[int, str], ids: tuple, page: int, page_size: int, sort_key: str) -> bool:
+        if not changes:
+            return False
+        if not changes.keys().isdisjoint(ids):
+            return True
+        return self._view_ids(*self._clamp_view(page, page_size, sort_key)) != ids
+    
+    # One status line per viewer: totals plus the rows that changed since it last looked
+    def get_live_display(self, changes: Dict[int, str] = None, limit: int = 5) -> str:
+        total = len(self.tasks)
+        line = f"🟢 **Live** · {total} tasks · {len(self.jira_tickets)} linked to Jira"
+        if not changes:
+            return line
+        
+        line += f" · updated {time.strftime('%H:%M:%S')}"
+        shown = []
+        for task_id, kind in itertools.islice(sorted(changes.items(), reverse=True), limit):
+            task = self.tasks_by_id.get(task_id)
+            if task is not None:
+                shown.append(f"{'🆕' if kind == 'added' else '✏️'} #{task.id} {task.title}")
+        more = f" · … +{len(changes) - len(shown)} more" if len(changes) > len(shown) else ""
+        return line + "\n\n" + " · ".join(shown) + more
+    
+    def get_search_display(self, query: str, limit: int = 25, **filters) -> str:
+        if not search_tokens(query) and not filters:
+            return "Type a title, epic, assignee or Jira key to search."
+        
+        started = time.perf_counter()
+        tasks, total, estimated = self.search(query, limit, **filters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if not tasks:
+            return f"🔎 No tasks match **{query.strip() or 'these filters'}** ({elapsed_ms:.2f} ms)"
+        
+        shown = f"top {len(tasks)} of {'~' if estimated else ''}{total}" if total > len(tasks) else f"{total}"
+        return f"🔎 **{shown} matches** ({elapsed_ms:.2f} ms)\n\n" + "".join(self._render_row(task) for task in tasks)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("PRODUCTMIND_DB", None)
+os.environ.setdefault("PRODUCTMIND_AGENT_LATENCY", "0")
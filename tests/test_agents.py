@@ -0,0 +1,76 @@
+import asyncio
+import re
+import threading
+import time
+
+import backends
+import dashboard
+
+# Answers "<n>. High 5" for every numbered title in the prompt except the ones it is told to skip
+class ScriptedBackend(backends.AgentBackend):
+    name = "scripted"
+
+    def __init__(self, max_tokens, skip=()):
+        self.max_tokens = max_tokens
+        self.skip = list(skip)
+        self.prompts = []
+
+    async def generate(self, agent, prompt: str) -> str:
+        self.prompts.append(prompt)
+        titles = re.findall(r"^(\d+)\. (Task \d+)$", prompt, re.MULTILINE)
+        skip = self.skip.pop(0) if self.skip else set()
+        return "\n".join(f"{number}. High 5" for number, title in titles if title not in skip)
+
+def task_agent(backend):
+    agent = dashboard.TaskAgent()
+    agent.backend = backend
+    return agent
+
+def test_batch_is_split_to_fit_the_reply_budget():
+    backend = ScriptedBackend(max_tokens=10 * dashboard.TaskAgent.REPLY_TOKENS_PER_TASK)
+    titles = [f"Task {i}" for i in range(95)]
+
+    results = asyncio.run(task_agent(backend).process_batch(titles))
+
+    assert len(backend.prompts) == 10
+    assert [result["effort"] for result in results] == [5] * 95
+
+def test_titles_missing_from_a_reply_are_asked_for_again():
+    backend = ScriptedBackend(max_tokens=1024, skip=[{"Task 3", "Task 7"}])
+    titles = [f"Task {i}" for i in range(20)]
+
+    results = asyncio.run(task_agent(backend).process_batch(titles))
+
+    assert len(backend.prompts) == 2
+    assert "1. Task 3\n2. Task 7" in backend.prompts[1]
+    assert all(result["priority"] == "high" and result["effort"] == 5 for result in results)
+
+def test_unanswered_titles_get_no_made_up_estimate():
+    backend = ScriptedBackend(max_tokens=1024, skip=[{"Task 1"}, {"Task 1"}])
+    titles = [f"Task {i}" for i in range(5)]
+
+    results = asyncio.run(task_agent(backend).process_batch(titles))
+
+    assert results[1]["effort"] is None and results[1]["priority"] is None
+    assert [result["effort"] for result in results if result["task"] != "Task 1"] == [5] * 4
+
+def test_background_estimates_are_stored_off_the_mcp_loop(monkeypatch):
+    store = dashboard.open_task_store()
+    tasks = [store.add_task(f"Task {i}", "medium") for i in range(3)]
+    writers = []
+    update_task = store.update_task
+
+    def recording_update(task_id, **changes):
+        writers.append(threading.current_thread().name)
+        return update_task(task_id, **changes)
+
+    monkeypatch.setattr(store, "update_task", recording_update)
+    queue = dashboard.TaskAnalysisQueue()
+    queue.enqueue(task.id for task in tasks)
+    deadline = time.monotonic() + 10
+    while queue.completed + queue.unanswered + queue.failed < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert queue.completed == 3
+    assert len(writers) == 3 and dashboard.mcp_loop.name not in writers
+    assert all(store.get_task(task.id).estimate is not None for task in tasks)
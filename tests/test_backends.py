@@ -0,0 +1,85 @@
+import asyncio
+import http.server
+import json
+import threading
+import time
+
+import pytest
+
+import backends
+
+# Answers each POST with the next scripted (status, body, headers) reply
+class ScriptedHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, body, headers = self.server.replies.pop(0)
+        self.server.times.append(time.monotonic())
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class Agent:
+    name = "Test Agent"
+
+    def system_prompt(self) -> str:
+        return "You are a test agent."
+
+def answer(content: str) -> tuple:
+    return 200, {"choices": [{"message": {"content": content}}], "usage": {"prompt_tokens": 5, "completion_tokens": 2}}, {}
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.daemon_threads = True
+    server.replies = []
+    server.times = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def generate(server, **options):
+    backend = backends.HTTPModelBackend(f"http://127.0.0.1:{server.server_port}/v1", "stand-in", max_concurrency=1,
+                                       **options)
+
+    async def run():
+        try:
+            return await backend.generate(Agent(), "Hello")
+        finally:
+            await backend.close()
+
+    return backend, asyncio.run(run())
+
+def test_malformed_answers_are_retried(server):
+    server.replies = [(200, b"<html>proxy error</html>", {}), (200, {"error": "overloaded"}, {}), answer("Hi there")]
+
+    backend, content = generate(server, backoff=0.01)
+
+    assert content == "Hi there"
+    assert (backend.requests, backend.retries, backend.errors) == (3, 2, 0)
+    assert backend.prompt_tokens == 5
+
+def test_a_request_that_never_gets_a_reply_counts_as_an_error(server):
+    server.replies = [(200, {"choices": []}, {})] * 3
+
+    with pytest.raises(backends.AgentBackendError, match="malformed response"):
+        generate(server, backoff=0.01, max_retries=2)
+
+def test_retry_after_replaces_the_backoff_instead_of_adding_to_it(server):
+    server.replies = [(429, {"error": "slow down"}, {"Retry-After": "1"}), answer("Done")]
+
+    backend, content = generate(server, backoff=0.3)
+
+    waited = server.times[1] - server.times[0]
+    assert content == "Done"
+    assert 1.0 <= waited < 1.25
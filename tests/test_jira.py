@@ -0,0 +1,134 @@
+import asyncio
+import http.server
+import json
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+import dashboard
+
+def test_parse_task_ids_expands_ranges_and_drops_duplicates():
+    assert dashboard.parse_task_ids("1-3, 2; 7") == [1, 2, 3, 7]
+
+def test_huge_range_is_rejected_before_it_is_expanded():
+    started = time.perf_counter()
+    with pytest.raises(dashboard.JiraError, match="Too many task IDs"):
+        dashboard.parse_task_ids("1-30000000")
+    assert time.perf_counter() - started < 0.1
+
+def test_many_parts_add_up_to_the_limit():
+    with pytest.raises(dashboard.JiraError, match="Too many task IDs"):
+        dashboard.parse_task_ids("1-3000, 5001-7001", max_ids=5000)
+
+@pytest.mark.parametrize("text", ["0", "0-5", "-3", "5--3"])
+def test_zero_and_negative_ids_are_rejected(text):
+    with pytest.raises(dashboard.JiraError):
+        dashboard.parse_task_ids(text)
+
+# A stand-in for the Jira REST API, like benchmarks.model_backend's model stub. Each POST
+# first pops the next scripted outcome: "502" creates the issue but answers 502 (a gateway
+# timing out after Jira applied it), "429" answers Too Many Requests without creating, and
+# a callable runs before the issue is created.
+class JiraStubHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        label = query["jql"][0].split('"')[1]
+        self._reply(200, {"issues": [{"key": key} for key, issue in self.server.issues.items() if label in issue["labels"]]})
+
+    def do_POST(self):
+        fields = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["fields"]
+        self.server.posts.append(time.monotonic())
+        outcome = self.server.script.pop(0) if self.server.script else None
+        if outcome == "429":
+            self._reply(429, {"errorMessages": ["rate limited"]}, {"Retry-After": "1"})
+            return
+        if callable(outcome):
+            outcome()
+        key = f"PM-{len(self.server.issues) + 1}"
+        self.server.issues[key] = {"labels": fields["labels"], "comments": []}
+        if outcome == "502":
+            self._reply(502, {"errorMessages": ["Bad gateway"]})
+            return
+        self._reply(201, {"key": key})
+
+    def do_PUT(self):
+        update = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["update"]
+        issue = self.server.issues[self.path.rsplit("/", 1)[1]]
+        for change in update["labels"]:
+            if "remove" in change:
+                issue["labels"].remove(change["remove"])
+            else:
+                issue["labels"].append(change["add"])
+        issue["comments"] += [comment["add"]["body"] for comment in update["comment"]]
+        self._reply(204, None)
+
+    def _reply(self, status: int, payload, headers: dict = None):
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def jira(monkeypatch):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), JiraStubHandler)
+    server.daemon_threads = True
+    server.issues = {}
+    server.posts = []
+    server.script = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(dashboard, "jira_client", dashboard.JiraClient(f"http://127.0.0.1:{server.server_port}", backoff=0.3))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def sync(task_ids: list) -> list:
+    async def run():
+        try:
+            return await dashboard.sync_jira_tickets(task_ids, "PRODUCTMIND (PM)", "alice", "Q1", "3")
+        finally:
+            await dashboard.jira_client.close()
+
+    return asyncio.run(run())
+
+def test_create_applied_behind_a_502_is_found_by_label_instead_of_repeated(jira):
+    store = dashboard.open_task_store()
+    store.add_task("Login page", "high")
+    jira.script = ["502"]
+
+    [(task_id, ok, ticket)] = sync([1])
+
+    assert ok and ticket["id"] == "PM-1"
+    assert list(jira.issues) == ["PM-1"]
+    assert store.get_task(1)["jira_id"] == "PM-1"
+
+def test_retry_after_is_honoured_before_creating_again(jira):
+    store = dashboard.open_task_store()
+    store.add_task("Login page", "high")
+    jira.script = ["429"]
+
+    [(_, ok, ticket)] = sync([1])
+
+    assert ok and list(jira.issues) == ["PM-1"]
+    assert 1.0 <= jira.posts[1] - jira.posts[0] < 1.25
+
+def test_issue_for_a_task_linked_meanwhile_is_marked_as_a_duplicate(jira):
+    store = dashboard.open_task_store()
+    store.add_task("Login page", "high")
+    # Another dashboard links the task while our issue is being created
+    jira.script = [lambda: store.create_jira_ticket(1, "PRODUCTMIND (PM)", "bob", "Q1", "3", jira_id="PM-7")]
+
+    [(_, ok, message)] = sync([1])
+
+    assert ok and message == "already linked to PM-7"
+    assert store.get_task(1)["jira_id"] == "PM-7"
+    assert jira.issues["PM-1"]["labels"] == ["productmind-duplicate"]
+    assert jira.issues["PM-1"]["comments"] == ["Duplicate: the task is already linked to PM-7"]
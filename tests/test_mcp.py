@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import time
+
+import dashboard
+import mcp_rpc
+
+def test_cache_key_ignores_whitespace_but_not_case():
+    key = mcp_rpc.tool_call_key("generate_roadmap", {"product_name": "ACME Widgets"})
+    assert mcp_rpc.tool_call_key("generate_roadmap", {"product_name": "  ACME   Widgets "}) == key
+    assert mcp_rpc.tool_call_key("generate_roadmap", {"product_name": "acme widgets"}) != key
+
+def test_cached_result_is_not_shared_across_case():
+    async def echo(product_name: str) -> str:
+        return f"Roadmap for {product_name}"
+
+    mcp = mcp_rpc.SimpleMCP()
+    mcp.register_tool("echo_roadmap", echo, cache_ttl=60)
+
+    async def calls():
+        return (await mcp.call_tool("echo_roadmap", product_name="ACME Widgets"),
+                await mcp.call_tool("echo_roadmap", product_name="acme widgets"))
+
+    upper, lower = asyncio.run(calls())
+    assert upper == "Roadmap for ACME Widgets"
+    assert lower == "Roadmap for acme widgets"
+
+def test_closing_a_streamed_brief_cancels_the_slower_agents(monkeypatch):
+    started, cancelled = [], []
+
+    async def fake_call_tool(tool, **arguments):
+        started.append(tool)
+        try:
+            await asyncio.sleep(0 if tool == "generate_roadmap" else 30)
+        except asyncio.CancelledError:
+            cancelled.append(tool)
+            raise
+        return tool
+
+    monkeypatch.setattr(dashboard.mcp, "call_tool", fake_call_tool)
+
+    async def first_section_then_disconnect():
+        stream = dashboard.stream_product_brief_tool(topic="Widgets")
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run cancels leftovers on its own
+        return first, sorted(cancelled)
+
+    first, cancelled_before_exit = asyncio.run(first_section_then_disconnect())
+    assert "generate_roadmap" in first
+    assert cancelled_before_exit == ["analyze_task", "generate_research"]
+
+def test_cancelled_waiter_on_a_shared_call_is_not_an_error():
+    async def slow(topic: str) -> str:
+        await asyncio.sleep(0.05)
+        return f"Report on {topic}"
+
+    mcp = mcp_rpc.SimpleMCP()
+    mcp.register_tool("slow_report", slow)
+
+    async def calls():
+        leaving = asyncio.ensure_future(mcp.call_tool("slow_report", topic="Widgets"))
+        staying = asyncio.ensure_future(mcp.call_tool("slow_report", topic="Widgets"))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(calls()) == "Report on Widgets"
+    stats = mcp.tool_stats["slow_report"]
+    assert (stats.calls, stats.errors, stats.cancelled, stats.coalesced) == (2, 0, 1, 1)
+    assert mcp.get_stats()["total_errors"] == 0
+
+def test_loop_lag_is_sampled_without_the_metrics_server():
+    runtime = dashboard.BackgroundLoop("lag-test")
+    runtime.lag_monitor.interval = 0.01
+    try:
+        # Blocks the loop for 0.1s; the next wake-up is late by about that much
+        runtime.run_sync(asyncio.sleep(0))
+        runtime.loop.call_soon_threadsafe(time.sleep, 0.1)
+        runtime.run_sync(asyncio.sleep(0.05))
+        assert runtime.lag_monitor.max_lag >= 0.05
+    finally:
+        runtime.stop()
+
+def test_stopping_the_loop_leaves_no_pending_tasks():
+    runtime = dashboard.BackgroundLoop("stop-test")
+    loop = runtime.loop
+    runtime.run_sync(asyncio.sleep(0))
+    runtime.stop()
+    assert not loop.is_running()
+    assert not asyncio.all_tasks(loop)
+
+def test_history_stays_small_for_batch_calls():
+    titles = [f"Imported task number {n} with a reasonably long title" for n in range(1000)]
+
+    async def analyze_batch(tasks: list) -> list:
+        return [{"title": title, "analysis": "x" * 500, "effort": 3} for title in tasks]
+
+    mcp = mcp_rpc.SimpleMCP(history_size=50)
+    mcp.register_tool("analyze_batch", analyze_batch, coalesce=False)
+
+    async def calls():
+        for _ in range(60):
+            await mcp.call_tool("analyze_batch", tasks=titles)
+
+    asyncio.run(calls())
+    assert len(mcp.history) == 50
+    entry = mcp.history[-1]
+    assert entry["input"]["tasks"].startswith("(1000 items) [")
+    assert entry["output"].startswith("(1000 items) [")
+    # Roughly the preview per field, not the ~600 KB each payload holds
+    assert sum(len(json.dumps(entry)) for entry in mcp.history) < 50 * 1000
+
+def test_process_pool_marks_its_workers_without_touching_our_environment():
+    executors = mcp_rpc.ToolExecutors(processes=1)
+    try:
+        owner = asyncio.run(executors.run("process", os.getenv, {"key": mcp_rpc.AGENT_POOL_OWNER_ENV}))
+    finally:
+        executors.shutdown()
+
+    assert owner == str(os.getpid())
+    assert mcp_rpc.AGENT_POOL_OWNER_ENV not in os.environ
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+import mcp_rpc
+
+async def echo(text: str) -> str:
+    return f"echo: {text}"
+
+async def count(n: int) -> dict:
+    return {"n": n, "items": list(range(n))}
+
+async def slow(text: str) -> str:
+    await asyncio.sleep(0.2)
+    return text
+
+def make_server() -> mcp_rpc.MCPServer:
+    mcp = mcp_rpc.SimpleMCP()
+    mcp.register_tool("echo", echo)
+    mcp.register_tool("count", count)
+    mcp.register_tool("slow", slow, coalesce=False, max_concurrency=1, max_queue=0)
+    return mcp_rpc.MCPServer(mcp)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# Runs client(port) against a TCP server started on a free port
+def with_tcp_server(client):
+    async def run():
+        port = free_port()
+        serving = asyncio.create_task(make_server().serve_tcp("127.0.0.1", port))
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                break
+            except OSError:
+                await asyncio.sleep(0.01)
+        try:
+            return await client(port)
+        finally:
+            serving.cancel()
+    return asyncio.run(run())
+
+async def exchange(port: int, lines: list) -> list:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        replies = []
+        for line in lines:
+            writer.write(line if isinstance(line, bytes) else mcp_rpc.jsonrpc_line(line))
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        return replies
+    finally:
+        writer.close()
+
+async def http_post(port: int, path: str, body: bytes, method: str = "POST") -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while (line := await reader.readline()).strip():
+            key, _, value = line.decode().partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        data = await reader.readexactly(length)
+        return status, json.loads(data) if data else None
+    finally:
+        writer.close()
+
+def test_tool_calls_round_trip_over_tcp():
+    async def client(port):
+        remote = mcp_rpc.RemoteMCP([f"tcp://127.0.0.1:{port}"])
+        try:
+            return await remote.list_tools(), await remote.call_tool("echo", text="hi"), await remote.call_tool("count", n=3)
+        finally:
+            await remote.close()
+
+    tools, text, result = with_tcp_server(client)
+
+    assert tools == ["echo", "count", "slow"]
+    assert text == "echo: hi"
+    assert result == {"n": 3, "items": [0, 1, 2]}
+
+def test_protocol_errors_get_jsonrpc_error_codes():
+    async def client(port):
+        return await exchange(port, [
+            b"{not json\n",
+            {"id": 1, "method": "ping"},
+            {"jsonrpc": "2.0", "id": 2, "method": "resources/list"},
+            {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "missing"}},
+            {"jsonrpc": "2.0", "id": 4, "method": "tools/call", "params": {"name": "echo", "arguments": {"wrong": 1}}},
+        ])
+
+    replies = with_tcp_server(client)
+
+    assert [reply["id"] for reply in replies[:4]] == [None, 1, 2, 3]
+    assert [reply["error"]["code"] for reply in replies[:4]] == [
+        mcp_rpc.JSONRPC_PARSE_ERROR, mcp_rpc.JSONRPC_INVALID_REQUEST,
+        mcp_rpc.JSONRPC_METHOD_NOT_FOUND, mcp_rpc.JSONRPC_INVALID_PARAMS,
+    ]
+    # A tool that fails is a result flagged isError, not a protocol error
+    assert replies[4]["result"]["isError"] is True
+
+def test_full_tool_answers_server_busy_with_retry_hint():
+    async def client(port):
+        remote = mcp_rpc.RemoteMCP([f"tcp://127.0.0.1:{port}"])
+        try:
+            return await asyncio.gather(remote.call_tool("slow", text="a"), remote.call_tool("slow", text="b"),
+                                        return_exceptions=True)
+        finally:
+            await remote.close()
+
+    results = with_tcp_server(client)
+
+    assert "a" in results
+    busy = [result for result in results if isinstance(result, mcp_rpc.ServerBusyError)]
+    assert len(busy) == 1 and busy[0].retry_after >= 1.0
+
+def test_http_post_carries_one_message_per_request():
+    call = {"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": {"name": "echo", "arguments": {"text": "web"}}}
+
+    async def client(port):
+        return [
+            await http_post(port, "/mcp", json.dumps(call).encode()),
+            await http_post(port, "/mcp", b"{oops"),
+            await http_post(port, "/mcp", json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}).encode()),
+            await http_post(port, "/other", b"{}"),
+            await http_post(port, "/mcp", b"", method="GET"),
+        ]
+
+    (ok, reply), (_, parse_error), (accepted, _), (missing, _), (not_allowed, _) = with_tcp_server(client)
+
+    assert ok == 200 and reply["id"] == 7
+    assert reply["result"]["content"] == [{"type": "text", "text": "echo: web"}]
+    assert parse_error["error"]["code"] == mcp_rpc.JSONRPC_PARSE_ERROR
+    assert (accepted, missing, not_allowed) == (202, 404, 405)
+
+def test_stdio_endpoint_starts_a_dashboard_tool_server(monkeypatch):
+    monkeypatch.setenv("PRODUCTMIND_AGENT_LATENCY", "0")
+
+    async def client():
+        remote = mcp_rpc.RemoteMCP(["stdio"])
+        try:
+            return await remote.list_tools(), await remote.call_tool("generate_roadmap", topic="Widgets")
+        finally:
+            await remote.close()
+
+    tools, roadmap = asyncio.run(client())
+
+    assert "generate_roadmap" in tools
+    assert "Widgets" in roadmap
@@ -0,0 +1,77 @@
+import asyncio
+
+import dashboard
+import mcp_rpc
+
+def snapshot(**overrides) -> dict:
+    histogram = mcp_rpc.LatencyHistogram()
+    for seconds in (0.002, 0.002, 0.3):
+        histogram.record(seconds)
+    tool = {field: 0 for field in ("calls", "errors", "cancelled", "cache_hits", "coalesced", "rejected", "timed_out",
+                                   "model_calls", "prompt_tokens", "completion_tokens", "model_seconds", "active", "waiting")}
+    values = {
+        "mcp": {"tools": {"analyze_task": dict(tool, calls=3, errors=1)},
+                "cache": {"entries": 2, "hits": 5, "misses": 3, "evictions": 0}},
+        "histograms": {"analyze_task": histogram},
+        "tasks": {"by_status_priority": {("todo", "high"): 4, ("done", "low"): 1}},
+        "jira": {"created": 1, "failed": 0, "pending": 0},
+        "model": {"backend": "offline"},
+        "analysis": {"pending": 0, "completed": 5, "failed": 0, "unanswered": 0},
+        "event_loop": {"lag": 0.001, "max_lag": 0.02},
+        "tracing": {"enabled": False}
+    }
+    values.update(overrides)
+    return values
+
+def samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+def test_every_metric_has_help_and_type_before_its_samples():
+    text = dashboard.render_prometheus(snapshot())
+    assert text.endswith("\n")
+
+    declared = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            declared = line.split()[2]
+        elif line.startswith("# TYPE "):
+            name, kind = line.split()[2:]
+            assert name == declared and kind in ("counter", "gauge", "histogram")
+            assert name.endswith("_total") == (kind == "counter")
+        else:
+            assert line.startswith(declared)
+
+def test_samples_carry_labels_and_values():
+    values = samples(dashboard.render_prometheus(snapshot()))
+
+    assert values['productmind_tool_calls_total{tool="analyze_task"}'] == "3"
+    assert values['productmind_tool_errors_total{tool="analyze_task"}'] == "1"
+    assert values["productmind_cache_hits_total"] == "5"
+    assert values['productmind_tasks{status="todo",priority="high"}'] == "4"
+    assert values['productmind_tasks{status="done",priority="low"}'] == "1"
+    assert values["productmind_event_loop_lag_max_seconds"] == "0.020000"
+    # Model and tracing metrics only appear when there is something to report
+    assert not any(name.startswith(("productmind_model_", "productmind_trace_")) for name in values)
+
+def test_latency_histogram_buckets_are_cumulative():
+    values = samples(dashboard.render_prometheus(snapshot()))
+    buckets = [(key, int(count)) for key, count in values.items() if key.startswith("productmind_tool_latency_seconds_bucket")]
+
+    counts = [count for _, count in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == ('productmind_tool_latency_seconds_bucket{tool="analyze_task",le="+Inf"}', 3)
+    assert values['productmind_tool_latency_seconds_count{tool="analyze_task"}'] == "3"
+    assert values['productmind_tool_latency_seconds_sum{tool="analyze_task"}'] == "0.304000"
+
+def test_label_values_are_escaped():
+    tools = {'say "hi"\\\n': dict(snapshot()["mcp"]["tools"]["analyze_task"])}
+    text = dashboard.render_prometheus(snapshot(mcp={"tools": tools, "cache": snapshot()["mcp"]["cache"]}))
+
+    assert 'productmind_tool_calls_total{tool="say \\"hi\\"\\\\\\n"} 3' in text.splitlines()
+
+def test_live_snapshot_renders():
+    asyncio.run(dashboard.mcp.call_tool("analyze_task", task="Write the metrics docs"))
+
+    values = samples(dashboard.render_prometheus())
+
+    assert int(values['productmind_tool_calls_total{tool="analyze_task"}']) >= 1
@@ -0,0 +1,114 @@
+import search
+import storage
+
+def make_store():
+    store = storage.TaskStore()
+    store.add_task("Checkout page crashes on submit", "high", "todo")
+    store.add_task("Checkout button color", "low", "done")
+    store.add_task("Search results pagination", "medium", "progress")
+    store.add_task("Password reset email", "high", "progress")
+    store.add_task("Checkout flow for guests", "medium", "todo")
+    return store
+
+def titles(tasks) -> list:
+    return [task.title for task in tasks]
+
+def test_exact_word_ranks_above_a_longer_word_it_prefixes():
+    store = make_store()
+    store.add_task("Invoices overview", "low", "todo")
+    store.add_task("Invoice export", "low", "todo")
+
+    tasks, total, _ = store.search("invoice")
+
+    assert titles(tasks) == ["Invoice export", "Invoices overview"]
+    assert total == 2
+
+def test_every_query_word_must_match():
+    store = make_store()
+
+    tasks, total, _ = store.search("checkout crash")
+
+    assert titles(tasks) == ["Checkout page crashes on submit"]
+    assert total == 1
+
+def test_prefix_of_the_last_word_matches_while_typing():
+    store = make_store()
+
+    tasks, _, _ = store.search("passw")
+
+    assert titles(tasks) == ["Password reset email"]
+
+def test_typo_matches_only_when_nothing_matches_as_typed():
+    store = make_store()
+
+    assert titles(store.search("pagnation")[0]) == ["Search results pagination"]
+    assert titles(store.search("chekout flow")[0]) == ["Checkout flow for guests"]
+
+def test_filters_apply_to_text_matches():
+    store = make_store()
+
+    tasks, total, _ = store.search("checkout", status="todo")
+
+    assert sorted(titles(tasks)) == ["Checkout flow for guests", "Checkout page crashes on submit"]
+    assert total == 2
+    assert store.search("checkout", status="todo", priority="low") == ([], 0, False)
+
+def test_renamed_task_is_found_under_its_new_title_only():
+    store = make_store()
+    store.update_task(3, title="Infinite scroll for results")
+
+    assert titles(store.search("infinite")[0]) == ["Infinite scroll for results"]
+    assert store.search("pagination") == ([], 0, False)
+
+def test_accept_drops_ids_before_ranking_and_counting():
+    index = search.TaskSearchIndex()
+    for task_id in range(1, 11):
+        index.add(task_id, set(search.search_tokens(f"Release notes {task_id}")))
+
+    ids, total, estimated = index.search("release", limit=3, accept=lambda task_id: task_id % 2 == 0)
+
+    assert ids == [10, 8, 6]
+    assert (total, estimated) == (5, False)
+
+def make_index(count: int):
+    index = search.TaskSearchIndex()
+    words = ("login", "logging", "logs", "billing", "export")
+    index.add_many([(task_id, set(search.search_tokens(f"{words[task_id % 5]} {words[task_id % 3]} task {task_id}")))
+                    for task_id in range(1, count + 1)])
+    return index
+
+# Every match scored and filtered, then ranked: what the early exit must agree with
+def full_ranking(index, query: str, limit: int, accept) -> list:
+    scores = index._scores(sorted((index._expand(word) for word in dict.fromkeys(search.search_tokens(query))),
+                                  key=lambda matches: sum(1 if type(ids) is int else len(ids) for ids, _ in matches)))
+    return index._ranked({task_id: score for task_id, score in scores.items() if accept(task_id)}, limit)
+
+def test_common_word_stops_at_the_limit_and_estimates_the_total():
+    index = make_index(6000)
+    calls = []
+
+    def accept(task_id: int) -> bool:
+        calls.append(task_id)
+        return task_id % 4 != 0
+
+    ids, total, estimated = index.search("task", limit=10, accept=accept)
+
+    assert len(calls) < 20
+    assert ids == full_ranking(index, "task", 10, accept)
+    assert estimated and 4000 <= total <= 5000
+    assert index.search("task", limit=10) == (list(range(6000, 5990, -1)), 6000, False)
+
+def test_early_exit_ranks_like_scoring_every_match():
+    index = make_index(6000)
+    accept = lambda task_id: task_id % 7 != 3
+
+    for query in ("log", "logs", "login billing", "lo exp", "billing", "logging export"):
+        ids, _, _ = index.search(query, limit=30, accept=accept)
+        assert ids == full_ranking(index, query, 30, accept), query
+
+def test_display_marks_an_estimated_total():
+    store = storage.TaskStore()
+    store.add_tasks([dict(title=f"Release notes {n}", status=("todo", "done")[n % 2]) for n in range(2000)])
+
+    assert "top 25 of 2000 matches" in store.get_search_display("release")
+    assert "top 25 of ~" in store.get_search_display("release", status="done")
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_opens_no_store_and_prints_nothing(tmp_path):
+    db = tmp_path / "tasks.db"
+    env = dict(os.environ, PRODUCTMIND_DB=str(db))
+    script = "import threading, dashboard; print(sorted(t.name for t in threading.enumerate()))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout == "['MainThread']\n"
+    assert not db.exists()
+
+def test_store_opens_on_first_use(tmp_path):
+    db = tmp_path / "tasks.db"
+    env = dict(os.environ, PRODUCTMIND_DB=str(db))
+    script = "import dashboard; dashboard.get_task_store().add_task('First', 'high')"
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, check=True)
+    assert db.exists()
+
+class FakeDemo:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def launch(self, **kwargs):
+        self.calls.append("launch")
+
+    def block_thread(self):
+        self.calls.append("block_thread")
+
+    def close(self):
+        self.calls.append("close")
+
+def fake_ngrok_launch(monkeypatch, connect):
+    import dashboard
+    from pyngrok import ngrok
+
+    calls = []
+    monkeypatch.setattr(dashboard, "create_dashboard", lambda tabs: FakeDemo(calls))
+    monkeypatch.setattr(dashboard, "_start_metrics", lambda port: None)
+    monkeypatch.setattr(dashboard.mcp, "start_executors", lambda: None)
+    monkeypatch.setattr(dashboard, "launch_dashboard", lambda **kwargs: calls.append("standard launch"))
+    monkeypatch.setattr(ngrok, "connect", connect)
+    dashboard.launch_dashboard_with_ngrok(port=7861, metrics_port=0)
+    return calls
+
+def test_ngrok_launch_keeps_serving_until_interrupted(monkeypatch):
+    calls = fake_ngrok_launch(monkeypatch, lambda port: "https://example.ngrok.app")
+    assert calls == ["launch", "block_thread"]
+
+def test_failed_ngrok_tunnel_frees_the_port_before_the_standard_launch(monkeypatch):
+    def connect(port):
+        raise RuntimeError("no auth token")
+
+    calls = fake_ngrok_launch(monkeypatch, connect)
+    assert calls == ["launch", "close", "standard launch"]
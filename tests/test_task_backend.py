@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+import storage
+
+def make_backend(tmp_path, **kwargs):
+    return storage.SQLiteTaskBackend(str(tmp_path / "tasks.db"), commit_interval=0.01, retry_delay=0.01, **kwargs)
+
+def stored_titles(tmp_path) -> list:
+    conn = sqlite3.connect(tmp_path / "tasks.db")
+    try:
+        return [row[0] for row in conn.execute("SELECT title FROM tasks ORDER BY id")]
+    finally:
+        conn.close()
+
+# Renaming the table away from under the writer makes every commit fail until it is back
+def break_tasks_table(tmp_path, broken: bool):
+    conn = sqlite3.connect(tmp_path / "tasks.db")
+    conn.execute("ALTER TABLE tasks RENAME TO tasks_away" if broken else "ALTER TABLE tasks_away RENAME TO tasks")
+    conn.commit()
+    conn.close()
+
+def test_failed_write_is_reported_and_retried(tmp_path):
+    backend = make_backend(tmp_path)
+    store = storage.TaskStore(backend=backend)
+    store.add_task("Written", "high")
+    backend.flush()
+
+    break_tasks_table(tmp_path, True)
+    store.add_task("Kept for retry", "low")
+    with pytest.raises(storage.TaskBackendError):
+        backend.flush()
+    assert backend.failed_commits >= 1
+
+    break_tasks_table(tmp_path, False)
+    backend.flush()
+    assert stored_titles(tmp_path) == ["Written", "Kept for retry"]
+    store.close()
+
+def test_close_reports_unwritten_rows(tmp_path):
+    backend = make_backend(tmp_path, close_retries=2)
+    store = storage.TaskStore(backend=backend)
+    break_tasks_table(tmp_path, True)
+    store.add_task("Lost", "medium")
+    with pytest.raises(storage.TaskBackendError, match="1 rows not written"):
+        store.close()
+
+# The writer untracks a batch only after committing it; a refresh in between must not drop
+# another process's later write of the same task
+def test_refresh_keeps_a_newer_remote_write_seen_while_own_write_is_untracked(tmp_path):
+    first = storage.TaskStore(backend=make_backend(tmp_path, shared=True))
+    task = first.add_task("Shared", "medium")
+    first.backend.flush()
+    second = storage.TaskStore(backend=make_backend(tmp_path, shared=True))
+
+    first.update_task(task.id, status="done")
+    first.backend.flush()
+    # As if the writer had committed "done" but not yet untracked it
+    first.backend._track("tasks", [task.row()], 1)
+    second.update_task(task.id, status="progress")
+    second.backend.flush()
+
+    first.refresh()
+    assert task.status == "done"
+    first.backend._track("tasks", [task.row()], -1)
+    first.refresh()
+    assert task.status == "progress"
+    first.close()
+    second.close()
+
+def ids_of(tasks) -> list:
+    return [task["id"] for task in tasks]
+
+def test_reopened_store_rebuilds_the_same_indexes(tmp_path):
+    store = storage.TaskStore(backend=make_backend(tmp_path))
+    # More than one SortedList block per bucket, and a priority outside the ranked ones
+    store.add_tasks([dict(title=f"Task {n} {('login', 'billing', 'export')[n % 3]}",
+                          priority=("low", "medium", "high", "urgent")[n % 4], status=("todo", "done")[n % 2],
+                          epic=("Q1", None)[n % 2]) for n in range(1500)])
+    for task_id in range(1, 1500, 7):
+        store.update_task(task_id, status="progress", assignee="alice")
+    for task_id in range(3, 300, 11):
+        store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", "bob", "Q2", "3")
+    store.close()
+    reopened = storage.TaskStore(backend=make_backend(tmp_path))
+
+    def view(s) -> tuple:
+        return (
+            [s._page_ids(0, 1500, sort_key) for sort_key in ("id", "priority", "status")],
+            {key: list(ids) for key, ids in s.composite_index.items()},
+            [s.count_by(field) for field in ("priority", "status", "epic", "assignee")],
+            ids_of(s.find(status="progress", epic="Q1")), ids_of(s.find(assignee="bob", has_jira=True)),
+            s.search("billing", limit=10), s.search("expor", limit=10, priority="urgent"),
+            {jira_id: task.id for jira_id, task in s.tasks_by_jira_id.items()},
+        )
+
+    assert view(reopened) == view(store)
+    reopened.close()
@@ -0,0 +1,184 @@
+import sys
+import threading
+from collections import deque
+
+import pytest
+
+import storage
+
+def make_store():
+    store = storage.TaskStore()
+    store.add_task("Login page", "high", "progress")
+    store.add_task("Signup form", "high", "todo")
+    store.add_task("Billing export", "low", "progress")
+    store.add_task("Audit log", "high", "progress")
+    return store
+
+def ids(tasks) -> list:
+    return [task["id"] for task in tasks]
+
+def test_find_intersects_filters_in_id_order():
+    store = make_store()
+    store.create_jira_ticket(4, "PRODUCTMIND (PM)", "alice", "Q1", "3")
+
+    assert ids(store.find(priority="high", status="progress")) == [1, 4]
+    assert ids(store.find(priority="high", status="progress", has_jira=False)) == [1]
+    assert ids(store.find(has_jira=True, assignee="alice")) == [4]
+    assert ids(store.find(priority="high", limit=2)) == [1, 2]
+    assert store.find(priority="medium") == []
+
+def test_update_moves_a_task_between_index_buckets():
+    store = make_store()
+    store.update_task(2, status="done", epic="Q2")
+
+    assert ids(store.find(status="done")) == [2]
+    assert store.find(status="todo") == []
+    assert ids(store.find(epic="Q2")) == [2]
+    assert store.count_by("status") == {"progress": 3, "done": 1}
+
+def test_jira_key_lookup_follows_the_link():
+    store = make_store()
+    ticket = store.create_jira_ticket(3, "PRODUCTMIND (PM)", "bob", "Q1", "5")
+
+    assert store.get_task_by_jira_id(ticket["id"])["id"] == 3
+    assert store.get_task(3)["jira_id"] == ticket["id"]
+
+def test_linking_fills_in_epic_and_assignee_but_keeps_existing_ones():
+    store = make_store()
+    store.update_task(1, epic="Auth", assignee="carol")
+
+    store.create_jira_ticket(1, "PRODUCTMIND (PM)", "bob", "Q1", "5")
+    store.create_jira_ticket(2, "PRODUCTMIND (PM)", "bob", "Q1", "3")
+
+    assert (store.get_task(1)["epic"], store.get_task(1)["assignee"]) == ("Auth", "carol")
+    assert (store.get_task(2)["epic"], store.get_task(2)["assignee"]) == ("Q1", "bob")
+    assert ids(store.find(assignee="carol")) == [1]
+
+def test_unknown_filters_and_fields_are_rejected():
+    store = make_store()
+    with pytest.raises(ValueError):
+        store.find(colour="red")
+    with pytest.raises(ValueError):
+        store.update_task(1, id=7)
+
+# Tiny GIL switch interval, so the writers interleave inside add/update/link
+def run_threads(count: int, work):
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+def test_concurrent_writers_keep_ids_and_indexes_consistent():
+    store = storage.TaskStore()
+
+    def write(n: int):
+        for i in range(300):
+            task = store.add_task(f"Task {n}-{i}", ("low", "medium", "high")[i % 3])
+            store.update_task(task["id"], status=("todo", "progress", "done")[i % 3])
+
+    run_threads(4, write)
+
+    assert ids(store.tasks) == list(range(1, 1201))
+    assert sum(len(bucket) for bucket in store.composite_index.values()) == 1200
+    assert store.count_by("status") == {"todo": 400, "progress": 400, "done": 400}
+    assert len(store.find(priority="high", status="done")) == 400
+
+def test_racing_jira_links_leave_one_ticket_per_task():
+    store = make_store()
+    won = []
+
+    def link(n: int):
+        for task_id in (1, 2, 3, 4):
+            try:
+                won.append(store.create_jira_ticket(task_id, "PRODUCTMIND (PM)", f"writer-{n}", "Q1", "3"))
+            except ValueError:
+                pass
+
+    run_threads(4, link)
+
+    assert sorted(ticket["task_id"] for ticket in won) == [1, 2, 3, 4]
+    assert len(store.jira_tickets) == 4
+    assert all(store.get_task_by_jira_id(ticket["id"])["id"] == ticket["task_id"] for ticket in won)
+
+def test_changes_since_folds_the_feed_per_task():
+    store = make_store()
+    version = store.version
+    store.update_task(2, status="done")
+    store.add_task("Export to CSV", "low")
+    store.update_task(5, priority="high")
+    store.update_task(2, epic="Q2")
+
+    current, changes = store.changes_since(version)
+
+    assert current == store.version
+    assert changes == {2: "changed", 5: "added"}
+    assert store.changes_since(current) == (current, {})
+
+def test_changes_since_gives_up_when_the_feed_cannot_answer():
+    store = make_store()
+    version = store.version
+    for task_id in (1, 2, 3):
+        store.update_task(task_id, status="done")
+
+    assert store.changes_since(version, max_ids=2) == (store.version, None)
+
+    store.FEED_SIZE = 2
+    store._feed = deque(store._feed, maxlen=2)
+    assert store.changes_since(version) == (store.version, None)
+    assert store.changes_since(version + 1) == (store.version, {2: "changed", 3: "changed"})
+
+def test_page_affected_compares_only_the_ids_a_page_shows():
+    store = make_store()
+    for n in range(6):
+        store.add_task(f"Task {n}", "low")
+    version, _, first_page = store.get_tasks_page(1, 5, "id")
+
+    store.update_task(8, status="done")
+    _, changes = store.changes_since(version)
+    assert not store.page_affected(changes, first_page, 1, 5, "id")
+
+    store.update_task(3, status="done")
+    _, changes = store.changes_since(version)
+    assert store.page_affected(changes, first_page, 1, 5, "id")
+
+    # A new high priority task pushes every row of the priority order down one place
+    version, _, by_priority = store.get_tasks_page(1, 5, "priority")
+    store.add_task("Outage", "high")
+    _, changes = store.changes_since(version)
+    assert store.page_affected(changes, by_priority, 1, 5, "priority")
+    assert not store.page_affected({}, by_priority, 1, 5, "priority")
+
+# What refresh() and add_task() do: the task is published first and indexed a moment later,
+# so an update from another thread can land in between
+def publish_update_then_index(store, task, **changes):
+    with store._append_lock:
+        store._publish([task])
+    store.update_task(task.id, **changes)
+    store._index(task)
+
+def test_update_between_publish_and_index_keeps_rank_order():
+    store = storage.TaskStore()
+    store.add_task("Existing", "low", "todo")
+    task = storage.Task(store._task_ids.take()[0], "Late", "low", "todo", 0.0)
+
+    publish_update_then_index(store, task, priority="high")
+
+    priorities = store.rank_index["priority"]
+    assert (list(priorities["high"]), list(priorities["low"])) == ([2], [1])
+    assert store._page_ids(0, 10, "priority") == [2, 1]
+    assert store._page_ids(0, 10, "status") == [1, 2]
+
+def test_update_between_publish_and_index_keeps_filters_exact():
+    store = storage.TaskStore()
+    task = storage.Task(store._task_ids.take()[0], "First", "low", "todo", 0.0)
+
+    publish_update_then_index(store, task, status="done")
+
+    assert [found.id for found in store.find(status="done")] == [1]
+    assert store.find(status="todo") == []
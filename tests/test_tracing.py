@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+import pytest
+
+import tracing
+
+def make_tracer(tmp_path) -> tracing.Tracer:
+    return tracing.Tracer(str(tmp_path / "spans.jsonl"), flush_interval=60)
+
+def exported(tracer) -> list:
+    tracer.flush()
+    spans = []
+    with open(tracer.path) as f:
+        for line in f:
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+    return spans
+
+def by_name(spans) -> dict:
+    return {span["name"]: span for span in spans}
+
+def test_children_follow_the_root_across_awaits_and_tasks(tmp_path):
+    tracer = make_tracer(tmp_path)
+
+    async def step(name):
+        await asyncio.sleep(0)
+        with tracer.span(name):
+            await asyncio.sleep(0)
+            with tracer.span(f"{name}.inner"):
+                pass
+
+    async def handler():
+        with tracer.span("request", root=True, kind=tracing.SPAN_KIND_SERVER):
+            await step("first")
+            await asyncio.gather(step("a"), step("b"))
+
+    asyncio.run(handler())
+    spans = by_name(exported(tracer))
+
+    root = spans["request"]
+    assert "parentSpanId" not in root and root["kind"] == tracing.SPAN_KIND_SERVER
+    assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+    for name in ("first", "a", "b"):
+        assert spans[name]["parentSpanId"] == root["spanId"]
+        assert spans[f"{name}.inner"]["parentSpanId"] == spans[name]["spanId"]
+
+def test_spans_export_as_otlp_json_lines(tmp_path):
+    tracer = make_tracer(tmp_path)
+    with tracer.span("request", root=True, user="ana", rows=3, ratio=0.5, cached=False):
+        pass
+    with pytest.raises(ValueError):
+        with tracer.span("failing", root=True):
+            raise ValueError("bad input")
+
+    tracer.flush()
+    with open(tracer.path) as f:
+        request = json.loads(f.readline())
+    resource = request["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "productmind"}} in resource["resource"]["attributes"]
+    ok, failed = resource["scopeSpans"][0]["spans"]
+
+    assert len(ok["traceId"]) == 32 and len(ok["spanId"]) == 16
+    assert int(ok["endTimeUnixNano"]) >= int(ok["startTimeUnixNano"])
+    assert ok["attributes"] == [
+        {"key": "user", "value": {"stringValue": "ana"}},
+        {"key": "rows", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": False}},
+    ]
+    assert ok["status"] == {}
+    assert failed["status"] == {"code": 2, "message": "ValueError: bad input"}
+    assert tracer.get_stats()["exported_spans"] == 2
+
+def test_a_traceparent_joins_the_callers_trace(tmp_path):
+    tracer = make_tracer(tmp_path)
+    with tracer.span("client", root=True) as client:
+        traceparent = client.traceparent
+
+    with tracer.span("server", kind=tracing.SPAN_KIND_SERVER, traceparent=traceparent):
+        pass
+    assert tracer.span("bad", traceparent="00-abc-def-01") is tracing.NOOP_SPAN
+
+    spans = by_name(exported(tracer))
+    assert spans["server"]["traceId"] == spans["client"]["traceId"]
+    assert spans["server"]["parentSpanId"] == spans["client"]["spanId"]
+
+def test_nothing_is_recorded_outside_a_trace(tmp_path):
+    tracer = make_tracer(tmp_path)
+    assert tracer.span("orphan") is tracing.NOOP_SPAN
+    assert tracing.Tracer(None).span("request", root=True) is tracing.NOOP_SPAN
+    assert tracing.Tracer(tracer.path, sample_rate=0).span("request", root=True) is tracing.NOOP_SPAN
+
+    tracer.flush()
+    assert not (tmp_path / "spans.jsonl").exists()
+
+def test_traced_stream_keeps_the_span_current_only_while_the_generator_runs(tmp_path):
+    tracer = make_tracer(tmp_path)
+    seen = []
+
+    async def chunks():
+        for n in range(3):
+            with tracer.span(f"chunk{n}"):
+                pass
+            seen.append(tracing.current_span.get() is not None)
+            yield n
+
+    async def consume():
+        with tracer.span("request", root=True):
+            stream = tracing.traced_stream(tracer.span("stream"), chunks())
+            items = [item async for item in stream]
+            return items, tracing.current_span.get().name
+
+    items, current = asyncio.run(consume())
+    spans = by_name(exported(tracer))
+
+    assert items == [0, 1, 2] and seen == [True, True, True]
+    assert current == "request"
+    assert spans["chunk0"]["parentSpanId"] == spans["stream"]["spanId"]
+    assert {"key": "chunks", "value": {"intValue": "3"}} in spans["stream"]["attributes"]
@@ -0,0 +1,296 @@
+# ==============================================================================
+# TRACING
+# ==============================================================================
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+# Span tracing for one request end to end: a root span per Gradio handler (or MCP server
+# request) and children for tool dispatch, cache lookups, queue waits, agent and model work
+# and TaskStore operations, so queueing delay, agent latency and rendering cost show up
+# separately. The active span lives in a contextvar, which follows awaits, new tasks and
+# mcp_loop submissions. Spans are written in batches to PRODUCTMIND_TRACE_FILE as OTLP/JSON
+# lines (one ExportTraceServiceRequest each), which an OpenTelemetry collector's otlpjsonfile
+# receiver can replay. PRODUCTMIND_TRACE_SAMPLE keeps that fraction of traces, decided at
+# the root; unsampled requests record nothing.
+current_span = contextvars.ContextVar("current_span", default=None)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+def otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def otlp_attributes(attributes: dict) -> list:
+    return [{"key": key, "value": otlp_value(value)} for key, value in attributes.items()]
+
+class Span:
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "error", "_token")
+    recording = True
+    
+    def __init__(self, tracer, trace_id: str, parent_id: str, name: str, kind: int = SPAN_KIND_INTERNAL,
+                 attributes: dict = None, start_ns: int = None):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = f"{tracer.ids.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+        self._token = None
+    
+    # W3C trace context, passed to MCP servers so their spans join this trace
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+    
+    def set(self, key: str, value):
+        self.attributes[key] = value
+    
+    def fail(self, message: str):
+        self.error = message
+    
+    def end(self, end_ns: int = None):
+        if self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            self.tracer.finish(self)
+    
+    def __enter__(self):
+        self._token = current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        current_span.reset(self._token)
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.end()
+    
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+# Stands in for every span that isn't recorded
+class NoopSpan:
+    recording = False
+    traceparent = None
+    
+    def set(self, key: str, value):
+        pass
+    
+    def fail(self, message: str):
+        pass
+    
+    def end(self, end_ns: int = None):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+class Tracer:
+    def __init__(self, path: str = None, sample_rate: float = 1.0, service: str = "productmind",
+                 flush_interval: float = 1.0, max_pending: int = 100000):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.enabled = bool(path) and sample_rate > 0
+        self.service = service
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.traces = 0
+        self.unsampled = 0
+        self.exported = 0
+        self.dropped = 0
+        self.last_error = None
+        # Span and trace ids: unique, not secret, so a private PRNG instead of os.urandom
+        self.ids = random.Random()
+        self._pending = deque()
+        self._flush_lock = threading.Lock()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+    
+    # A child of the current span; without one, a new trace if root=True (subject to sampling)
+    # or when an MCP client sent a sampled traceparent, and a no-op span otherwise
+    def span(self, name: str, root: bool = False, kind: int = SPAN_KIND_INTERNAL, traceparent: str = None,
+             **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = current_span.get()
+        if parent is not None:
+            return Span(self, parent.trace_id, parent.span_id, name, kind, attributes)
+        if traceparent:
+            parts = traceparent.split("-")
+            if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and parts[3] == "01":
+                return Span(self, parts[1], parts[2], name, kind, attributes)
+            return NOOP_SPAN
+        if not root:
+            return NOOP_SPAN
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            self.unsampled += 1
+            return NOOP_SPAN
+        self.traces += 1
+        return Span(self, f"{self.ids.getrandbits(128):032x}", None, name, kind, attributes)
+    
+    # A finished child of the current span whose times were measured elsewhere (e.g. in a pool)
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes):
+        parent = current_span.get()
+        if parent is not None:
+            Span(self, parent.trace_id, parent.span_id, name, SPAN_KIND_INTERNAL, attributes, start_ns).end(end_ns)
+    
+    def finish(self, span: Span):
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(span)
+        if self._writer is None:
+            self._start_writer()
+    
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+    
+    def _write_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+    
+    # One OTLP request per flush, written with a single append so several processes can share a file
+    def flush(self):
+        with self._flush_lock:
+            spans = []
+            while self._pending:
+                spans.append(self._pending.popleft().to_otlp())
+            if not spans:
+                return
+            request = {"resourceSpans": [{
+                "resource": {"attributes": otlp_attributes({"service.name": self.service, "process.pid": os.getpid()})},
+                "scopeSpans": [{"scope": {"name": "productmind.dashboard"}, "spans": spans}]
+            }]}
+            data = (json.dumps(request, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+                self.exported += len(spans)
+            except OSError as e:
+                self.dropped += len(spans)
+                if self.last_error is None:
+                    print(f"❌ Trace export to {self.path} failed: {e}")
+                self.last_error = str(e)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "file": self.path,
+            "sample_rate": self.sample_rate,
+            "traces": self.traces,
+            "unsampled": self.unsampled,
+            "exported_spans": self.exported,
+            "pending_spans": len(self._pending),
+            "dropped_spans": self.dropped,
+            "last_error": self.last_error
+        }
+
+tracer = Tracer(os.environ.get("PRODUCTMIND_TRACE_FILE") or None,
+                float(os.environ.get("PRODUCTMIND_TRACE_SAMPLE", 1.0)))
+
+# Drives agen with span current only while agen runs, then ends span. An async generator may be
+# resumed from a different task each step, and a contextvar token can't cross tasks.
+async def traced_stream(span, agen):
+    if not span.recording:
+        async for item in agen:
+            yield item
+        return
+    
+    chunks = 0
+    try:
+        while True:
+            token = current_span.set(span)
+            try:
+                item = await agen.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                current_span.reset(token)
+            chunks += 1
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        span.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        span.set("chunks", chunks)
+        span.end()
+        await agen.aclose()
+
+# Runs func (a plain, coroutine or async generator function) inside a span; root=True starts a
+# trace when none is active, as Gradio handlers do. With tracing off at import, func is
+# returned untouched, so disabled tracing costs nothing here.
+def traced(name: str, root: bool = False):
+    def decorate(func):
+        if not tracer.enabled:
+            return func
+        # Gradio checks the handler type, so each wrapper has the same kind as func
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                stream = traced_stream(tracer.span(name, root), func(*args, **kwargs))
+                try:
+                    async for item in stream:
+                        yield item
+                finally:
+                    await stream.aclose()
+            return wrapper
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with tracer.span(name, root):
+                    return await func(*args, **kwargs)
+            return wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name, root):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate